@@ -0,0 +1,60 @@
+import asyncio
+import hashlib
+from typing import Callable, Dict, TypeVar
+
+from api.executor import run_blocking
+from core.metrics import Counter
+
+T = TypeVar("T")
+
+COALESCED_CALLS = Counter(
+    "rsa_coalesced_calls", "Requests served by joining an identical in-flight computation"
+)
+
+
+def flight_key(operation: str, n: int, exponent: int, payload: bytes) -> str:
+    """Key identifying one deterministic computation (operation, key and payload)"""
+    digest = hashlib.sha256(f"{operation}:{n}:{exponent}:".encode("ascii"))
+    digest.update(payload)
+    return digest.hexdigest()
+
+
+class SingleFlight:
+    """
+    Shares one blocking computation between identical concurrent callers
+
+    The first caller for a key runs func through run_blocking; callers
+    arriving while it is in flight await the same result (or exception).
+    The computation is shielded, so a cancelled caller does not cancel it
+    for the others. Queue/compute timings are recorded on the first caller's
+    request only.
+    """
+
+    def __init__(self):
+        self._flights: Dict[str, asyncio.Future] = {}
+
+    async def run(self, key: str, func: Callable[..., T], *args) -> T:
+        future = self._flights.get(key)
+        if future is None:
+            future = asyncio.ensure_future(run_blocking(func, *args))
+            self._flights[key] = future
+            future.add_done_callback(lambda done: self._finish(key, done))
+        else:
+            COALESCED_CALLS.inc()
+        return await asyncio.shield(future)
+
+    def _finish(self, key: str, future: asyncio.Future) -> None:
+        if self._flights.get(key) is future:
+            del self._flights[key]
+        # Mark the exception retrieved even if every caller was cancelled
+        if not future.cancelled():
+            future.exception()
+
+    def __len__(self) -> int:
+        """Number of computations currently in flight"""
+        return len(self._flights)
+
+
+# Shared by the encrypt / decrypt endpoints
+###########################
+crypto_flights = SingleFlight()
@@ -1,43 +1,129 @@
-from typing import Optional
+import json
+import os
+from collections import OrderedDict
+from typing import Callable, Dict, Mapping, Optional, Tuple
 
 from fastapi import Depends, HTTPException
+from starlette.requests import HTTPConnection
 
+from config.settings import settings
+from core.block_cache import BlockResultCache
+from core.key_encoding import ParsedKeyCache
+from core.metrics import current_endpoint
 from core.prime_generator import PrimeGenerator
+from core.prime_memo import PrimeMemo
 from core.rsa_crypto import RSACrypto
+from core.tracing import traced
 from models.crypto_models import PrimePair, RSAKeyPair
 
 
 # Global state management (in production, use Redis or database)
 class AppState:
     def __init__(self):
-        self.current_primes: Optional[PrimePair] = None
-        self.current_keypair: Optional[RSAKeyPair] = None
-        self.prime_generator = PrimeGenerator()
-        self.rsa_crypto = RSACrypto()
+        self._current_primes: Optional[PrimePair] = None
+        self._current_keypair: Optional[RSAKeyPair] = None
+        # Bumped whenever the current primes or keypair change; part of status ETags
+        self.version = 0
+        self._epoch = os.urandom(4).hex()
+        self._status_cache: Dict[str, Tuple[int, str, bytes]] = {}
+        self.key_store: "OrderedDict[str, RSAKeyPair]" = OrderedDict()
+        self.key_cache = (
+            ParsedKeyCache(settings.parsed_key_cache_size)
+            if settings.parsed_key_cache_size
+            else None
+        )
+        self.prime_generator = PrimeGenerator(
+            memo=PrimeMemo(settings.prime_memo_dir) if settings.prime_memo_dir else None
+        )
+        self.rsa_crypto = RSACrypto(
+            parallel_threshold=settings.parallel_block_threshold,
+            parallel_workers=settings.parallel_workers or None,
+            block_cache=(
+                BlockResultCache(settings.block_cache_keys, settings.block_cache_blocks_per_key)
+                if settings.block_cache_keys
+                else None
+            ),
+        )
+
+    @property
+    def current_primes(self) -> Optional[PrimePair]:
+        return self._current_primes
+
+    @current_primes.setter
+    def current_primes(self, prime_pair: Optional[PrimePair]) -> None:
+        self._current_primes = prime_pair
+        self.version += 1
+
+    @property
+    def current_keypair(self) -> Optional[RSAKeyPair]:
+        return self._current_keypair
+
+    @current_keypair.setter
+    def current_keypair(self, keypair: Optional[RSAKeyPair]) -> None:
+        self._current_keypair = keypair
+        self.version += 1
+
+    def cached_status(self, name: str, render: Callable[[], dict]) -> Tuple[str, bytes]:
+        """
+        ETag and JSON body of a status response, rendered once per state version
+
+        Polling an unchanged state reuses the body (and whatever render computed,
+        such as key validation) instead of rebuilding it.
+        """
+        cached = self._status_cache.get(name)
+        if cached is None or cached[0] != self.version:
+            version = self.version
+            body = json.dumps(render()).encode("utf-8")
+            cached = (version, f'"{self._epoch}-{version}"', body)
+            self._status_cache[name] = cached
+        return cached[1], cached[2]
+
+    def store_keypair(self, keypair: RSAKeyPair) -> str:
+        """Make keypair current, store it (bounded) and admit it to the block cache"""
+        key_id = keypair.fingerprint
+        self.current_keypair = keypair
+        self.key_store[key_id] = keypair
+        self.key_store.move_to_end(key_id)
+        if self.rsa_crypto.block_cache is not None:
+            self.rsa_crypto.block_cache.admit(keypair.n, keypair.e, keypair.d)
+        while len(self.key_store) > settings.max_stored_keys:
+            _, evicted = self.key_store.popitem(last=False)
+            if self.rsa_crypto.block_cache is not None:
+                self.rsa_crypto.block_cache.evict(evicted.n)
+        return key_id
 
     def clear_state(self):
         self.current_primes = None
         self.current_keypair = None
+        self.key_store.clear()
+        if self.key_cache is not None:
+            self.key_cache.clear()
+        if self.rsa_crypto.block_cache is not None:
+            self.rsa_crypto.block_cache.clear()
 
 
 app_state = AppState()
 
 
+@traced("dependency.get_prime_generator")
 def get_prime_generator() -> PrimeGenerator:
     """Dependency to get prime generator instance"""
     return app_state.prime_generator
 
 
+@traced("dependency.get_rsa_crypto")
 def get_rsa_crypto() -> RSACrypto:
     """Dependency to get RSA crypto instance"""
     return app_state.rsa_crypto
 
 
+@traced("dependency.get_app_state")
 def get_app_state() -> AppState:
     """Dependency to get application state"""
     return app_state
 
 
+@traced("dependency.require_primes")
 def require_primes(state: AppState = Depends(get_app_state)) -> PrimePair:
     """Dependency that requires primes to be generated"""
     if state.current_primes is None:
@@ -48,6 +134,7 @@ def require_primes(state: AppState = Depends(get_app_state)) -> PrimePair:
     return state.current_primes
 
 
+@traced("dependency.require_keypair")
 def require_keypair(state: AppState = Depends(get_app_state)) -> RSAKeyPair:
     """Dependency that requires RSA keypair to be generated"""
     if state.current_keypair is None:
@@ -56,3 +143,19 @@ def require_keypair(state: AppState = Depends(get_app_state)) -> RSAKeyPair:
             detail="No RSA keypair available. Generate keys first using /api/generate-keys",
         )
     return state.current_keypair
+
+
+def route_template(path: str, path_params: Mapping[str, object]) -> str:
+    """Path with each path parameter value replaced by {name}, a bounded metric label"""
+    names = {str(value): name for name, value in path_params.items()}
+    return "/".join(f"{{{names[part]}}}" if part in names else part for part in path.split("/"))
+
+
+async def label_endpoint(connection: HTTPConnection) -> None:
+    """
+    Dependency labelling metrics recorded for this request with its route template
+
+    Raw paths would give one label value per distinct URL. Async, so the
+    label is set in the task that runs the endpoint (and its executor calls).
+    """
+    current_endpoint.set(route_template(connection.url.path, connection.path_params))
@@ -0,0 +1,101 @@
+import asyncio
+
+from fastapi import APIRouter, Depends, HTTPException
+
+from api.dependencies import AppState, get_app_state
+from api.executor import run_blocking
+from config.settings import settings
+from core.batch_gcd import audit_shared_factors
+from core.factorization import analyze_modulus
+from models.schemas import (
+    SharedFactorAuditRequest,
+    SharedFactorAuditResponse,
+    SharedFactorGroupInfo,
+    WeakKeyAnalysisRequest,
+    WeakKeyAnalysisResponse,
+)
+
+# create audit router
+###########################
+router = APIRouter(prefix="/audit", tags=["Key Audit"])
+
+# Each analysis forks one process per method for up to the time budget
+_analysis_slots = asyncio.Semaphore(settings.max_concurrent_factor_analyses)
+
+
+# shared factor audit endpoint
+###########################
+@router.post("/shared-factors", response_model=SharedFactorAuditResponse)
+async def audit_shared_prime_factors(
+    request: SharedFactorAuditRequest, state: AppState = Depends(get_app_state)
+):
+    """
+    Detect RSA moduli that share a prime factor using Bernstein's batch GCD.
+
+    Audits every key in the key store plus any moduli supplied in the request
+    and reports the colliding key IDs. Any key listed is fully factorable.
+    """
+    moduli = {key_id: int(n) for key_id, n in request.moduli.items()}
+    if request.include_stored_keys:
+        for key_id, keypair in list(state.key_store.items()):
+            moduli.setdefault(key_id, keypair.n)
+
+    if any(n < 2 for n in moduli.values()):
+        raise HTTPException(status_code=400, detail="Moduli must be greater than 1")
+
+    audit = await run_blocking(audit_shared_factors, moduli)
+
+    return SharedFactorAuditResponse(
+        moduli_checked=audit.moduli_checked,
+        vulnerable_key_ids=audit.vulnerable_key_ids,
+        groups=[
+            SharedFactorGroupInfo(key_ids=group.key_ids, duplicate_modulus=group.duplicate_modulus)
+            for group in audit.groups
+        ],
+        audit_time=audit.audit_time,
+    )
+
+
+# weak-key factorization endpoint
+###########################
+@router.post("/weak-key", response_model=WeakKeyAnalysisResponse)
+async def analyze_weak_key(
+    request: WeakKeyAnalysisRequest, state: AppState = Depends(get_app_state)
+):
+    """
+    Try to factor one modulus with methods that break badly generated keys.
+
+    Fermat's method (p and q too close), Pollard's rho and trial division
+    (small factors) and Pollard's p - 1 (smooth p - 1) run in parallel
+    worker processes under one time budget; the first factor found stops
+    the rest. Failing within the budget is not a proof of strength.
+
+    At most max_concurrent_factor_analyses run at once; requests beyond
+    that get a 503 with Retry-After instead of queueing.
+    """
+    if request.key_id is not None:
+        keypair = state.key_store.get(request.key_id)
+        if keypair is None:
+            raise HTTPException(status_code=404, detail=f"Unknown key ID {request.key_id}")
+        n = keypair.n
+    else:
+        n = int(request.n)
+
+    if _analysis_slots.locked():
+        raise HTTPException(
+            status_code=503,
+            detail="Too many weak-key analyses in progress",
+            headers={"Retry-After": str(max(1, round(request.time_budget)))},
+        )
+    async with _analysis_slots:
+        result = await run_blocking(analyze_modulus, n, request.time_budget, request.methods)
+
+    return WeakKeyAnalysisResponse(
+        modulus_bits=n.bit_length(),
+        factored=result.factored,
+        p=str(result.factors[0]) if result.factored else None,
+        q=str(result.factors[1]) if result.factored else None,
+        method=result.method,
+        outcomes=result.outcomes,
+        elapsed=result.elapsed,
+    )
@@ -1,17 +1,29 @@
-import asyncio
-from typing import List
+import codecs
+import json
+from functools import lru_cache
+from typing import AsyncIterator, List, Tuple
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
 
+from api.coalescing import crypto_flights, flight_key
 from api.dependencies import AppState, get_app_state, get_rsa_crypto
+from api.executor import run_blocking
+from api.timing import timing_phase
 from core.rsa_crypto import RSACrypto
-from models.crypto_models import RSAKeyPair
+from models.crypto_models import HybridPayload, MessageBlock, RSAKeyPair
 from models.schemas import (
+    BatchVerifyRequest,
+    BatchVerifyResponse,
     BlockInfo,
     DecryptionRequest,
     DecryptionResponse,
     EncryptionRequest,
     EncryptionResponse,
+    SignRequest,
+    SignResponse,
+    VerifyRequest,
+    VerifyResponse,
 )
 
 router = APIRouter(prefix="/crypto", tags=["Encryption & Decryption"])
@@ -28,40 +40,60 @@ async def encrypt_message(
     """
     try:
         # Convert string keys to integers
-        n = int(request.n)
-        e = int(request.e)
+        with timing_phase("decode"):
+            n = int(request.n)
+            e = int(request.e)
 
         # Perform encryption in thread pool
-        loop = asyncio.get_event_loop()
-        crypto_result = await loop.run_in_executor(
-            None, rsa_crypto.encrypt_message, request.message, n, e
-        )
+        if request.mode == "hybrid":
+            crypto_result = await run_blocking(rsa_crypto.encrypt_hybrid, request.message, n, e)
+        else:
+            # Textbook encryption is deterministic: identical concurrent requests share one run
+            key = flight_key("encrypt", n, e, request.message.encode("utf-8"))
+            crypto_result = await crypto_flights.run(
+                key, rsa_crypto.encrypt_message, request.message, n, e
+            )
 
         if not crypto_result.success:
             raise HTTPException(
                 status_code=400, detail=crypto_result.error_message or "Encryption failed"
             )
 
-        # Convert blocks to response format
-        encrypted_blocks = [str(block.encrypted_value) for block in crypto_result.blocks]
-        block_info = [
-            BlockInfo(
-                block_number=block.block_number,
-                original_value=str(block.original_value),
-                encrypted_value=str(block.encrypted_value),
-                original_hex=block.original_hex,
-                encrypted_hex=block.encrypted_hex,
+        with timing_phase("encode"):
+            if request.mode == "hybrid":
+                payload = crypto_result.payload
+                return EncryptionResponse(
+                    encrypted_blocks=[str(payload.encapsulated_key)],
+                    block_info=[],
+                    total_blocks=1,
+                    message_length=len(request.message),
+                    mode="hybrid",
+                    ciphertext=payload.ciphertext_hex,
+                    tag=payload.tag_hex,
+                )
+
+            # Convert blocks to response format
+            encrypted_blocks = [str(block.encrypted_value) for block in crypto_result.blocks]
+            block_info = [
+                BlockInfo(
+                    block_number=block.block_number,
+                    original_value=str(block.original_value),
+                    encrypted_value=str(block.encrypted_value),
+                    original_hex=block.original_hex,
+                    encrypted_hex=block.encrypted_hex,
+                )
+                for block in crypto_result.blocks
+            ]
+
+            return EncryptionResponse(
+                encrypted_blocks=encrypted_blocks,
+                block_info=block_info,
+                total_blocks=len(encrypted_blocks),
+                message_length=len(request.message),
             )
-            for block in crypto_result.blocks
-        ]
-
-        return EncryptionResponse(
-            encrypted_blocks=encrypted_blocks,
-            block_info=block_info,
-            total_blocks=len(encrypted_blocks),
-            message_length=len(request.message),
-        )
 
+    except HTTPException:
+        raise
     except ValueError as e:
         raise HTTPException(status_code=400, detail=f"Invalid input: {str(e)}")
     except Exception as e:
@@ -79,15 +111,25 @@ async def decrypt_message(
     """
     try:
         # Convert string keys to integers
-        n = int(request.n)
-        d = int(request.d)
-        encrypted_blocks = [int(block) for block in request.encrypted_blocks]
+        with timing_phase("decode"):
+            n = int(request.n)
+            d = int(request.d)
+            encrypted_blocks = [int(block) for block in request.encrypted_blocks]
+            if request.mode == "hybrid":
+                payload = HybridPayload(
+                    encapsulated_key=encrypted_blocks[0],
+                    ciphertext=bytes.fromhex(request.ciphertext),
+                    tag=bytes.fromhex(request.tag),
+                )
 
         # Perform decryption in thread pool
-        loop = asyncio.get_event_loop()
-        crypto_result = await loop.run_in_executor(
-            None, rsa_crypto.decrypt_message, encrypted_blocks, n, d
-        )
+        if request.mode == "hybrid":
+            crypto_result = await run_blocking(rsa_crypto.decrypt_hybrid, payload, n, d)
+        else:
+            key = flight_key("decrypt", n, d, ",".join(map(str, encrypted_blocks)).encode("ascii"))
+            crypto_result = await crypto_flights.run(
+                key, rsa_crypto.decrypt_message, encrypted_blocks, n, d
+            )
 
         if not crypto_result.success:
             raise HTTPException(
@@ -97,15 +139,236 @@ async def decrypt_message(
         return DecryptionResponse(
             decrypted_message=crypto_result.message,
             success=True,
-            block_count=len(crypto_result.blocks),
+            block_count=len(encrypted_blocks),
         )
 
+    except HTTPException:
+        raise
     except ValueError as e:
         raise HTTPException(status_code=400, detail=f"Invalid input: {str(e)}")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Decryption failed: {str(e)}")
 
 
+@router.post("/sign", response_model=SignResponse)
+async def sign_message(request: SignRequest, rsa_crypto: RSACrypto = Depends(get_rsa_crypto)):
+    """
+    Sign the SHA-256 digest of a message with an RSA private key.
+
+    Supplying p and q enables CRT signing, roughly 3-4x faster than a full
+    exponentiation with d.
+    """
+    try:
+        with timing_phase("decode"):
+            n = int(request.n)
+            d = int(request.d)
+            p = int(request.p) if request.p is not None else None
+            q = int(request.q) if request.q is not None else None
+
+        signature = await run_blocking(rsa_crypto.sign_message, request.message, n, d, p, q)
+
+        with timing_phase("encode"):
+            return SignResponse(signature=str(signature), crt=p is not None and q is not None)
+
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid input: {str(e)}")
+
+
+@router.post("/verify", response_model=VerifyResponse)
+async def verify_signature(request: VerifyRequest):
+    """Verify a single signature against an RSA public key"""
+    try:
+        with timing_phase("decode"):
+            signature = int(request.signature)
+            n, e = _parse_public_key(request.n, request.e)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid input: {str(e)}")
+
+    is_valid = await run_blocking(RSACrypto.verify_signature, request.message, signature, n, e)
+    return VerifyResponse(is_valid=is_valid)
+
+
+@router.post("/verify/batch", response_model=BatchVerifyResponse)
+async def verify_batch(
+    request: BatchVerifyRequest, rsa_crypto: RSACrypto = Depends(get_rsa_crypto)
+):
+    """
+    Verify many (message, signature, public key) tuples in one call.
+
+    Public keys repeated across the batch (or across calls) are parsed once;
+    large batches are spread across the worker process pool.
+    """
+    try:
+        with timing_phase("decode"):
+            items = [
+                (item.message, int(item.signature), *_parse_public_key(item.n, item.e))
+                for item in request.items
+            ]
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid input: {str(e)}")
+
+    results = await run_blocking(rsa_crypto.verify_batch, items)
+    valid_count = sum(results)
+
+    return BatchVerifyResponse(
+        results=results, valid_count=valid_count, invalid_count=len(results) - valid_count
+    )
+
+
+@lru_cache(maxsize=1024)
+def _parse_public_key(n: str, e: str) -> Tuple[int, int]:
+    """Parse a decimal public key once; repeated keys are served from the cache"""
+    n_value, e_value = int(n), int(e)
+    if n_value < 2 or e_value < 1:
+        raise ValueError("key components out of range")
+    return n_value, e_value
+
+
+class DuplexStreamingResponse(StreamingResponse):
+    """
+    Streaming response whose body iterator is allowed to read the request body.
+
+    The stock StreamingResponse listens for client disconnects on ``receive``
+    while streaming, which swallows request body chunks that the endpoint is
+    still consuming. Disconnects surface through ``request.stream()`` instead.
+    """
+
+    async def __call__(self, scope, receive, send):
+        await self.stream_response(send)
+        if self.background is not None:
+            await self.background()
+
+
+def _parse_stream_key(n: str, exponent: str) -> tuple:
+    """Parse and sanity check key components passed to streaming endpoints"""
+    try:
+        n_value, exponent_value = int(n), int(exponent)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid input: {str(e)}")
+    if n_value < 2 or exponent_value < 1:
+        raise HTTPException(status_code=400, detail="Invalid input: key components out of range")
+    return n_value, exponent_value
+
+
+def _ndjson_line(payload: dict) -> bytes:
+    """Encode one NDJSON frame"""
+    return (json.dumps(payload) + "\n").encode("utf-8")
+
+
+def _encrypted_frame(block: MessageBlock) -> bytes:
+    """Encode one encrypted block as an NDJSON frame"""
+    return _ndjson_line(
+        {"block_number": block.block_number, "encrypted_value": str(block.encrypted_value)}
+    )
+
+
+@router.post("/encrypt/stream")
+async def encrypt_stream(
+    request: Request,
+    n: str = Query(description="RSA modulus"),
+    e: str = Query(description="RSA public exponent"),
+    rsa_crypto: RSACrypto = Depends(get_rsa_crypto),
+):
+    """
+    Encrypt a raw request body as it arrives.
+
+    The body is consumed incrementally and each encrypted block is emitted as
+    an NDJSON frame as soon as it is ready, so memory stays flat regardless of
+    payload size.
+    """
+    n_value, e_value = _parse_stream_key(n, e)
+    block_size = rsa_crypto.block_size(n_value)
+
+    async def frames() -> AsyncIterator[bytes]:
+        buffer = bytearray()
+        next_block = 1
+
+        async for chunk in request.stream():
+            buffer += chunk
+            ready = len(buffer) - len(buffer) % block_size
+            if not ready:
+                continue
+
+            payload = bytes(buffer[:ready])
+            del buffer[:ready]
+            blocks = await run_blocking(
+                list, rsa_crypto.iter_encrypt([payload], n_value, e_value, next_block)
+            )
+            next_block += len(blocks)
+            for block in blocks:
+                yield _encrypted_frame(block)
+
+        if buffer:
+            blocks = await run_blocking(
+                list, rsa_crypto.iter_encrypt([bytes(buffer)], n_value, e_value, next_block)
+            )
+            for block in blocks:
+                yield _encrypted_frame(block)
+
+    return DuplexStreamingResponse(frames(), media_type="application/x-ndjson")
+
+
+@router.post("/decrypt/stream")
+async def decrypt_stream(
+    request: Request,
+    n: str = Query(description="RSA modulus"),
+    d: str = Query(description="RSA private exponent"),
+    rsa_crypto: RSACrypto = Depends(get_rsa_crypto),
+):
+    """
+    Decrypt a newline-delimited stream of encrypted blocks.
+
+    Each input line is either a decimal block or an NDJSON frame as produced by
+    /encrypt/stream. Decrypted text is emitted as NDJSON frames while the body
+    is still being read.
+    """
+    n_value, d_value = _parse_stream_key(n, d)
+
+    def parse_line(line: bytes) -> int:
+        line = line.strip()
+        if line.startswith(b"{"):
+            return int(json.loads(line)["encrypted_value"])
+        return int(line)
+
+    async def frames() -> AsyncIterator[bytes]:
+        decoder = codecs.getincrementaldecoder("utf-8")()
+        buffer = bytearray()
+        next_block = 1
+
+        async def decrypt_lines(lines: List[bytes]) -> AsyncIterator[bytes]:
+            nonlocal next_block
+            values = [parse_line(line) for line in lines if line.strip()]
+            if not values:
+                return
+            blocks = await run_blocking(
+                list, rsa_crypto.iter_decrypt(values, n_value, d_value, next_block)
+            )
+            next_block += len(blocks)
+            for block in blocks:
+                text = decoder.decode(rsa_crypto.block_to_bytes(block.original_value))
+                yield _ndjson_line({"block_number": block.block_number, "text": text})
+
+        try:
+            async for chunk in request.stream():
+                buffer += chunk
+                cut = buffer.rfind(b"\n") + 1
+                if not cut:
+                    continue
+                lines = bytes(buffer[:cut]).split(b"\n")
+                del buffer[:cut]
+                async for frame in decrypt_lines(lines):
+                    yield frame
+
+            async for frame in decrypt_lines([bytes(buffer)]):
+                yield frame
+            decoder.decode(b"", final=True)
+        except (ValueError, KeyError) as e:
+            # Headers are already sent, so report the failure in-band
+            yield _ndjson_line({"error": f"Decryption failed: {str(e)}"})
+
+    return DuplexStreamingResponse(frames(), media_type="application/x-ndjson")
+
+
 @router.post("/encrypt-with-stored-keys")
 async def encrypt_with_stored_keys(
     message: str,
@@ -4,6 +4,7 @@ from fastapi import APIRouter, Depends
 
 from api.dependencies import AppState, get_app_state
 from config.settings import settings
+from core.arithmetic import get_backend
 from core.utils import get_system_info
 from models.schemas import HealthResponse
 
@@ -25,6 +26,7 @@ async def health_check(state: AppState = Depends(get_app_state)):
         primes_available=state.current_primes is not None,
         keys_generated=state.current_keypair is not None,
         system_info=system_info,
+        arithmetic_backend=get_backend().name,
     )
 
 
@@ -1,11 +1,34 @@
-import asyncio
+import base64
+import binascii
+from typing import Optional
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response
 
+from api.caching import conditional_response
 from api.dependencies import AppState, get_app_state, get_rsa_crypto, require_primes
+from api.executor import run_blocking
+from api.timing import timing_phase
+from config.settings import settings
+from core.key_encoding import (
+    PRIVATE_KEY_LABEL,
+    PUBLIC_KEY_LABEL,
+    encode_private_key,
+    encode_public_key,
+    load_key,
+    pem_encode,
+)
 from core.rsa_crypto import RSACrypto
-from models.crypto_models import PrimePair
-from models.schemas import PrivateKey, PublicKey, RSAKeysResponse, RSAParameters
+from models.crypto_models import PrimePair, RSAKeyPair
+from models.schemas import (
+    KeyFormat,
+    KeyImportRequest,
+    KeyImportResponse,
+    KeyType,
+    PrivateKey,
+    PublicKey,
+    RSAKeysResponse,
+    RSAParameters,
+)
 
 # create keys router
 ###########################
@@ -27,19 +50,20 @@ async def generate_keys(
     """
     try:
         # Generate keypair in thread pool
-        loop = asyncio.get_event_loop()
-        keypair = await loop.run_in_executor(None, rsa_crypto.generate_keypair, prime_pair)
+        keypair = await run_blocking(rsa_crypto.generate_keypair, prime_pair)
 
         # Store keypair in application state
-        state.current_keypair = keypair
-
-        return RSAKeysResponse(
-            public_key=PublicKey(n=str(keypair.n), e=str(keypair.e)),
-            private_key=PrivateKey(n=str(keypair.n), d=str(keypair.d)),
-            parameters=RSAParameters(
-                n=str(keypair.n), phi_n=str(keypair.phi_n), e=str(keypair.e), d=str(keypair.d)
-            ),
-        )
+        key_id = state.store_keypair(keypair)
+
+        with timing_phase("encode"):
+            return RSAKeysResponse(
+                public_key=PublicKey(n=str(keypair.n), e=str(keypair.e)),
+                private_key=PrivateKey(n=str(keypair.n), d=str(keypair.d)),
+                parameters=RSAParameters(
+                    n=str(keypair.n), phi_n=str(keypair.phi_n), e=str(keypair.e), d=str(keypair.d)
+                ),
+                key_id=key_id,
+            )
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Key generation failed: {str(e)}")
@@ -48,20 +72,30 @@ async def generate_keys(
 # get current keys endpoint
 ###########################
 @router.get("/current")
-async def get_current_keys(state: AppState = Depends(get_app_state)):
-    """Get information about currently stored keys (without revealing private key)"""
-    if state.current_keypair is None:
-        return {"status": "no_keys", "message": "No keys generated"}
+async def get_current_keys(request: Request, state: AppState = Depends(get_app_state)):
+    """
+    Get information about currently stored keys (without revealing private key)
 
-    keypair = state.current_keypair
-    return {
-        "status": "keys_available",
-        "public_key": {"n": str(keypair.n), "e": str(keypair.e)},
-        "key_info": {
-            "n_bit_length": keypair.n.bit_length(),
-            "is_valid": keypair.validate_key_pair(),
-        },
-    }
+    The body (including key validation) is built once per key version and
+    served with an ETag; If-None-Match polls of unchanged keys get a 304.
+    """
+
+    def render() -> dict:
+        if state.current_keypair is None:
+            return {"status": "no_keys", "message": "No keys generated"}
+
+        keypair = state.current_keypair
+        return {
+            "status": "keys_available",
+            "public_key": {"n": str(keypair.n), "e": str(keypair.e)},
+            "key_info": {
+                "n_bit_length": keypair.n.bit_length(),
+                "is_valid": keypair.validate_key_pair(),
+            },
+        }
+
+    etag, body = state.cached_status("keys", render)
+    return conditional_response(request, etag, body)
 
 
 # validate RSA keypair endpoint
@@ -78,3 +112,95 @@ async def validate_keys(state: AppState = Depends(get_app_state)):
         "is_valid": is_valid,
         "message": "Keys are valid" if is_valid else "Keys failed validation",
     }
+
+
+# import PKCS#1 key endpoint
+###########################
+@router.post("/import", response_model=KeyImportResponse)
+async def import_key(request: KeyImportRequest, state: AppState = Depends(get_app_state)):
+    """
+    Import a PKCS#1 RSA key from PEM or base64 DER.
+
+    Private keys become the current keypair and join the key store under
+    their key ID. Keys imported before come from the parsed-key cache
+    without being decoded again.
+    """
+    data = request.key.strip().encode("ascii", errors="replace")
+    if not data.startswith(b"-----BEGIN"):
+        try:
+            data = base64.b64decode(data, validate=True)
+        except binascii.Error:
+            raise HTTPException(status_code=400, detail="Key is neither PEM nor base64 DER")
+
+    try:
+        key, cached = load_key(data, state.key_cache)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid key: {e}")
+
+    key_type = "public"
+    if key.d is not None:
+        key_type = "private"
+        state.store_keypair(
+            RSAKeyPair(n=key.n, e=key.e, d=key.d, p=key.p, q=key.q, phi_n=(key.p - 1) * (key.q - 1))
+        )
+
+    return KeyImportResponse(
+        key_id=key.fingerprint,
+        key_type=key_type,
+        bit_length=key.n.bit_length(),
+        public_key=PublicKey(n=str(key.n), e=str(key.e)),
+        cached=cached,
+    )
+
+
+# export PKCS#1 key endpoint
+###########################
+def _private_export_allowed(token: Optional[str]) -> bool:
+    """Private keys leave the server only in debug mode or with the export token"""
+    if settings.debug:
+        return True
+    return bool(settings.key_export_token) and token == settings.key_export_token
+
+
+@router.get("/export")
+async def export_key(
+    key_type: KeyType = Query(default="public"),
+    format: KeyFormat = Query(default="pem"),
+    key_id: Optional[str] = Query(default=None, description="Stored key (default: current)"),
+    x_export_token: Optional[str] = Header(default=None),
+    state: AppState = Depends(get_app_state),
+):
+    """
+    Export a stored keypair as PKCS#1 PEM (text) or DER (binary).
+
+    Public keys of any stored keypair can be exported. Private keys (with
+    the CRT fields, so other tools can decrypt with them directly) only for
+    the current keypair, and only in debug mode or with the X-Export-Token
+    header; a key ID is derived from the public modulus and grants nothing.
+    """
+    if key_type == "private":
+        if not _private_export_allowed(x_export_token):
+            raise HTTPException(status_code=403, detail="Private key export is not available")
+        current = state.current_keypair
+        if key_id is not None and (current is None or current.fingerprint != key_id):
+            raise HTTPException(
+                status_code=403, detail="Only the current keypair's private key can be exported"
+            )
+
+    keypair = state.current_keypair if key_id is None else state.key_store.get(key_id)
+    if keypair is None:
+        detail = "No RSA keypair available" if key_id is None else f"Unknown key ID {key_id}"
+        raise HTTPException(status_code=404, detail=detail)
+
+    if key_type == "private":
+        der = encode_private_key(keypair.n, keypair.e, keypair.d, keypair.p, keypair.q)
+        label = PRIVATE_KEY_LABEL
+    else:
+        der = encode_public_key(keypair.n, keypair.e)
+        label = PUBLIC_KEY_LABEL
+
+    filename = f"{keypair.fingerprint}-{key_type}.{format}"
+    headers = {"Content-Disposition": f'attachment; filename="{filename}"'}
+    if format == "der":
+        return Response(der, media_type="application/octet-stream", headers=headers)
+    return Response(pem_encode(der, label), media_type="application/x-pem-file", headers=headers)
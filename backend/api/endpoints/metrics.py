@@ -0,0 +1,16 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from core.metrics import REGISTRY
+
+# create metrics router (mounted at the app root, Prometheus convention)
+###########################
+router = APIRouter(tags=["Metrics"])
+
+
+# prometheus scrape endpoint
+###########################
+@router.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """Prometheus text-format metrics for prime generation, crypto and executors"""
+    return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4")
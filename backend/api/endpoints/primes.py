@@ -1,10 +1,23 @@
-import asyncio
+import time
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
 
+from api.caching import conditional_response
 from api.dependencies import AppState, get_app_state, get_prime_generator
+from api.executor import run_blocking
+from api.timing import timing_phase
+from core.prime_certificates import (
+    certificate_from_dict,
+    certificate_to_dict,
+    verify_certificate,
+)
 from core.prime_generator import PrimeGenerator
-from models.schemas import PrimeGenerationRequest, PrimeGenerationResponse
+from models.schemas import (
+    CertificateVerificationResponse,
+    PrimeCertificateModel,
+    PrimeGenerationRequest,
+    PrimeGenerationResponse,
+)
 
 # create primes router
 ###########################
@@ -27,12 +40,12 @@ async def generate_primes(
     """
     try:
         # Run prime generation in thread pool to avoid blocking
-        loop = asyncio.get_event_loop()
-        prime_pair = await loop.run_in_executor(
-            None,
+        prime_pair = await run_blocking(
             prime_generator.generate_prime_pair,
             request.bit_length,
             request.miller_rabin_rounds,
+            request.seed,
+            request.prime_type,
         )
 
         # Store primes in application state
@@ -41,13 +54,18 @@ async def generate_primes(
         # Clear any existing keypair since we have new primes
         state.current_keypair = None
 
-        return PrimeGenerationResponse(
-            p=str(prime_pair.p),
-            q=str(prime_pair.q),
-            generation_time=prime_pair.generation_time,
-            bit_length=prime_pair.bit_length,
-            miller_rabin_rounds=prime_pair.miller_rabin_rounds,
-        )
+        with timing_phase("encode"):
+            return PrimeGenerationResponse(
+                p=str(prime_pair.p),
+                q=str(prime_pair.q),
+                generation_time=prime_pair.generation_time,
+                bit_length=prime_pair.bit_length,
+                miller_rabin_rounds=prime_pair.miller_rabin_rounds,
+                seed=request.seed,
+                prime_type=prime_pair.prime_type,
+                certificates=prime_pair.certificates
+                and [certificate_to_dict(c) for c in prime_pair.certificates],
+            )
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Prime generation failed: {str(e)}")
@@ -56,19 +74,56 @@ async def generate_primes(
 # get current prime pair information endpoint
 ###########################
 @router.get("/current")
-async def get_current_primes(state: AppState = Depends(get_app_state)):
-    """Get currently stored prime pair information (without revealing the primes)"""
-    if state.current_primes is None:
-        return {"status": "no_primes", "message": "No primes generated"}
-
-    return {
-        "status": "primes_available",
-        "bit_length": state.current_primes.bit_length,
-        "generation_time": state.current_primes.generation_time,
-        "miller_rabin_rounds": state.current_primes.miller_rabin_rounds,
-        "p_bit_length": state.current_primes.p.bit_length(),
-        "q_bit_length": state.current_primes.q.bit_length(),
-    }
+async def get_current_primes(request: Request, state: AppState = Depends(get_app_state)):
+    """
+    Get currently stored prime pair information (without revealing the primes)
+
+    Served with an ETag; If-None-Match polls of unchanged primes get a 304.
+    """
+
+    def render() -> dict:
+        if state.current_primes is None:
+            return {"status": "no_primes", "message": "No primes generated"}
+
+        return {
+            "status": "primes_available",
+            "bit_length": state.current_primes.bit_length,
+            "generation_time": state.current_primes.generation_time,
+            "miller_rabin_rounds": state.current_primes.miller_rabin_rounds,
+            "prime_type": state.current_primes.prime_type,
+            "p_bit_length": state.current_primes.p.bit_length(),
+            "q_bit_length": state.current_primes.q.bit_length(),
+        }
+
+    etag, body = state.cached_status("primes", render)
+    return conditional_response(request, etag, body)
+
+
+# verify a provable-prime certificate endpoint
+###########################
+@router.post("/certificates/verify", response_model=CertificateVerificationResponse)
+async def verify_prime_certificate(certificate: PrimeCertificateModel):
+    """
+    Check a Pocklington certificate chain (as returned for provable primes)
+
+    Costs two modular exponentiations per step, far less than re-testing
+    the prime; an invalid chain reports the first condition that failed.
+    """
+    parsed = certificate_from_dict(certificate.model_dump())
+    start_time = time.perf_counter()
+    reason = None
+    try:
+        await run_blocking(verify_certificate, parsed)
+    except ValueError as e:
+        reason = str(e)
+
+    return CertificateVerificationResponse(
+        valid=reason is None,
+        bit_length=parsed.bit_length,
+        steps=len(parsed.steps),
+        reason=reason,
+        verification_time=time.perf_counter() - start_time,
+    )
 
 
 @router.delete("/clear")
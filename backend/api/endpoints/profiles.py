@@ -0,0 +1,71 @@
+from typing import List, Literal, Optional
+
+from fastapi import APIRouter, Header, HTTPException, Query
+from fastapi.responses import Response
+
+from api.profiling import profile_store, profiles_visible
+from models.schemas import ProfileInfo
+
+# create profiles router
+###########################
+router = APIRouter(prefix="/debug/profiles", tags=["Profiling"])
+
+
+def _require_access(token: Optional[str]) -> None:
+    """Profiles are only visible in debug mode or with the profiling token"""
+    if not profiles_visible(token):
+        raise HTTPException(status_code=403, detail="Profiles are not available")
+
+
+# list recent profiles endpoint
+###########################
+@router.get("/", response_model=List[ProfileInfo])
+async def list_profiles(x_profile: Optional[str] = Header(default=None)):
+    """
+    List the most recent request profiles (newest first).
+
+    Send a request with an X-Profile header to have its executor work profiled.
+    """
+    _require_access(x_profile)
+    return [
+        ProfileInfo(
+            profile_id=profile.profile_id,
+            method=profile.method,
+            path=profile.path,
+            timestamp=profile.timestamp,
+            duration=profile.duration,
+        )
+        for profile in profile_store.list()
+    ]
+
+
+# download profile endpoint
+###########################
+@router.get("/{profile_id}")
+async def download_profile(
+    profile_id: str,
+    format: Literal["pstats", "collapsed"] = Query(default="pstats"),
+    x_profile: Optional[str] = Header(default=None),
+):
+    """
+    Download one profile.
+
+    pstats: binary file for pstats.Stats / snakeviz.
+    collapsed: "frame;frame;frame microseconds" lines for flame graph tools.
+    """
+    _require_access(x_profile)
+    profile = profile_store.get(profile_id)
+    if profile is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+
+    if format == "collapsed":
+        return Response(
+            profile.collector.collapsed(),
+            media_type="text/plain",
+            headers={"Content-Disposition": f'attachment; filename="{profile_id}.collapsed"'},
+        )
+    return Response(
+        profile.collector.pstats_bytes(),
+        media_type="application/octet-stream",
+        headers={"Content-Disposition": f'attachment; filename="{profile_id}.pstats"'},
+    )
@@ -0,0 +1,186 @@
+import asyncio
+from typing import Optional, Set
+
+from fastapi import APIRouter, Depends, WebSocket, WebSocketDisconnect
+from pydantic import TypeAdapter, ValidationError
+
+from api.dependencies import AppState, get_app_state, get_rsa_crypto
+from api.executor import run_blocking, wait_for_queue_below
+from config.settings import settings
+from core.metrics import Counter, Gauge
+from core.rsa_crypto import RSACrypto
+from models.crypto_models import BoundKey
+from models.schemas import SessionBindFrame, SessionDecryptFrame, SessionFrame
+
+# create session router
+###########################
+router = APIRouter(prefix="/session", tags=["Sessions"])
+
+SESSIONS_ACTIVE = Gauge("rsa_sessions_active", "Open WebSocket crypto sessions")
+SESSION_FRAMES = Counter(
+    "rsa_session_frames", "WebSocket session frames handled, by type", labelnames=("type",)
+)
+
+_frame_adapter = TypeAdapter(SessionFrame)
+
+
+class CryptoSession:
+    """
+    One WebSocket connection: a bound key and pipelined operations on it
+
+    bind frames are handled in order as they arrive; encrypt / decrypt frames
+    run concurrently on the executor with the key bound when they arrived and
+    answer as they finish, tagged with the frame id. The session stops
+    reading frames while session_max_in_flight operations are pending or the
+    executor queue is deeper than session_executor_queue_limit, so busy
+    servers push back on clients through the socket instead of queueing
+    without bound.
+    """
+
+    def __init__(self, websocket: WebSocket, rsa_crypto: RSACrypto, state: AppState):
+        self.websocket = websocket
+        self.rsa_crypto = rsa_crypto
+        self.state = state
+        self.key: Optional[BoundKey] = None
+        self._slots = asyncio.Semaphore(settings.session_max_in_flight)
+        self._tasks: Set[asyncio.Task] = set()
+        self._send_lock = asyncio.Lock()
+
+    async def run(self) -> None:
+        SESSIONS_ACTIVE.inc()
+        try:
+            while True:
+                await self._slots.acquire()
+                await wait_for_queue_below(settings.session_executor_queue_limit)
+                try:
+                    message = await self.websocket.receive()
+                except WebSocketDisconnect:
+                    message = {"type": "websocket.disconnect"}
+                if message["type"] == "websocket.disconnect":
+                    self._slots.release()
+                    break
+                if message.get("text") is None:
+                    self._slots.release()
+                    SESSION_FRAMES.labels(type="invalid").inc()
+                    detail = "Frames must be JSON text, not binary"
+                    await self._send({"type": "error", "id": None, "detail": detail})
+                    continue
+                await self._dispatch(message["text"])
+        finally:
+            for task in self._tasks:
+                task.cancel()
+            SESSIONS_ACTIVE.dec()
+
+    async def _dispatch(self, text: str) -> None:
+        """Handle bind inline; start encrypt / decrypt as a task holding a slot"""
+        try:
+            frame = _frame_adapter.validate_json(text)
+        except ValidationError as e:
+            self._slots.release()
+            SESSION_FRAMES.labels(type="invalid").inc()
+            await self._send({"type": "error", "id": None, "detail": str(e)})
+            return
+
+        SESSION_FRAMES.labels(type=frame.type).inc()
+        if isinstance(frame, SessionBindFrame):
+            try:
+                await self._bind(frame)
+            finally:
+                self._slots.release()
+            return
+
+        task = asyncio.create_task(self._operate(frame, self.key))
+        self._tasks.add(task)
+        task.add_done_callback(self._finished)
+
+    def _finished(self, task: asyncio.Task) -> None:
+        self._tasks.discard(task)
+        self._slots.release()
+
+    async def _bind(self, frame: SessionBindFrame) -> None:
+        try:
+            if frame.key_id is not None:
+                keypair = self.state.key_store.get(frame.key_id)
+                if keypair is None:
+                    raise ValueError(f"Unknown key ID {frame.key_id}")
+                key = BoundKey(
+                    n=keypair.n,
+                    e=keypair.e,
+                    d=keypair.d,
+                    p=keypair.p,
+                    q=keypair.q,
+                    crt_params=RSACrypto._crt_params(keypair.p, keypair.q, keypair.d),
+                )
+            else:
+                parts = [frame.n, frame.e, frame.d, frame.p, frame.q]
+                key = self.rsa_crypto.bind_key(*(int(x) if x is not None else None for x in parts))
+        except (ValueError, ArithmeticError) as e:
+            await self._send({"type": "error", "id": frame.id, "detail": str(e)})
+            return
+
+        self.key = key
+        await self._send(
+            {
+                "type": "bound",
+                "id": frame.id,
+                "key_id": key.fingerprint,
+                "bit_length": key.n.bit_length(),
+                "crt": key.crt,
+            }
+        )
+
+    async def _operate(self, frame, key: Optional[BoundKey]) -> None:
+        try:
+            if key is None:
+                raise ValueError("No key bound to this session")
+
+            if isinstance(frame, SessionDecryptFrame):
+                blocks = [int(block) for block in frame.encrypted_blocks]
+                result = await run_blocking(self.rsa_crypto.decrypt_bound, blocks, key)
+                if not result.success:
+                    raise ValueError(result.error_message or "Decryption failed")
+                reply = {"message": result.message}
+            else:
+                if key.e is None:
+                    raise ValueError("Bound key has no public exponent")
+                result = await run_blocking(
+                    self.rsa_crypto.encrypt_message, frame.message, key.n, key.e
+                )
+                if not result.success:
+                    raise ValueError(result.error_message or "Encryption failed")
+                reply = {
+                    "encrypted_blocks": [str(block.encrypted_value) for block in result.blocks]
+                }
+        except (ValueError, ArithmeticError) as e:
+            await self._send({"type": "error", "id": frame.id, "detail": str(e)})
+            return
+
+        await self._send({"type": "result", "id": frame.id, "op": frame.type, **reply})
+
+    async def _send(self, payload: dict) -> None:
+        async with self._send_lock:
+            try:
+                await self.websocket.send_json(payload)
+            except (WebSocketDisconnect, RuntimeError):
+                # The client went away; the receive loop ends the session
+                pass
+
+
+# crypto session endpoint
+###########################
+@router.websocket("/ws")
+async def crypto_session(
+    websocket: WebSocket,
+    rsa_crypto: RSACrypto = Depends(get_rsa_crypto),
+    state: AppState = Depends(get_app_state),
+):
+    """
+    Pipelined encrypt / decrypt over one connection with a session-bound key.
+
+    Frames are JSON objects: {"type": "bind", "n", "e", "d", "p", "q"} or
+    {"type": "bind", "key_id"} once, then any number of {"type": "encrypt",
+    "id", "message"} and {"type": "decrypt", "id", "encrypted_blocks"}.
+    Results come back as {"type": "result", "id", ...} in completion order.
+    """
+    await websocket.accept()
+    await CryptoSession(websocket, rsa_crypto, state).run()
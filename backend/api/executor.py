@@ -0,0 +1,98 @@
+import asyncio
+import contextvars
+import time
+from typing import Callable, Set, TypeVar
+
+from api.timing import current_timings
+from core.metrics import Gauge
+from core.profiling import active_profile
+from core.tracing import tracer
+from core.utils import system_sampler
+
+T = TypeVar("T")
+
+# Executor metrics
+###########################
+EXECUTOR_QUEUE_DEPTH = Gauge(
+    "rsa_executor_queue_depth", "Blocking calls submitted to the thread pool but not started"
+)
+EXECUTOR_IN_FLIGHT = Gauge("rsa_executor_in_flight", "Blocking calls running in the thread pool")
+
+system_sampler.add_source("executor_queue_depth", EXECUTOR_QUEUE_DEPTH.value)
+system_sampler.add_source("executor_in_flight", EXECUTOR_IN_FLIGHT.value)
+
+# Coroutines waiting for the queue to drain, woken whenever a queued call leaves the queue
+_queue_waiters: Set[asyncio.Future] = set()
+
+
+def _wake(waiter: asyncio.Future) -> None:
+    if not waiter.done():
+        waiter.set_result(None)
+
+
+def _notify_queue_waiters() -> None:
+    """Wake every waiter (safe from worker threads)"""
+    for waiter in list(_queue_waiters):
+        waiter.get_loop().call_soon_threadsafe(_wake, waiter)
+
+
+async def wait_for_queue_below(limit: int) -> None:
+    """Return once fewer than limit calls are queued, sleeping until the queue drains"""
+    loop = asyncio.get_running_loop()
+    while EXECUTOR_QUEUE_DEPTH.value() >= limit:
+        waiter = loop.create_future()
+        _queue_waiters.add(waiter)
+        try:
+            await waiter
+        finally:
+            _queue_waiters.discard(waiter)
+
+
+async def run_blocking(func: Callable[..., T], *args) -> T:
+    """
+    Run a blocking (CPU-bound) call in the default thread pool
+
+    The caller's context variables are carried into the worker thread,
+    queue depth / in-flight gauges are kept up to date, queue wait and
+    compute time are recorded on the current request's timings, the call
+    runs under cProfile when the request is being profiled, and the whole
+    submission is traced as a span.
+    """
+    with tracer.span("executor.run_blocking", function=getattr(func, "__qualname__", str(func))):
+        return await _submit(func, *args)
+
+
+async def _submit(func: Callable[..., T], *args) -> T:
+    """Submit to the thread pool with the current context (including the executor span)"""
+    loop = asyncio.get_event_loop()
+    context = contextvars.copy_context()
+    timings = current_timings.get()
+    submitted = time.perf_counter()
+    started = False
+
+    def call() -> T:
+        nonlocal started
+        started = True
+        compute_start = time.perf_counter()
+        EXECUTOR_QUEUE_DEPTH.dec()
+        if _queue_waiters:
+            _notify_queue_waiters()
+        EXECUTOR_IN_FLIGHT.inc()
+        try:
+            profile = context.get(active_profile)
+            if profile is not None:
+                return context.run(profile.run, func, *args)
+            return context.run(func, *args)
+        finally:
+            EXECUTOR_IN_FLIGHT.dec()
+            if timings is not None:
+                timings.add("queue", compute_start - submitted, submitted)
+                timings.add("compute", time.perf_counter() - compute_start, compute_start)
+
+    EXECUTOR_QUEUE_DEPTH.inc()
+    try:
+        return await loop.run_in_executor(None, call)
+    finally:
+        if not started:
+            EXECUTOR_QUEUE_DEPTH.dec()
+            _notify_queue_waiters()
@@ -0,0 +1,65 @@
+import time
+import uuid
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Deque, List, Optional
+
+from config.settings import settings
+from core.profiling import ProfileCollector
+
+PROFILE_HEADER = "X-Profile"
+
+
+@dataclass
+class RequestProfile:
+    """cProfile stats collected for one request's executor work"""
+
+    method: str
+    path: str
+    profile_id: str = field(default_factory=lambda: uuid.uuid4().hex[:12])
+    timestamp: float = field(default_factory=time.time)
+    duration: float = 0.0
+    collector: ProfileCollector = field(default_factory=ProfileCollector)
+
+
+class ProfileStore:
+    """Bounded ring buffer of the most recent request profiles"""
+
+    def __init__(self, size: int):
+        self._profiles: Deque[RequestProfile] = deque(maxlen=size)
+
+    def add(self, profile: RequestProfile) -> None:
+        self._profiles.append(profile)
+
+    def get(self, profile_id: str) -> Optional[RequestProfile]:
+        return next((p for p in self._profiles if p.profile_id == profile_id), None)
+
+    def list(self) -> List[RequestProfile]:
+        return list(reversed(self._profiles))
+
+    def clear(self) -> None:
+        self._profiles.clear()
+
+
+profile_store = ProfileStore(settings.profile_buffer_size)
+
+
+def profiling_allowed(header_value: Optional[str]) -> bool:
+    """
+    Whether a request may be profiled
+
+    In debug mode any X-Profile header enables profiling; otherwise its value
+    must match settings.profile_token (and a token must be configured).
+    """
+    if header_value is None:
+        return False
+    if settings.debug:
+        return True
+    return bool(settings.profile_token) and header_value == settings.profile_token
+
+
+def profiles_visible(header_value: Optional[str]) -> bool:
+    """Whether stored profiles may be listed and downloaded"""
+    if settings.debug:
+        return True
+    return bool(settings.profile_token) and header_value == settings.profile_token
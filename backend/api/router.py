@@ -1,10 +1,11 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends
 
-from api.endpoints import crypto, health, keys, primes
+from api.dependencies import label_endpoint
+from api.endpoints import audit, crypto, health, keys, primes, profiles, session
 
 # Create main API router
 ###########################
-api_router = APIRouter(prefix="/api")
+api_router = APIRouter(prefix="/api", dependencies=[Depends(label_endpoint)])
 
 # Include all endpoint routers
 ###########################
@@ -12,6 +13,9 @@ api_router.include_router(primes.router)
 api_router.include_router(keys.router)
 api_router.include_router(crypto.router)
 api_router.include_router(health.router)
+api_router.include_router(audit.router)
+api_router.include_router(profiles.router)
+api_router.include_router(session.router)
 
 
 # Root endpoint
@@ -27,6 +31,8 @@ async def api_root():
             "keys": "/api/keys/*",
             "crypto": "/api/crypto/*",
             "health": "/api/health/*",
+            "audit": "/api/audit/*",
+            "session": "/api/session/ws (WebSocket)",
         },
         "docs": "/docs",
         "redoc": "/redoc",
@@ -0,0 +1,75 @@
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, Optional
+
+# Phase names, in the order they are reported
+###########################
+PHASES = ("parse", "decode", "queue", "compute", "encode")
+
+
+class RequestTimings:
+    """
+    Per-request phase breakdown
+
+    Endpoints and the executor record phases as they run. Time before the
+    first recorded phase is attributed to body parsing/validation and time
+    after the last one to response encoding (FastAPI serialization).
+    """
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.phases: Dict[str, float] = {}
+        self._first_mark: Optional[float] = None
+        self._last_mark: Optional[float] = None
+
+    def add(self, name: str, seconds: float, start: Optional[float] = None) -> None:
+        """Accumulate seconds into a phase that started at start"""
+        start = start if start is not None else time.perf_counter() - seconds
+        self.phases[name] = self.phases.get(name, 0.0) + seconds
+        if self._first_mark is None or start < self._first_mark:
+            self._first_mark = start
+        end = start + seconds
+        if self._last_mark is None or end > self._last_mark:
+            self._last_mark = end
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Time a block of code as (part of) a phase"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - start, start)
+
+    def finish(self) -> Dict[str, float]:
+        """Close the request and return every phase in milliseconds, plus total"""
+        end = time.perf_counter()
+        phases = dict(self.phases)
+        if self._first_mark is not None:
+            phases["parse"] = phases.get("parse", 0.0) + self._first_mark - self.start
+            phases["encode"] = phases.get("encode", 0.0) + end - self._last_mark
+
+        ordered = {name: phases[name] for name in PHASES if name in phases}
+        ordered.update({name: value for name, value in phases.items() if name not in ordered})
+        ordered["total"] = end - self.start
+        return {name: round(seconds * 1000, 3) for name, seconds in ordered.items()}
+
+    @staticmethod
+    def server_timing_header(phases_ms: Dict[str, float]) -> str:
+        """Format phases as a Server-Timing header value"""
+        return ", ".join(f"{name};dur={duration}" for name, duration in phases_ms.items())
+
+
+current_timings: ContextVar[Optional[RequestTimings]] = ContextVar("current_timings", default=None)
+
+
+@contextmanager
+def timing_phase(name: str) -> Iterator[None]:
+    """Record a phase on the current request, if there is one"""
+    timings = current_timings.get()
+    if timings is None:
+        yield
+        return
+    with timings.phase(name):
+        yield
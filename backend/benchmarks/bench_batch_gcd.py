@@ -0,0 +1,74 @@
+"""
+Benchmark the batch GCD shared-factor audit.
+
+Builds synthetic moduli from base-2 Fermat probable primes (cheap to make
+in bulk and indistinguishable for this purpose) with a handful of planted
+shared factors, and compares against the naive pairwise scan where that is
+still affordable. Note that CPython's big-int division is quadratic, so the
+top of the remainder tree dominates; an accelerated integer backend changes
+the picture considerably at 10k+ moduli.
+
+Usage (from backend/):
+    python -m benchmarks.bench_batch_gcd [count ...]    # default: 1000 10000 100000
+"""
+
+import random
+import sys
+import time
+from math import gcd
+
+from core.batch_gcd import audit_shared_factors
+
+PAIRWISE_LIMIT = 2000
+
+
+SMALL_PRIMES_PRODUCT = 3 * 5 * 7 * 11 * 13 * 17 * 19 * 23 * 29 * 31 * 37 * 41 * 43 * 47
+
+
+def synthetic_moduli(count: int, bits: int = 256, planted: int = 3, seed: int = 0) -> dict:
+    """Moduli made of two `bits`-bit probable primes, with `planted` pairs sharing one"""
+    rng = random.Random(seed)
+
+    def factor() -> int:
+        while True:
+            candidate = rng.getrandbits(bits) | (1 << (bits - 1)) | 1
+            if gcd(candidate, SMALL_PRIMES_PRODUCT) == 1 and pow(2, candidate - 1, candidate) == 1:
+                return candidate
+
+    moduli = {f"key-{i}": factor() * factor() for i in range(count)}
+    for i in range(planted):
+        shared = factor()
+        moduli[f"key-{2 * i}"] = shared * factor()
+        moduli[f"key-{2 * i + 1}"] = shared * factor()
+    return moduli
+
+
+def pairwise_scan(moduli: dict) -> int:
+    """Naive O(N^2) gcd scan, for comparison"""
+    values = list(moduli.values())
+    return sum(1 for i, a in enumerate(values) for b in values[i + 1 :] if gcd(a, b) > 1)
+
+
+def main(argv):
+    counts = [int(arg) for arg in argv] or [1000, 10000, 100000]
+
+    for count in counts:
+        start = time.perf_counter()
+        moduli = synthetic_moduli(count)
+        print(f"{count:>7} moduli: generated inputs in {time.perf_counter() - start:.1f}s")
+
+        audit = audit_shared_factors(moduli)
+        line = (
+            f"{count:>7} moduli: batch GCD {audit.audit_time:8.2f}s, "
+            f"{len(audit.vulnerable_key_ids)} vulnerable keys"
+        )
+
+        if count <= PAIRWISE_LIMIT:
+            start = time.perf_counter()
+            pairwise_scan(moduli)
+            line += f", pairwise {time.perf_counter() - start:8.2f}s"
+        print(line)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
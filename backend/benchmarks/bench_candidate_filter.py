@@ -0,0 +1,60 @@
+"""
+Benchmark batch candidate sieving against per-candidate trial division.
+
+Compares three ways of rejecting candidates with a prime factor below 4096:
+a Python loop of modulo checks, one gcd per candidate against the product of
+the small primes, and PrimeGenerator.filter_candidates (remainder tree over
+the whole batch).
+
+Usage (from backend/):
+    python -m benchmarks.bench_candidate_filter [bit_length ...]    # default: 512 1024 2048
+"""
+
+import random
+import sys
+import time
+from math import gcd
+
+from core.prime_generator import PrimeGenerator, _sieve_primes, _sieve_primes_product
+
+BATCH_SIZES = [256, 1024, 4096]
+
+
+def loop_filter(candidates):
+    return [c for c in candidates if not any(c % p == 0 for p in _sieve_primes())]
+
+
+def gcd_filter(candidates):
+    return [c for c in candidates if gcd(c, _sieve_primes_product()) == 1]
+
+
+def timed(func, candidates):
+    start = time.perf_counter()
+    result = func(candidates)
+    return time.perf_counter() - start, result
+
+
+def main(argv):
+    bit_lengths = [int(arg) for arg in argv] or [512, 1024, 2048]
+    rng = random.Random(0)
+
+    for bit_length in bit_lengths:
+        for batch_size in BATCH_SIZES:
+            candidates = [
+                rng.getrandbits(bit_length) | (1 << (bit_length - 1)) | 1 for _ in range(batch_size)
+            ]
+
+            loop_time, expected = timed(loop_filter, candidates)
+            gcd_time, gcd_result = timed(gcd_filter, candidates)
+            tree_time, tree_result = timed(PrimeGenerator.filter_candidates, candidates)
+            assert expected == gcd_result == tree_result
+
+            print(
+                f"{bit_length:>5} bits x {batch_size:>5}: "
+                f"loop {loop_time * 1e3:8.2f}ms  gcd {gcd_time * 1e3:8.2f}ms  "
+                f"tree {tree_time * 1e3:8.2f}ms  ({len(expected)} survivors)"
+            )
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
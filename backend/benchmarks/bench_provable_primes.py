@@ -0,0 +1,65 @@
+"""
+Benchmark provable (Shawe-Taylor) prime generation against Miller-Rabin.
+
+Times PrimeGenerator.generate_certified_prime next to probable-prime
+generation at several Miller-Rabin round counts, plus verification of the
+emitted Pocklington certificate. Each configuration is timed over the same
+seeded candidate streams, so the comparison is like for like.
+
+Usage (from backend/):
+    python -m benchmarks.bench_provable_primes [--backend python|gmpy2] [--repeat N] [bits ...]
+    (default bits: 1024 2048)
+"""
+
+import argparse
+import statistics
+import time
+
+from core.arithmetic import available_backends, set_backend
+from core.entropy import PseudoRandomSource, set_random_source
+from core.prime_certificates import verify_certificate
+from core.prime_generator import PrimeGenerator
+
+MILLER_RABIN_ROUNDS = [10, 40, 64]
+
+
+def timed(func, repeat, seed):
+    times = []
+    for i in range(repeat):
+        set_random_source(PseudoRandomSource(seed + i))
+        start = time.perf_counter()
+        result = func()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times), min(times), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("bits", nargs="*", type=int, default=[1024, 2048])
+    parser.add_argument("--backend", choices=available_backends(), default="python")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    set_backend(args.backend)
+    generator = PrimeGenerator()
+
+    print(f"backend {args.backend}, median / min of {args.repeat} runs")
+    for bit_length in args.bits:
+        for rounds in MILLER_RABIN_ROUNDS:
+            median, best, _ = timed(
+                lambda: generator._generate_single_prime(bit_length, rounds), args.repeat, args.seed
+            )
+            print(f"{bit_length:>5} bits {f'MR x{rounds}':<12} {median:9.3f}s  {best:9.3f}s")
+
+        median, best, certificate = timed(
+            lambda: generator.generate_certified_prime(bit_length), args.repeat, args.seed
+        )
+        print(f"{bit_length:>5} bits {'provable':<12} {median:9.3f}s  {best:9.3f}s")
+
+        median, best, _ = timed(lambda: verify_certificate(certificate), args.repeat, args.seed)
+        print(f"{bit_length:>5} bits {'verify':<12} {median:9.3f}s  {best:9.3f}s")
+
+
+if __name__ == "__main__":
+    main()
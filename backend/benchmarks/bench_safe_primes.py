@@ -0,0 +1,69 @@
+"""
+Benchmark safe-prime generation: naive search against joint window sieving.
+
+The naive search draws a random prime q and keeps it only if 2q + 1 is prime
+too, paying a full prime search per attempt. PrimeGenerator.generate_safe_prime
+sieves q and 2q + 1 together over a window and runs base-2 Fermat checks
+before the full tests. The naive search is only run up to NAIVE_MAX_BITS, as
+it quickly becomes impractical. Strong (Gordon) prime generation is timed
+alongside for reference.
+
+Usage (from backend/):
+    python -m benchmarks.bench_safe_primes [--backend python|gmpy2] [--repeat N] [bits ...]
+    (default bits: 512 1024 2048)
+"""
+
+import argparse
+import statistics
+import time
+
+from core.arithmetic import available_backends, get_backend, set_backend
+from core.entropy import PseudoRandomSource, set_random_source
+from core.prime_generator import PrimeGenerator
+
+NAIVE_MAX_BITS = 512
+
+
+def naive_safe_prime(generator, bit_length, rounds=10):
+    backend = get_backend()
+    while True:
+        q = generator._generate_single_prime(bit_length - 1, rounds)
+        if backend.is_probable_prime(2 * q + 1, rounds):
+            return 2 * q + 1
+
+
+def timed(func, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times), min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("bits", nargs="*", type=int, default=[512, 1024, 2048])
+    parser.add_argument("--backend", choices=available_backends(), default="python")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    set_backend(args.backend)
+    set_random_source(PseudoRandomSource(args.seed))
+    generator = PrimeGenerator()
+
+    print(f"backend {args.backend}, median / min of {args.repeat} runs")
+    for bit_length in args.bits:
+        cases = [("sieved safe", lambda: generator.generate_safe_prime(bit_length))]
+        if bit_length <= NAIVE_MAX_BITS:
+            cases.insert(0, ("naive safe", lambda: naive_safe_prime(generator, bit_length)))
+        cases.append(("strong", lambda: generator.generate_strong_prime(bit_length)))
+
+        for name, func in cases:
+            median, best = timed(func, args.repeat)
+            print(f"{bit_length:>5} bits {name:<12} {median:9.3f}s  {best:9.3f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Benchmark small encrypt/decrypt calls: one HTTP POST each vs a WebSocket session.
+
+Both run in process through Starlette's TestClient. The HTTP side re-sends
+and re-parses the decimal key with every request; the session binds the
+stored key once (with CRT parameters) and pipelines frames, reading
+results as they complete.
+
+Usage (from backend/):
+    python -m benchmarks.bench_session [--bits 1024] [--operations 500]
+"""
+
+import argparse
+import time
+
+from fastapi.testclient import TestClient
+
+from main import app
+
+MESSAGE = "small interactive payload"
+
+
+def run_http(client, keys, operations):
+    public, private = keys["public_key"], keys["private_key"]
+    start = time.perf_counter()
+    for _ in range(operations // 2):
+        encrypted = client.post(
+            "/api/crypto/encrypt", json={"message": MESSAGE, "n": public["n"], "e": public["e"]}
+        ).json()
+        client.post(
+            "/api/crypto/decrypt",
+            json={
+                "encrypted_blocks": encrypted["encrypted_blocks"],
+                "n": private["n"],
+                "d": private["d"],
+            },
+        )
+    return time.perf_counter() - start
+
+
+def run_session(client, keys, operations):
+    start = time.perf_counter()
+    with client.websocket_connect("/api/session/ws") as ws:
+        ws.send_json({"type": "bind", "key_id": keys["key_id"]})
+        ws.receive_json()
+        for i in range(operations // 2):
+            ws.send_json({"type": "encrypt", "id": i, "message": MESSAGE})
+        encrypted = [ws.receive_json() for _ in range(operations // 2)]
+        for reply in encrypted:
+            ws.send_json(
+                {
+                    "type": "decrypt",
+                    "id": reply["id"],
+                    "encrypted_blocks": reply["encrypted_blocks"],
+                }
+            )
+        for _ in range(operations // 2):
+            ws.receive_json()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--bits", type=int, default=1024, help="Prime bit length")
+    parser.add_argument("--operations", type=int, default=500)
+    args = parser.parse_args()
+
+    with TestClient(app) as client:
+        client.post("/api/primes/generate", json={"bit_length": args.bits})
+        keys = client.post("/api/keys/generate").json()
+
+        for name, run in [("http", run_http), ("session", run_session)]:
+            elapsed = run(client, keys, args.operations)
+            print(
+                f"{name:<8} {args.operations} ops in {elapsed:7.3f}s "
+                f"({args.operations / elapsed:8.1f} ops/s)"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Measure worker boot: import time of main (from -X importtime) and first-request latency.
+
+Each measurement runs in a fresh interpreter, as a new uvicorn worker would.
+Prints the slowest project modules by self time, the framework share, and
+the time from startup to the first /api/health/ response.
+
+Usage (from backend/):
+    python -m benchmarks.bench_startup [--runs 5] [--top 15]
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from typing import List, Tuple
+
+PROJECT_PACKAGES = ("main", "api", "cli", "config", "core", "models")
+
+FIRST_REQUEST_SCRIPT = """
+import json, time
+start = time.perf_counter()
+from fastapi.testclient import TestClient
+import main
+imported = time.perf_counter()
+with TestClient(main.app) as client:
+    started = time.perf_counter()
+    client.get("/api/health/").raise_for_status()
+    done = time.perf_counter()
+print(json.dumps({"import": imported - start, "lifespan": started - imported,
+                  "first_request": done - started}))
+"""
+
+
+def import_times() -> List[Tuple[str, int, int]]:
+    """(module, self us, cumulative us) for every module imported by `import main`"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    modules = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:") :].split("|")
+        modules.append((name.strip(), int(self_us), int(cumulative_us)))
+    return modules
+
+
+def is_project_module(name: str) -> bool:
+    return name.split(".")[0] in PROJECT_PACKAGES
+
+
+def first_request_times() -> dict:
+    """Seconds spent importing main, running the lifespan and serving the first request"""
+    result = subprocess.run(
+        [sys.executable, "-c", FIRST_REQUEST_SCRIPT], capture_output=True, text=True, check=True
+    )
+    return json.loads(result.stdout.splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+
+    runs = [import_times() for _ in range(args.runs)]
+    totals = [next(c for name, _, c in run if name == "main") for run in runs]
+    project = [sum(s for name, s, _ in run if is_project_module(name)) for run in runs]
+    print(f"import main: {statistics.median(totals) / 1000:.1f} ms (median of {args.runs})")
+    print(f"  project modules (self): {statistics.median(project) / 1000:.1f} ms")
+
+    slowest = sorted(runs[-1], key=lambda module: -module[1])
+    print("slowest project modules (self ms, last run):")
+    for name, self_us, _ in [m for m in slowest if is_project_module(m[0])][: args.top]:
+        print(f"  {self_us / 1000:7.2f}  {name}")
+
+    boots = [first_request_times() for _ in range(args.runs)]
+    for phase in ("import", "lifespan", "first_request"):
+        median = statistics.median(boot[phase] for boot in boots)
+        print(f"{phase:>14}: {median * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,29 @@
+"""
+Calibrate settings.parallel_block_threshold for this machine.
+
+Times serial vs process-pool block exponentiation at increasing block counts
+and prints the smallest count where the pool wins, per key size.
+
+Usage (from backend/):
+    python -m benchmarks.calibrate_parallel [bit_length ...]
+"""
+
+import sys
+
+from core.parallel import calibrate_parallel_threshold, pool_size, shutdown_process_pool
+
+
+def main(argv):
+    bit_lengths = [int(arg) for arg in argv] or [512, 1024, 2048, 4096]
+
+    try:
+        for bit_length in bit_lengths:
+            threshold = calibrate_parallel_threshold(bit_length)
+            print(f"{bit_length:>5}-bit modulus: parallel wins from {threshold} blocks")
+        print(f"pool size: {pool_size()} processes")
+    finally:
+        shutdown_process_pool()
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
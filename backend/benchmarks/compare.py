@@ -0,0 +1,81 @@
+"""
+Compare benchmark results from benchmarks.suite against a stored baseline.
+
+A benchmark is flagged as a regression when the chosen statistic (min by
+default) grew by more than the threshold. Exits with status 1 if anything
+regressed, so it can gate CI.
+
+Usage (from backend/):
+    python -m benchmarks.compare baseline.json results.json [--threshold 0.10] [--stat min]
+"""
+
+import argparse
+import json
+import sys
+from typing import Dict, List, Tuple
+
+STATS = ("min", "median", "mean")
+
+
+def load_results(path: str) -> Dict[str, dict]:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)["results"]
+
+
+def compare_results(
+    baseline: Dict[str, dict], current: Dict[str, dict], threshold: float, stat: str = "min"
+) -> List[Tuple[str, float, float, float, str]]:
+    """
+    Compare two result sets benchmark by benchmark
+
+    Returns:
+        (benchmark, baseline seconds, current seconds, relative change, status)
+        rows, status being "regression", "improvement", "ok", "new" or "missing"
+    """
+    rows = []
+    for key in sorted(set(baseline) | set(current)):
+        if key not in baseline:
+            rows.append((key, 0.0, current[key][stat], 0.0, "new"))
+            continue
+        if key not in current:
+            rows.append((key, baseline[key][stat], 0.0, 0.0, "missing"))
+            continue
+
+        before, after = baseline[key][stat], current[key][stat]
+        change = (after - before) / before if before else 0.0
+        if change > threshold:
+            status = "regression"
+        elif change < -threshold:
+            status = "improvement"
+        else:
+            status = "ok"
+        rows.append((key, before, after, change, status))
+    return rows
+
+
+def main(argv: List[str]) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("baseline")
+    parser.add_argument("current")
+    parser.add_argument("--threshold", type=float, default=0.10, help="allowed relative slowdown")
+    parser.add_argument("--stat", choices=STATS, default="min")
+    args = parser.parse_args(argv)
+
+    rows = compare_results(
+        load_results(args.baseline), load_results(args.current), args.threshold, args.stat
+    )
+    for key, before, after, change, status in rows:
+        print(
+            f"{key:<48} {before * 1e3:10.3f}ms -> {after * 1e3:10.3f}ms "
+            f"{change:+8.1%}  {status}"
+        )
+
+    regressions = [row for row in rows if row[4] == "regression"]
+    if regressions:
+        print(f"{len(regressions)} regression(s) above {args.threshold:.0%}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,248 @@
+"""
+HTTP load test for the API.
+
+Drives a weighted mix of prime generation, key generation, encryption and
+decryption requests at a fixed concurrency and reports throughput, error
+rate and p50/p95/p99 latency per endpoint. By default the app runs in
+process through httpx's ASGI transport (no server needed, but everything
+shares one event loop with the load generator); pass --url to load a running
+uvicorn instead, e.g. to compare --workers settings.
+
+Usage (from backend/):
+    python -m benchmarks.load_test [--url http://localhost:8000] [--concurrency 16]
+        [--requests 500 | --duration 30] [--mix primes=1,keys=1,encrypt=4,decrypt=4]
+        [--bits 512] [--output load.json]
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import sys
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+import httpx
+
+DEFAULT_MIX = "primes=1,keys=1,encrypt=4,decrypt=4"
+MESSAGE = "The quick brown fox jumps over the lazy dog. " * 4
+
+# Request body factory per operation; bodies may depend on the key material set up first
+RequestFactory = Callable[[dict], Tuple[str, str, Optional[dict]]]
+
+
+def request_factories(bit_length: int) -> Dict[str, RequestFactory]:
+    return {
+        "primes": lambda keys: (
+            "POST",
+            "/api/primes/generate",
+            {"bit_length": bit_length, "miller_rabin_rounds": 10},
+        ),
+        "keys": lambda keys: ("POST", "/api/keys/generate", None),
+        "encrypt": lambda keys: (
+            "POST",
+            "/api/crypto/encrypt",
+            {"message": MESSAGE, "n": keys["n"], "e": keys["e"]},
+        ),
+        "decrypt": lambda keys: (
+            "POST",
+            "/api/crypto/decrypt",
+            {"encrypted_blocks": keys["encrypted_blocks"], "n": keys["n"], "d": keys["d"]},
+        ),
+    }
+
+
+def parse_mix(mix: str, operations: List[str]) -> Dict[str, float]:
+    """Parse "name=weight,..." into weights, rejecting unknown operations"""
+    weights = {}
+    for item in mix.split(","):
+        name, _, weight = item.partition("=")
+        name = name.strip()
+        if name not in operations:
+            raise ValueError(f"Unknown operation {name!r}; choose from {', '.join(operations)}")
+        weights[name] = float(weight or 1)
+    return {name: weight for name, weight in weights.items() if weight > 0}
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, round(fraction * len(sorted_values)) - 1))
+    return sorted_values[rank]
+
+
+def summarize(samples: List[Tuple[str, float, bool]], elapsed: float) -> Dict[str, dict]:
+    """Per-operation (plus "all") count, throughput, error rate and latency percentiles"""
+    groups: Dict[str, List[Tuple[float, bool]]] = {}
+    for operation, latency, ok in samples:
+        groups.setdefault(operation, []).append((latency, ok))
+        groups.setdefault("all", []).append((latency, ok))
+
+    report = {}
+    for operation, values in sorted(groups.items()):
+        latencies = sorted(latency for latency, _ in values)
+        errors = sum(1 for _, ok in values if not ok)
+        report[operation] = {
+            "requests": len(values),
+            "errors": errors,
+            "error_rate": errors / len(values),
+            "throughput": len(values) / elapsed if elapsed else 0.0,
+            "mean_ms": statistics.mean(latencies) * 1e3,
+            "p50_ms": percentile(latencies, 0.50) * 1e3,
+            "p95_ms": percentile(latencies, 0.95) * 1e3,
+            "p99_ms": percentile(latencies, 0.99) * 1e3,
+            "max_ms": latencies[-1] * 1e3,
+        }
+    return report
+
+
+async def prepare_keys(client: httpx.AsyncClient, bit_length: int) -> dict:
+    """Generate primes and keys once, and a ciphertext for the decrypt requests"""
+    response = await client.post(
+        "/api/primes/generate", json={"bit_length": bit_length, "miller_rabin_rounds": 10}
+    )
+    response.raise_for_status()
+    response = await client.post("/api/keys/generate")
+    response.raise_for_status()
+    keys = response.json()
+
+    response = await client.post(
+        "/api/crypto/encrypt",
+        json={"message": MESSAGE, "n": keys["public_key"]["n"], "e": keys["public_key"]["e"]},
+    )
+    response.raise_for_status()
+    return {
+        "n": keys["public_key"]["n"],
+        "e": keys["public_key"]["e"],
+        "d": keys["private_key"]["d"],
+        "encrypted_blocks": response.json()["encrypted_blocks"],
+    }
+
+
+async def run_load(
+    client: httpx.AsyncClient,
+    weights: Dict[str, float],
+    factories: Dict[str, RequestFactory],
+    keys: dict,
+    concurrency: int,
+    total_requests: Optional[int],
+    duration: Optional[float],
+    seed: int,
+) -> Tuple[List[Tuple[str, float, bool]], float]:
+    """Run the mix until total_requests have been sent or duration has passed"""
+    rng = random.Random(seed)
+    names = list(weights)
+    # Draw the whole schedule up front so a seed always produces the same request sequence
+    schedule = rng.choices(names, weights=list(weights.values()), k=total_requests or 1_000_000)
+    position = 0
+    samples: List[Tuple[str, float, bool]] = []
+    start = time.perf_counter()
+    deadline = start + duration if duration else None
+
+    async def worker() -> None:
+        nonlocal position
+        while position < len(schedule):
+            if deadline is not None and time.perf_counter() >= deadline:
+                return
+            operation = schedule[position]
+            position += 1
+
+            method, path, body = factories[operation](keys)
+            sent = time.perf_counter()
+            try:
+                response = await client.request(method, path, json=body)
+                ok = response.status_code < 400
+            except httpx.HTTPError:
+                ok = False
+            samples.append((operation, time.perf_counter() - sent, ok))
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return samples, time.perf_counter() - start
+
+
+def print_report(report: Dict[str, dict], elapsed: float, concurrency: int) -> None:
+    print(f"\n{elapsed:.2f}s at concurrency {concurrency}")
+    print(
+        f"{'operation':<10} {'reqs':>7} {'err%':>6} {'req/s':>8} "
+        f"{'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9}"
+    )
+    for operation, row in report.items():
+        print(
+            f"{operation:<10} {row['requests']:>7} {row['error_rate'] * 100:>6.1f} "
+            f"{row['throughput']:>8.1f} {row['p50_ms']:>9.1f} {row['p95_ms']:>9.1f} "
+            f"{row['p99_ms']:>9.1f} {row['max_ms']:>9.1f}"
+        )
+
+
+async def main_async(args: argparse.Namespace) -> dict:
+    factories = request_factories(args.bits)
+    weights = parse_mix(args.mix, list(factories))
+    timeout = httpx.Timeout(args.timeout)
+
+    if args.url:
+        client = httpx.AsyncClient(base_url=args.url, timeout=timeout)
+        lifespan = None
+    else:
+        from main import app
+
+        client = httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app), base_url="http://localhost", timeout=timeout
+        )
+        # ASGITransport does not send lifespan events, so run startup/shutdown around the test
+        lifespan = app.router.lifespan_context(app)
+
+    async with client:
+        if lifespan is not None:
+            await lifespan.__aenter__()
+        try:
+            keys = await prepare_keys(client, args.bits)
+            samples, elapsed = await run_load(
+                client,
+                weights,
+                factories,
+                keys,
+                args.concurrency,
+                args.requests if not args.duration else None,
+                args.duration,
+                args.seed,
+            )
+        finally:
+            if lifespan is not None:
+                await lifespan.__aexit__(None, None, None)
+
+    report = summarize(samples, elapsed)
+    print_report(report, elapsed, args.concurrency)
+    return {
+        "target": args.url or "in-process",
+        "concurrency": args.concurrency,
+        "mix": weights,
+        "bit_length": args.bits,
+        "elapsed": elapsed,
+        "results": report,
+    }
+
+
+def main(argv: List[str]) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--url", help="base URL of a running server (default: in-process ASGI)")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=500, help="total requests to send")
+    parser.add_argument("--duration", type=float, help="run for this many seconds instead")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="weighted operations, name=weight")
+    parser.add_argument("--bits", type=int, default=512, help="prime bit length")
+    parser.add_argument("--timeout", type=float, default=60.0, help="per-request timeout (s)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write the report as JSON to this file")
+    args = parser.parse_args(argv)
+
+    result = asyncio.run(main_async(args))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2)
+    return 1 if result["results"].get("all", {}).get("errors") else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,184 @@
+"""
+Micro-benchmark suite for the core crypto operations.
+
+Times MillerRabinTester.test, PrimeGenerator.generate_prime_pair,
+RSACrypto.encrypt_message / decrypt_message and RSACrypto._mod_inverse for
+each key size. Key sizes are modulus sizes: primes are half as long, as in
+key generation. Inputs come from a seeded RNG, so every run (and every
+machine) benchmarks the same numbers; each benchmark is repeated and
+summarised with min / median / mean / stdev.
+
+Usage (from backend/):
+    python -m benchmarks.suite [--bits 512 1024 ...] [--repeat N] [--output results.json]
+        [--backend auto|python|gmpy2]
+
+Compare two result files with benchmarks.compare.
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Callable, Dict, List
+
+from core.arithmetic import available_backends, configure_arithmetic
+from core.entropy import PseudoRandomSource, set_random_source
+from core.miller_rabin import MillerRabinTester
+from core.prime_generator import PrimeGenerator
+from core.prime_memo import PrimeMemo
+from core.rsa_crypto import RSACrypto
+
+DEFAULT_BITS = [512, 1024, 2048, 4096]
+MILLER_RABIN_ROUNDS = 10
+MESSAGE_BYTES = 256
+# Seeded key material is memoized here, so only the first run pays for 4096-bit keygen
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MEMO_DIR = os.path.join(BACKEND_DIR, ".cache", "primes")
+
+
+def seeded(name: str, bits: int, seed: int) -> random.Random:
+    """Deterministic RNG for one benchmark's inputs"""
+    return random.Random(f"{seed}:{name}:{bits}")
+
+
+def time_runs(func: Callable[[], object], repeat: int, min_time: float) -> dict:
+    """
+    Time func like timeit: pick a loop count so one run takes at least
+    min_time, then time `repeat` runs and return per-call statistics
+    """
+    loops = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(loops):
+            func()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            break
+        loops *= 10 if elapsed < min_time / 10 else 2
+
+    runs: List[float] = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(loops):
+            func()
+        runs.append((time.perf_counter() - start) / loops)
+
+    return {
+        "loops": loops,
+        "repeat": repeat,
+        "min": min(runs),
+        "median": statistics.median(runs),
+        "mean": statistics.mean(runs),
+        "stdev": statistics.stdev(runs) if len(runs) > 1 else 0.0,
+        "runs": runs,
+    }
+
+
+def run_suite(bit_lengths: List[int], repeat: int, min_time: float, seed: int) -> Dict[str, dict]:
+    """Run every benchmark at every key size"""
+    generator = PrimeGenerator()
+    setup_generator = PrimeGenerator(memo=PrimeMemo(MEMO_DIR))
+    crypto = RSACrypto()
+    results: Dict[str, dict] = {}
+
+    def bench(
+        name: str, bits: int, func: Callable[[], object], runs: int = repeat, reseed: bool = False
+    ) -> None:
+        if reseed:
+            # A fresh seeded source before every call makes each call (and each run
+            # of the suite) draw the same candidates and do exactly the same work
+            state = f"{seed}:{name}:{bits}"
+            func = (lambda f: lambda: (set_random_source(PseudoRandomSource(state)), f()))(func)
+        result = time_runs(func, runs, min_time)
+        results[f"{name}[{bits}]"] = {"name": name, "bits": bits, **result}
+        print(
+            f"{name:<36} {bits:>5} bits: median {result['median'] * 1e3:10.3f}ms  "
+            f"stdev {result['stdev'] * 1e3:8.3f}ms  ({result['loops']} loops x {runs})",
+            flush=True,
+        )
+
+    for bits in bit_lengths:
+        keypair = crypto.generate_keypair(
+            setup_generator.generate_prime_pair(bits // 2, 10, seed=f"{seed}:keypair:{bits}")
+        )
+        message = bytes(
+            seeded("message", bits, seed).randrange(32, 127) for _ in range(MESSAGE_BYTES)
+        ).decode("ascii")
+        encrypted = [
+            block.encrypted_value
+            for block in crypto.encrypt_message(message, keypair.n, keypair.e).blocks
+        ]
+
+        bench(
+            "miller_rabin.test",
+            bits,
+            lambda: MillerRabinTester.test(keypair.p, MILLER_RABIN_ROUNDS),
+            reseed=True,
+        )
+        # Key generation dominates the suite's run time, so it gets fewer repeats
+        bench(
+            "prime_generator.generate_prime_pair",
+            bits,
+            lambda: generator.generate_prime_pair(bits // 2, MILLER_RABIN_ROUNDS),
+            runs=max(3, repeat // 2),
+            reseed=True,
+        )
+        bench(
+            "rsa_crypto.encrypt_message",
+            bits,
+            lambda: crypto.encrypt_message(message, keypair.n, keypair.e),
+        )
+        bench(
+            "rsa_crypto.decrypt_message",
+            bits,
+            lambda: crypto.decrypt_message(encrypted, keypair.n, keypair.d),
+        )
+        phi_n = (keypair.p - 1) * (keypair.q - 1)
+        bench("rsa_crypto.mod_inverse", bits, lambda: crypto._mod_inverse(keypair.e, phi_n))
+
+    return results
+
+
+def main(argv: List[str]) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--bits", type=int, nargs="+", default=DEFAULT_BITS)
+    parser.add_argument("--repeat", type=int, default=7)
+    parser.add_argument("--min-time", type=float, default=0.05, help="seconds per timed run")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write results as JSON to this file")
+    parser.add_argument(
+        "--backend", default="auto", choices=["auto"] + available_backends(), help="arithmetic"
+    )
+    args = parser.parse_args(argv)
+
+    backend = configure_arithmetic(args.backend)
+    print(f"arithmetic backend: {backend.name}")
+    results = run_suite(args.bits, args.repeat, args.min_time, args.seed)
+    report = {
+        "metadata": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "machine": platform.machine(),
+            "seed": args.seed,
+            "repeat": args.repeat,
+            "min_time": args.min_time,
+            "arithmetic_backend": backend.name,
+        },
+        "results": results,
+    }
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"wrote {len(results)} results to {args.output}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,128 @@
+"""
+Offline bulk encryption: encrypt or decrypt files and directories without the API.
+
+Inputs are memory-mapped and split into block ranges that run across the
+process pool (core.file_crypt); outputs are framed binary files with a header
+carrying the key fingerprint, block size and block count. Jobs checkpoint as
+they go, so an interrupted run picks up where it left off with --resume.
+The key file is JSON with decimal n, e, d and optionally p, q (the response
+body of /api/keys/generate works as is). A directory is processed file by
+file into the same layout under OUTPUT; encrypting adds ".rsab" to each
+name and decrypting strips it.
+
+Usage (from backend/):
+    python -m cli.bulk_crypt encrypt INPUT OUTPUT --key key.json [--workers 8] [--resume]
+    python -m cli.bulk_crypt decrypt INPUT OUTPUT --key key.json
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from typing import Dict, Optional
+
+from core.arithmetic import configure_arithmetic
+from core.file_crypt import DEFAULT_RANGE_BLOCKS, decrypt_file, encrypt_file, list_files
+from core.rsa_crypto import RSACrypto
+
+SUFFIX = ".rsab"
+
+
+def load_key(path: str) -> Dict[str, Optional[int]]:
+    """Read n, e, d, p, q (decimal strings or ints) from a JSON key file"""
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    if "public_key" in data:
+        # /api/keys/generate response: {"public_key": {n, e}, "private_key": {n, d, p, q}}
+        data = {**data.get("private_key", {}), **data["public_key"]}
+    key = {name: int(data[name]) if data.get(name) is not None else None for name in "nedpq"}
+    if key["n"] is None:
+        raise ValueError(f"{path} has no modulus n")
+    return key
+
+
+def _progress_printer(label: str, block_size: int):
+    """Progress callback printing blocks done, throughput and ETA to stderr"""
+    start_time = time.time()
+
+    def report(done: int, total: int) -> None:
+        elapsed = max(time.time() - start_time, 1e-9)
+        rate = done * block_size / elapsed / 1e6
+        eta = (total - done) * elapsed / done if done else 0.0
+        print(
+            f"\r{label}: {done}/{total} blocks, {rate:.1f} MB/s, ETA {eta:.0f}s",
+            end="" if done < total else "\n",
+            file=sys.stderr,
+            flush=True,
+        )
+
+    return report
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("mode", choices=("encrypt", "decrypt"))
+    parser.add_argument("input", help="File or directory to process")
+    parser.add_argument("output", help="Output file, or directory for a directory input")
+    parser.add_argument("--key", required=True, help="JSON key file")
+    parser.add_argument("--workers", type=int, help="Process pool size (default: CPU count)")
+    parser.add_argument(
+        "--range-blocks", type=int, default=DEFAULT_RANGE_BLOCKS, help="Blocks per work unit"
+    )
+    parser.add_argument("--resume", action="store_true", help="Continue interrupted jobs")
+    parser.add_argument("--backend", default="auto", help="Arithmetic backend")
+    parser.add_argument("--quiet", action="store_true", help="No progress output")
+    args = parser.parse_args(argv)
+
+    configure_arithmetic(args.backend)
+    key = load_key(args.key)
+    if args.mode == "encrypt" and key["e"] is None:
+        parser.error("encrypting needs the public exponent e")
+    if args.mode == "decrypt" and key["d"] is None:
+        parser.error("decrypting needs the private exponent d")
+    if args.range_blocks < 1:
+        parser.error("--range-blocks must be positive")
+
+    is_directory = os.path.isdir(args.input)
+    start_time = time.time()
+    total_in = total_out = 0
+    files = list_files(args.input)
+    for i, relative in enumerate(files, 1):
+        source = os.path.join(args.input, relative) if is_directory else args.input
+        target = args.output
+        if is_directory:
+            target = os.path.join(args.output, relative)
+            if args.mode == "encrypt":
+                target += SUFFIX
+            elif target.endswith(SUFFIX):
+                target = target[: -len(SUFFIX)]
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+
+        label = f"[{i}/{len(files)}] {relative or os.path.basename(source)}"
+        options = dict(workers=args.workers, range_blocks=args.range_blocks, resume=args.resume)
+        if not args.quiet:
+            options["progress"] = _progress_printer(label, RSACrypto.block_size(key["n"]))
+        try:
+            if args.mode == "encrypt":
+                result = encrypt_file(source, target, key["n"], key["e"], **options)
+            else:
+                result = decrypt_file(
+                    source, target, key["n"], key["d"], key["p"], key["q"], **options
+                )
+        except ValueError as e:
+            print(f"{label}: {e}", file=sys.stderr)
+            return 1
+        total_in += result.bytes_in
+        total_out += result.bytes_out
+
+    elapsed = time.time() - start_time
+    print(
+        f"{args.mode}ed {len(files)} file(s): {total_in} -> {total_out} bytes "
+        f"in {elapsed:.1f}s ({total_in / max(elapsed, 1e-9) / 1e6:.1f} MB/s)"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
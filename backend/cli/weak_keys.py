@@ -0,0 +1,90 @@
+"""
+Batch weak-key audit: try to factor every modulus in a key dump.
+
+Each modulus goes through core.factorization.analyze_modulus (trial division,
+Fermat, Pollard rho and Pollard p - 1 in parallel processes under a shared
+time budget). Input is either a JSON object mapping key IDs to moduli (the
+"moduli" body of /api/audit/shared-factors) or text with one "key_id n" or
+bare "n" per line. Exits with status 1 if any key was factored, so it can
+gate a key rotation job.
+
+Usage (from backend/):
+    python -m cli.weak_keys keys.json [--budget 2.0] [--methods fermat,pollard_rho]
+        [--output report.json]
+"""
+
+import argparse
+import json
+import sys
+import time
+from typing import Dict, TextIO
+
+from core.arithmetic import configure_arithmetic
+from core.factorization import METHODS, analyze_modulus
+
+
+def load_moduli(source: TextIO) -> Dict[str, int]:
+    """Parse a JSON key -> modulus object or "key_id n" / "n" lines"""
+    text = source.read()
+    if text.lstrip().startswith("{"):
+        return {key_id: int(n) for key_id, n in json.loads(text).items()}
+
+    moduli = {}
+    for line_number, line in enumerate(text.splitlines(), 1):
+        fields = line.split()
+        if not fields or fields[0].startswith("#"):
+            continue
+        key_id = fields[0] if len(fields) > 1 else f"line-{line_number}"
+        moduli[key_id] = int(fields[-1])
+    return moduli
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("input", help="Key dump to audit ('-' for stdin)")
+    parser.add_argument("--budget", type=float, default=2.0, help="Seconds per modulus")
+    parser.add_argument("--methods", default=",".join(METHODS), help="Comma-separated methods")
+    parser.add_argument("--backend", default="auto", help="Arithmetic backend")
+    parser.add_argument("--output", help="Write a JSON report here")
+    args = parser.parse_args(argv)
+
+    configure_arithmetic(args.backend)
+    if args.input == "-":
+        moduli = load_moduli(sys.stdin)
+    else:
+        with open(args.input, encoding="utf-8") as f:
+            moduli = load_moduli(f)
+    methods = [name.strip() for name in args.methods.split(",") if name.strip()]
+    unknown = [name for name in methods if name not in METHODS]
+    if unknown:
+        parser.error(f"unknown methods {', '.join(unknown)}; choose from {', '.join(METHODS)}")
+
+    start_time = time.time()
+    report = {}
+    for i, (key_id, n) in enumerate(moduli.items(), 1):
+        result = analyze_modulus(n, args.budget, methods)
+        report[key_id] = {
+            "modulus_bits": n.bit_length(),
+            "factored": result.factored,
+            "factors": [str(f) for f in result.factors] if result.factored else None,
+            "method": result.method,
+            "elapsed": result.elapsed,
+            "outcomes": result.outcomes,
+        }
+        status = f"FACTORED by {result.method}" if result.factored else "not factored"
+        print(
+            f"[{i}/{len(moduli)}] {key_id} ({n.bit_length()} bits): "
+            f"{status} in {result.elapsed:.2f}s",
+            flush=True,
+        )
+
+    weak = [key_id for key_id, entry in report.items() if entry["factored"]]
+    print(f"{len(weak)} of {len(moduli)} keys factored in {time.time() - start_time:.1f}s")
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"budget": args.budget, "methods": methods, "keys": report}, f, indent=2)
+    return 1 if weak else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
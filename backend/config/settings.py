@@ -23,7 +23,13 @@ class Settings(BaseSettings):
     # Security Limits
     #######################
     max_prime_bit_length: int = 2048
+    max_safe_prime_bit_length: int = 1024  # safe primes are far slower (2048 bits: ~1 min)
     max_miller_rabin_rounds: int = 100
+    max_batch_verify_items: int = 10000
+    max_stored_keys: int = 1000
+    max_audit_moduli: int = 100000
+    max_factor_time_budget: float = 30.0  # seconds per weak-key factorization analysis
+    max_concurrent_factor_analyses: int = 2  # weak-key analyses at once; more get a 503
     min_prime_bit_length: int = 256
     min_miller_rabin_rounds: int = 1
 
@@ -31,9 +37,26 @@ class Settings(BaseSettings):
     #######################
     prime_generation_timeout: int = 300  # seconds
     max_concurrent_operations: int = 10
+    parallel_block_threshold: int = 64  # blocks; 0 disables, see benchmarks/calibrate_parallel.py
+    parallel_workers: int = 0  # 0 = one process per CPU
+    block_cache_keys: int = 32  # stored (n, exponent) keys with cached blocks; 0 disables
+    block_cache_blocks_per_key: int = 1024
+    parsed_key_cache_size: int = 256  # imported keys kept parsed; 0 disables the cache
+    prime_memo_dir: str = ""  # directory memoizing seeded prime pairs; "" disables
+    entropy_pool_bytes: int = 65536  # os.urandom read size per thread buffer refill
+    arithmetic_backend: str = "auto"  # "auto" (gmpy2 when installed), "python" or "gmpy2"
+    system_sample_interval: float = 1.0  # seconds between health-check system samples
+    factor_time_budget: float = 2.0  # default seconds for weak-key factorization analysis
+    session_max_in_flight: int = 64  # operations pipelined per WebSocket session
+    session_executor_queue_limit: int = 32  # sessions stop reading frames above this queue depth
 
     # Development
     debug: bool = True
+    profile_token: str = ""  # X-Profile header value that enables profiling outside debug
+    key_export_token: str = ""  # X-Export-Token value that allows private key export outside debug
+    profile_buffer_size: int = 20
+    trace_exporter: str = ""  # "" (off), "json" or "memory"
+    trace_file: str = "traces.jsonl"
 
     # else read config from .env file
     model_config = ConfigDict(env_file=".env", extra="ignore")
@@ -0,0 +1,132 @@
+from functools import lru_cache
+from importlib.util import find_spec
+from math import gcd
+from typing import Dict, List, Optional, Type
+
+from .entropy import get_random_source
+
+
+class PythonBackend:
+    """
+    Big-integer arithmetic on CPython ints (always available)
+
+    Random numbers come from the core.entropy source for every backend, so a
+    seeded source reproduces the same candidates whichever backend does the
+    arithmetic.
+    """
+
+    name = "python"
+
+    def powmod(self, base: int, exponent: int, modulus: int) -> int:
+        return pow(base, exponent, modulus)
+
+    def invert(self, a: int, modulus: int) -> int:
+        """Inverse of a mod modulus; ValueError if it does not exist"""
+        try:
+            return pow(a, -1, modulus)
+        except ValueError:
+            raise ValueError("Modular inverse does not exist") from None
+
+    def gcd(self, a: int, b: int) -> int:
+        return gcd(a, b)
+
+    def is_probable_prime(self, n: int, rounds: int = 10) -> bool:
+        # Imported here: miller_rabin itself does its exponentiation through the backend
+        from .miller_rabin import MillerRabinTester
+
+        return MillerRabinTester.test(n, rounds)
+
+    def random_bits(self, bits: int) -> int:
+        return get_random_source().random_bits(bits)
+
+
+class GmpyBackend(PythonBackend):
+    """
+    GMP arithmetic through gmpy2; results are converted back to int
+
+    gmpy2 (an optional dependency) is only imported once this backend is
+    selected, so the pure-Python backend never loads it.
+    """
+
+    name = "gmpy2"
+
+    def __init__(self):
+        import gmpy2
+
+        self._gmpy2 = gmpy2
+
+    def powmod(self, base: int, exponent: int, modulus: int) -> int:
+        return int(self._gmpy2.powmod(base, exponent, modulus))
+
+    def invert(self, a: int, modulus: int) -> int:
+        try:
+            return int(self._gmpy2.invert(a, modulus))
+        except ZeroDivisionError:
+            raise ValueError("Modular inverse does not exist") from None
+
+    def gcd(self, a: int, b: int) -> int:
+        return int(self._gmpy2.gcd(a, b))
+
+    def is_probable_prime(self, n: int, rounds: int = 10) -> bool:
+        """
+        Miller-Rabin with the witnesses MillerRabinTester would draw
+
+        Witnesses come from the core.entropy source in the same order and
+        number as the pure-Python test (gmpy2.is_prime draws none), so seeded
+        generation consumes the stream identically on both backends.
+        """
+        if n < 4:
+            return n in (2, 3)
+        if n % 2 == 0:
+            return False
+        source = get_random_source()
+        gmpy2 = self._gmpy2
+        n_mpz = gmpy2.mpz(n)
+        for _ in range(rounds):
+            a = source.randrange(2, n - 1)
+            # A witness sharing a factor with n fails the Python round too
+            if gmpy2.gcd(n_mpz, a) != 1 or not gmpy2.is_strong_prp(n_mpz, a):
+                return False
+        return True
+
+
+BACKENDS: Dict[str, Type[PythonBackend]] = {"python": PythonBackend, "gmpy2": GmpyBackend}
+
+
+@lru_cache(maxsize=1)
+def gmpy2_installed() -> bool:
+    """Whether gmpy2 can be imported (checked without importing it)"""
+    return find_spec("gmpy2") is not None
+
+
+def available_backends() -> List[str]:
+    """Names of the backends that can be used in this environment"""
+    return ["python"] + (["gmpy2"] if gmpy2_installed() else [])
+
+
+# Backend used by the crypto core
+###########################
+_backend: PythonBackend = PythonBackend()
+
+
+def get_backend() -> PythonBackend:
+    return _backend
+
+
+def set_backend(name: str) -> PythonBackend:
+    """Switch the backend used by the crypto core"""
+    global _backend
+
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown arithmetic backend {name!r}")
+    if name not in available_backends():
+        raise ValueError(f"Arithmetic backend {name!r} is not installed")
+    _backend = BACKENDS[name]()
+    return _backend
+
+
+def configure_arithmetic(name: Optional[str]) -> PythonBackend:
+    """Select the backend from settings ("auto" prefers gmpy2 when installed)"""
+    if not name or name == "auto":
+        name = "gmpy2" if gmpy2_installed() else "python"
+    return set_backend(name)
@@ -0,0 +1,106 @@
+import time
+from math import gcd
+from typing import Dict, List, Optional, Sequence
+
+from models.crypto_models import SharedFactorAudit, SharedFactorGroup
+
+
+def product_tree(values: Sequence[int], max_bits: Optional[int] = None) -> List[List[int]]:
+    """
+    Build a product tree bottom-up
+
+    Level 0 holds the values themselves; each following level holds products of
+    adjacent pairs, ending with a single-element level containing the product
+    of everything. With max_bits, building stops before nodes grow past that
+    size, leaving a forest whose top level has several nodes.
+    """
+    if not values:
+        raise ValueError("Cannot build a product tree of no values")
+
+    tree = [list(values)]
+    while len(tree[-1]) > 1:
+        level = tree[-1]
+        if max_bits is not None and level[0].bit_length() * 2 > max_bits:
+            break
+        tree.append([level[i] * level[i + 1] for i in range(0, len(level) - 1, 2)])
+        if len(level) % 2:
+            tree[-1].append(level[-1])
+    return tree
+
+
+def remainder_tree(value: int, tree: List[List[int]], square: bool = False) -> List[int]:
+    """
+    Reduce value modulo every leaf of a product tree (or its square)
+
+    Walks the tree top-down, so each reduction works on numbers about the size
+    of the node rather than the size of value.
+    """
+
+    def modulus(node: int) -> int:
+        return node * node if square else node
+
+    remainders = [value % modulus(node) for node in tree[-1]]
+    for level in reversed(tree[:-1]):
+        remainders = [remainders[i // 2] % modulus(node) for i, node in enumerate(level)]
+    return remainders
+
+
+def batch_gcd(moduli: Sequence[int]) -> List[int]:
+    """
+    Bernstein's batch GCD
+
+    Returns gcd(n_i, product of all other moduli) for every modulus in
+    quasi-linear time instead of comparing all pairs.
+    """
+    tree = product_tree(moduli)
+    remainders = remainder_tree(tree[-1][0], tree, square=True)
+    return [gcd(remainder // n, n) for remainder, n in zip(remainders, moduli)]
+
+
+def audit_shared_factors(moduli: Dict[str, int]) -> SharedFactorAudit:
+    """
+    Find keys whose moduli share a prime factor
+
+    Args:
+        moduli: Mapping of key ID to RSA modulus
+
+    Returns:
+        Audit result grouping colliding key IDs
+    """
+    start_time = time.time()
+    key_ids = list(moduli)
+    values = [moduli[key_id] for key_id in key_ids]
+
+    groups: List[SharedFactorGroup] = []
+    if len(values) > 1:
+        flagged = [i for i, g in enumerate(batch_gcd(values)) if g > 1]
+
+        # Only the (normally tiny) flagged set is compared pairwise to group the collisions
+        parent = {i: i for i in flagged}
+
+        def find(i: int) -> int:
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+
+        for a_pos, a in enumerate(flagged):
+            for b in flagged[a_pos + 1 :]:
+                if gcd(values[a], values[b]) > 1:
+                    parent[find(b)] = find(a)
+
+        members: Dict[int, List[int]] = {}
+        for i in flagged:
+            members.setdefault(find(i), []).append(i)
+
+        for indices in members.values():
+            groups.append(
+                SharedFactorGroup(
+                    key_ids=[key_ids[i] for i in indices],
+                    duplicate_modulus=len({values[i] for i in indices}) < len(indices),
+                )
+            )
+
+    return SharedFactorAudit(
+        moduli_checked=len(values), groups=groups, audit_time=time.time() - start_time
+    )
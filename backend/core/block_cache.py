@@ -0,0 +1,102 @@
+import threading
+from collections import OrderedDict
+from typing import List, Optional, Sequence, Set, Tuple
+
+from .metrics import Counter
+
+BLOCK_CACHE_LOOKUPS = Counter(
+    "rsa_block_cache_lookups",
+    "Block exponentiations answered from (hit) or missing in (miss) the block cache",
+    labelnames=("result",),
+)
+_HITS = BLOCK_CACHE_LOOKUPS.labels(result="hit")
+_MISSES = BLOCK_CACHE_LOOKUPS.labels(result="miss")
+
+# (modulus, exponent) identifying one direction of one key
+CacheKey = Tuple[int, int]
+
+
+class BlockResultCache:
+    """
+    Bounded LRU of modular exponentiation results, per key
+
+    Textbook RSA is deterministic, so a block seen before under the same
+    (n, exponent) maps to the same result. Only keys admitted with admit()
+    (the server's stored keypairs) are cached; results under any other
+    modulus or exponent, such as a caller-supplied private exponent, are
+    never kept. Both the number of keys and the blocks kept per key are
+    bounded; evict(n) drops everything cached for a modulus, and its
+    admission, e.g. when the key leaves the key store.
+    """
+
+    def __init__(self, max_keys: int = 32, max_blocks_per_key: int = 1024):
+        self.max_keys = max_keys
+        self.max_blocks_per_key = max_blocks_per_key
+        self._keys: "OrderedDict[CacheKey, OrderedDict[int, int]]" = OrderedDict()
+        self._admitted: Set[CacheKey] = set()
+        self._lock = threading.Lock()
+
+    def admit(self, n: int, *exponents: int) -> None:
+        """Allow results under (n, exponent) for each exponent to be cached"""
+        with self._lock:
+            self._admitted.update((n, exponent) for exponent in exponents)
+
+    def admits(self, key: CacheKey) -> bool:
+        return key in self._admitted
+
+    def lookup(self, key: CacheKey, values: Sequence[int]) -> List[Optional[int]]:
+        """Cached result for each value, None where it is not cached"""
+        with self._lock:
+            blocks = self._keys.get(key)
+            if blocks is None:
+                results: List[Optional[int]] = [None] * len(values)
+            else:
+                self._keys.move_to_end(key)
+                results = []
+                for value in values:
+                    result = blocks.get(value)
+                    if result is not None:
+                        blocks.move_to_end(value)
+                    results.append(result)
+
+        hits = sum(result is not None for result in results)
+        if hits:
+            _HITS.inc(hits)
+        if hits < len(values):
+            _MISSES.inc(len(values) - hits)
+        return results
+
+    def store(self, key: CacheKey, values: Sequence[int], results: Sequence[int]) -> None:
+        """Remember results under an admitted key, evicting least recently used entries"""
+        with self._lock:
+            if key not in self._admitted:
+                return
+            blocks = self._keys.get(key)
+            if blocks is None:
+                blocks = self._keys[key] = OrderedDict()
+                while len(self._keys) > self.max_keys:
+                    self._keys.popitem(last=False)
+            self._keys.move_to_end(key)
+
+            for value, result in zip(values, results):
+                blocks[value] = result
+                blocks.move_to_end(value)
+            while len(blocks) > self.max_blocks_per_key:
+                blocks.popitem(last=False)
+
+    def evict(self, n: int) -> None:
+        """Drop every cached result for modulus n and stop admitting it"""
+        with self._lock:
+            for key in [key for key in self._keys if key[0] == n]:
+                del self._keys[key]
+            self._admitted = {key for key in self._admitted if key[0] != n}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._keys.clear()
+            self._admitted.clear()
+
+    def __len__(self) -> int:
+        """Number of cached block results across all keys"""
+        with self._lock:
+            return sum(len(blocks) for blocks in self._keys.values())
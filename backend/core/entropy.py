@@ -0,0 +1,171 @@
+import hashlib
+import hmac
+import os
+import random
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional, Union
+
+
+class RandomSource:
+    """Source of random integers for candidate generation and primality witnesses"""
+
+    def random_bits(self, bits: int) -> int:
+        """Uniform integer in [0, 2**bits)"""
+        raise NotImplementedError
+
+    def randbelow(self, n: int) -> int:
+        """Uniform integer in [0, n), by rejection sampling"""
+        if n <= 0:
+            raise ValueError("Upper bound must be positive")
+        bits = n.bit_length()
+        while True:
+            value = self.random_bits(bits)
+            if value < n:
+                return value
+
+    def randrange(self, start: int, stop: int) -> int:
+        """Uniform integer in [start, stop)"""
+        return start + self.randbelow(stop - start)
+
+
+# Bumped in forked children so buffers filled by the parent are never reused
+###########################
+_fork_generation = 0
+
+
+def _after_fork_in_child() -> None:
+    global _fork_generation
+    _fork_generation += 1
+
+
+os.register_at_fork(after_in_child=_after_fork_in_child)
+
+
+class _ThreadBuffer(threading.local):
+    """Per-thread buffer state (class attributes are each thread's initial values)"""
+
+    buffer = b""
+    offset = 0
+    generation = -1
+
+
+class EntropyPool(RandomSource):
+    """
+    Cryptographically secure source serving bits from buffered os.urandom reads
+
+    One large read refills a per-thread buffer, so threads never contend and
+    most draws are a slice of bytes already in memory. Buffers are tagged
+    with the fork generation and discarded in a forked child, so a process
+    pool worker can never replay bytes its parent will also hand out.
+    """
+
+    def __init__(self, buffer_size: int = 64 * 1024):
+        self.buffer_size = buffer_size
+        self._local = _ThreadBuffer()
+
+    def read(self, size: int) -> bytes:
+        """Next size bytes from this thread's buffer"""
+        if size > self.buffer_size:
+            return os.urandom(size)
+
+        local = self._local
+        offset = local.offset
+        if offset + size > len(local.buffer) or local.generation != _fork_generation:
+            local.buffer = os.urandom(self.buffer_size)
+            local.generation = _fork_generation
+            offset = 0
+
+        local.offset = offset + size
+        return local.buffer[offset : offset + size]
+
+    def random_bits(self, bits: int) -> int:
+        if bits <= 0:
+            return 0
+        size = (bits + 7) // 8
+        return int.from_bytes(self.read(size), "big") >> (size * 8 - bits)
+
+
+class PseudoRandomSource(RandomSource):
+    """
+    Deterministic source wrapping random.Random
+
+    For reproducible benchmarks and tests only; never use it for real keys.
+    """
+
+    def __init__(self, seed: Optional[object] = None):
+        self._random = random.Random(seed)
+
+    def random_bits(self, bits: int) -> int:
+        return self._random.getrandbits(bits) if bits > 0 else 0
+
+
+class HmacDrbg(RandomSource):
+    """
+    Deterministic HMAC-DRBG (NIST SP 800-90A, HMAC-SHA256, no reseeding)
+
+    The same seed always yields the same stream, which makes seeded prime and
+    key generation reproducible. Keys derived from a known seed are known to
+    anyone with the seed: for tests, benchmarks and demos only.
+    """
+
+    def __init__(self, seed: Union[str, bytes]):
+        if isinstance(seed, str):
+            seed = seed.encode("utf-8")
+        self._key = b"\x00" * 32
+        self._value = b"\x01" * 32
+        self._update(seed)
+
+    def _hmac(self, data: bytes) -> bytes:
+        return hmac.new(self._key, data, hashlib.sha256).digest()
+
+    def _update(self, provided: bytes = b"") -> None:
+        self._key = self._hmac(self._value + b"\x00" + provided)
+        self._value = self._hmac(self._value)
+        if provided:
+            self._key = self._hmac(self._value + b"\x01" + provided)
+            self._value = self._hmac(self._value)
+
+    def read(self, size: int) -> bytes:
+        """Next size bytes of the stream (one DRBG generate call)"""
+        output = bytearray()
+        while len(output) < size:
+            self._value = self._hmac(self._value)
+            output += self._value
+        self._update()
+        return bytes(output[:size])
+
+    def random_bits(self, bits: int) -> int:
+        if bits <= 0:
+            return 0
+        size = (bits + 7) // 8
+        return int.from_bytes(self.read(size), "big") >> (size * 8 - bits)
+
+
+# Source used by the crypto core (process-wide, overridable per context)
+###########################
+_source: RandomSource = EntropyPool()
+_context_source: ContextVar[Optional[RandomSource]] = ContextVar("random_source", default=None)
+
+
+def get_random_source() -> RandomSource:
+    return _context_source.get() or _source
+
+
+@contextmanager
+def use_random_source(source: RandomSource) -> Iterator[RandomSource]:
+    """Use source for core randomness in the current context (thread / task) only"""
+    token = _context_source.set(source)
+    try:
+        yield source
+    finally:
+        _context_source.reset(token)
+
+
+def set_random_source(source: RandomSource) -> RandomSource:
+    """Replace the source used by the crypto core, returning the previous one"""
+    global _source
+
+    previous, _source = _source, source
+    return previous
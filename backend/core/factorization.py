@@ -0,0 +1,281 @@
+import queue
+import threading
+import time
+from functools import lru_cache
+from math import gcd, isqrt, prod
+from typing import Callable, Dict, List, Optional, Sequence
+
+from models.crypto_models import FactorizationResult
+
+from .arithmetic import get_backend, set_backend
+from .metrics import Counter
+from .prime_generator import _odd_primes_below
+
+WEAK_KEY_ANALYSES = Counter(
+    "rsa_weak_key_analyses",
+    "Moduli analyzed for weak factors, by winning method (none if not factored)",
+    labelnames=("method",),
+)
+
+# Trial division and the p - 1 stage-1 bound share one small-prime table
+###########################
+SMALL_FACTOR_BOUND = 1 << 20
+
+# How often (in loop iterations or prime batches) methods check for cancellation
+CHECK_INTERVAL = 1024
+
+# Seconds method processes may take to start before the analysis gives up waiting on them
+START_TIMEOUT = 30.0
+
+
+@lru_cache(maxsize=1)
+def _small_primes() -> List[int]:
+    return [2] + _odd_primes_below(SMALL_FACTOR_BOUND)
+
+
+@lru_cache(maxsize=1)
+def _prime_powers() -> List[int]:
+    """Largest power of each small prime not above SMALL_FACTOR_BOUND"""
+    powers = []
+    for p in _small_primes():
+        power = p
+        while power * p <= SMALL_FACTOR_BOUND:
+            power *= p
+        powers.append(power)
+    return powers
+
+
+def _expired(deadline: float, stop) -> bool:
+    return time.monotonic() >= deadline or stop.is_set()
+
+
+# Factoring methods: each returns a nontrivial factor of n, or None when it gives up
+###########################
+def trial_division(n: int, deadline: float, stop) -> Optional[int]:
+    """Prime factors below SMALL_FACTOR_BOUND, a batch of primes per gcd"""
+    primes = _small_primes()
+    for i in range(0, len(primes), CHECK_INTERVAL):
+        chunk = primes[i : i + CHECK_INTERVAL]
+        if gcd(n, prod(chunk)) != 1:
+            for p in chunk:
+                if n % p == 0 and p < n:
+                    return p
+        if _expired(deadline, stop):
+            return None
+    return None
+
+
+def fermat(n: int, deadline: float, stop) -> Optional[int]:
+    """Fermat's method: fast when p and q are close (n = a^2 - b^2 with a near sqrt(n))"""
+    if n % 2 == 0:
+        return 2 if n > 2 else None
+    a = isqrt(n)
+    if a * a < n:
+        a += 1
+    b2 = a * a - n
+
+    iterations = 0
+    while True:
+        b = isqrt(b2)
+        if b * b == b2:
+            p = a - b
+            return p if 1 < p < n else None
+        b2 += 2 * a + 1
+        a += 1
+
+        iterations += 1
+        if iterations % CHECK_INTERVAL == 0 and _expired(deadline, stop):
+            return None
+
+
+def pollard_rho(n: int, deadline: float, stop) -> Optional[int]:
+    """Pollard's rho with Brent's cycle detection and batched gcds"""
+    if n % 2 == 0:
+        return 2 if n > 2 else None
+
+    for c in range(1, 1 << 16):
+        y, r, q, g = 2, 1, 1, 1
+        x = ys = y
+        while g == 1:
+            x = y
+            for _ in range(r):
+                y = (y * y + c) % n
+            k = 0
+            while k < r and g == 1:
+                ys = y
+                for _ in range(min(CHECK_INTERVAL, r - k)):
+                    y = (y * y + c) % n
+                    q = q * abs(x - y) % n
+                g = gcd(q, n)
+                k += CHECK_INTERVAL
+                if _expired(deadline, stop):
+                    return None
+            r *= 2
+
+        if g == n:
+            # The batch overshot: step through it one gcd at a time
+            g = 1
+            while g == 1:
+                ys = (ys * ys + c) % n
+                g = gcd(abs(x - ys), n)
+        if g != n:
+            return g
+    return None
+
+
+def pollard_p_minus_1(n: int, deadline: float, stop) -> Optional[int]:
+    """Pollard's p - 1 (stage 1, bound SMALL_FACTOR_BOUND): finds p with smooth p - 1"""
+    backend = get_backend()
+    prime_powers = _prime_powers()
+    a = 2
+    for i in range(0, len(prime_powers), CHECK_INTERVAL):
+        powers = prime_powers[i : i + CHECK_INTERVAL]
+        previous, a = a, backend.powmod(a, prod(powers), n)
+        g = gcd(a - 1, n)
+        if g == n:
+            # Every factor became smooth in this chunk: redo it one prime at a time
+            a = previous
+            for power in powers:
+                a = backend.powmod(a, power, n)
+                g = gcd(a - 1, n)
+                if g != 1:
+                    break
+        if 1 < g < n:
+            return g
+        if g == n or _expired(deadline, stop):
+            return None
+    return None
+
+
+METHODS: Dict[str, Callable[[int, float, object], Optional[int]]] = {
+    "trial_division": trial_division,
+    "fermat": fermat,
+    "pollard_rho": pollard_rho,
+    "pollard_p_minus_1": pollard_p_minus_1,
+}
+
+
+def _run_method(name: str, n: int, time_budget: float, ready, stop, results, backend: str) -> None:
+    """Run one method and report (name, outcome, factor) (runs in its own worker process)"""
+    set_backend(backend)
+    try:
+        # The shared budget starts once every process is up and has its tables
+        _prime_powers()
+        ready.wait(timeout=START_TIMEOUT)
+        deadline = time.monotonic() + time_budget
+        factor = METHODS[name](n, deadline, stop)
+    except Exception:
+        results.put((name, "error", None))
+        return
+
+    if factor is not None:
+        results.put((name, "found", factor))
+    else:
+        results.put((name, "timeout" if _expired(deadline, stop) else "exhausted", None))
+
+
+def _process_context():
+    """
+    Start method for method processes: never a plain fork of this process
+
+    analyze_modulus runs on executor threads of a multi-threaded server;
+    forking there could copy a lock some other thread holds (metrics, pool,
+    entropy) into a child that then deadlocks on it. A forkserver forks
+    from a clean single-threaded server (with this module preloaded);
+    where there is none, spawn. multiprocessing is only imported here, when
+    the first analysis runs.
+    """
+    import multiprocessing
+
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context("forkserver")
+        context.set_forkserver_preload([__name__])
+        return context
+    return multiprocessing.get_context("spawn")
+
+
+def analyze_modulus(
+    n: int, time_budget: float = 2.0, methods: Optional[Sequence[str]] = None
+) -> FactorizationResult:
+    """
+    Try to factor n with every method at once, within a shared time budget
+
+    Each method runs in its own process; the budget starts once all of them
+    are up. The first to find a factor wins and the others are stopped;
+    methods that are still running when the budget runs out are stopped
+    too. Stragglers are terminated if they do not notice the stop signal
+    promptly.
+
+    Args:
+        n: Modulus to analyze
+        time_budget: Wall-clock seconds shared by all methods
+        methods: Subset of METHODS to run (default: all)
+
+    Returns:
+        Result with the factors (if any) and each method's outcome: "found",
+        "exhausted" (gave up without a factor), "timeout", "cancelled"
+        (another method won first) or "error"
+    """
+    if n < 4:
+        raise ValueError("Modulus must be at least 4")
+    methods = list(methods or METHODS)
+    unknown = [name for name in methods if name not in METHODS]
+    if unknown:
+        raise ValueError(f"Unknown factoring methods: {', '.join(unknown)}")
+
+    start_time = time.monotonic()
+    context = _process_context()
+    ready = context.Barrier(len(methods) + 1)
+    stop = context.Event()
+    results = context.Queue()
+    processes = [
+        context.Process(
+            target=_run_method,
+            args=(name, n, time_budget, ready, stop, results, get_backend().name),
+            daemon=True,
+        )
+        for name in methods
+    ]
+    for process in processes:
+        process.start()
+    try:
+        ready.wait(timeout=START_TIMEOUT)
+    except threading.BrokenBarrierError:
+        pass  # A method failed to start; it reports an error or times out below
+    deadline = time.monotonic() + time_budget
+
+    outcomes = {name: "timeout" for name in methods}
+    factor: Optional[int] = None
+    winner: Optional[str] = None
+    pending = set(methods)
+    while pending and winner is None:
+        try:
+            name, outcome, found = results.get(timeout=max(0.0, deadline - time.monotonic()) + 0.05)
+        except queue.Empty:
+            break
+        pending.discard(name)
+        outcomes[name] = outcome
+        if found is not None:
+            factor, winner = found, name
+    elapsed = time.monotonic() - start_time
+
+    stop.set()
+    for process in processes:
+        process.join(timeout=0.2)
+        if process.is_alive():
+            process.terminate()
+            process.join()
+    results.close()
+
+    if winner is not None:
+        for name in pending:
+            outcomes[name] = "cancelled"
+    WEAK_KEY_ANALYSES.labels(method=winner or "none").inc()
+
+    return FactorizationResult(
+        n=n,
+        factors=tuple(sorted((factor, n // factor))) if factor else None,
+        method=winner,
+        elapsed=elapsed,
+        outcomes=outcomes,
+    )
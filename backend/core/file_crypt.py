@@ -0,0 +1,364 @@
+import json
+import mmap
+import os
+import struct
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, wait
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+from models.crypto_models import modulus_fingerprint
+
+from .arithmetic import get_backend
+from .parallel import get_process_pool, pool_size
+from .rsa_crypto import RSACrypto
+
+# Encrypted file layout: header, then block_count fixed-width big-endian ciphertext frames
+###########################
+MAGIC = b"RSAB"
+FORMAT_VERSION = 1
+HEADER = struct.Struct(">4sB8sIIQQ")
+
+DEFAULT_RANGE_BLOCKS = 1024
+
+# Checkpoints record ranges done below a high-water mark plus the few finished above it
+CHECKPOINT_VERSION = 2
+CHECKPOINT_SECONDS = 1.0
+CHECKPOINT_RANGES = 64  # ranges finished since the last checkpoint that force a new one
+
+# (done blocks, total blocks) after every finished range
+ProgressCallback = Callable[[int, int], None]
+
+
+@dataclass
+class FileHeader:
+    """Header of an encrypted file"""
+
+    fingerprint: str  # Key ID of the modulus (16 hex digits)
+    block_size: int  # Plaintext bytes per block
+    cipher_size: int  # Bytes per ciphertext frame
+    block_count: int
+    plaintext_length: int
+
+    def pack(self) -> bytes:
+        return HEADER.pack(
+            MAGIC,
+            FORMAT_VERSION,
+            bytes.fromhex(self.fingerprint),
+            self.block_size,
+            self.cipher_size,
+            self.block_count,
+            self.plaintext_length,
+        )
+
+    @classmethod
+    def unpack(cls, data: bytes) -> "FileHeader":
+        if len(data) < HEADER.size:
+            raise ValueError("File too short for an encrypted file header")
+        magic, version, fingerprint, *fields = HEADER.unpack_from(data)
+        if magic != MAGIC:
+            raise ValueError("Not an encrypted file (bad magic)")
+        if version != FORMAT_VERSION:
+            raise ValueError(f"Unsupported format version {version}")
+        return cls(fingerprint.hex(), *fields)
+
+    @classmethod
+    def read(cls, path: str) -> "FileHeader":
+        with open(path, "rb") as f:
+            return cls.unpack(f.read(HEADER.size))
+
+
+@dataclass
+class FileJobResult:
+    """Represents the result of a bulk file encryption or decryption"""
+
+    blocks: int
+    bytes_in: int
+    bytes_out: int
+    elapsed: float
+    resumed_blocks: int = 0  # Blocks already done by an interrupted run
+
+
+# Range workers (run in pool processes; each maps its own view of the input)
+###########################
+def _encrypt_range(
+    input_path: str, output_path: str, first: int, count: int, header: FileHeader, n: int, e: int
+) -> int:
+    powmod = get_backend().powmod
+    block_size, cipher_size = header.block_size, header.cipher_size
+    out = bytearray()
+    with open(input_path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        offset = first * block_size
+        for _ in range(count):
+            value = int.from_bytes(data[offset : offset + block_size], "big")
+            out += powmod(value, e, n).to_bytes(cipher_size, "big")
+            offset += block_size
+    _write_at(output_path, HEADER.size + first * cipher_size, out)
+    return count
+
+
+def _decrypt_range(
+    input_path: str,
+    output_path: str,
+    first: int,
+    count: int,
+    header: FileHeader,
+    n: int,
+    d: int,
+    factors: Optional[Tuple[int, int]],
+) -> int:
+    powmod = get_backend().powmod
+    params = RSACrypto._crt_params(*factors, d) if factors else None
+    block_size, cipher_size = header.block_size, header.cipher_size
+    out = bytearray()
+    with open(input_path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        offset = HEADER.size + first * cipher_size
+        for index in range(first, first + count):
+            value = int.from_bytes(data[offset : offset + cipher_size], "big")
+            if value >= n:
+                raise ValueError(f"Block {index} is not below the modulus")
+            if factors:
+                plain = RSACrypto._crt_pow(value, d, *factors, params)
+            else:
+                plain = powmod(value, d, n)
+
+            # Every block is full size except the last, which holds the remainder
+            length = min(block_size, header.plaintext_length - index * block_size)
+            try:
+                out += plain.to_bytes(length, "big")
+            except OverflowError:
+                raise ValueError(f"Block {index} does not decrypt to plaintext (wrong key?)")
+            offset += cipher_size
+    _write_at(output_path, first * block_size, out)
+    return count
+
+
+def _write_at(path: str, offset: int, data: bytes) -> None:
+    fd = os.open(path, os.O_WRONLY)
+    try:
+        os.pwrite(fd, data, offset)
+    finally:
+        os.close(fd)
+
+
+# Jobs
+###########################
+def encrypt_file(
+    input_path: str,
+    output_path: str,
+    n: int,
+    e: int,
+    workers: Optional[int] = None,
+    range_blocks: int = DEFAULT_RANGE_BLOCKS,
+    resume: bool = False,
+    progress: Optional[ProgressCallback] = None,
+) -> FileJobResult:
+    """
+    Encrypt a file of any size block by block across the process pool
+
+    The input is memory-mapped by each worker for its own block range and
+    results are written straight to their offsets in the output, so memory
+    stays flat however large the file is. Progress is checkpointed next to
+    the output every CHECKPOINT_SECONDS (or CHECKPOINT_RANGES ranges) and on
+    interruption; with resume, ranges finished by an interrupted run of the
+    same job are skipped.
+    """
+    plaintext_length = os.path.getsize(input_path)
+    block_size = RSACrypto.block_size(n)
+    header = FileHeader(
+        fingerprint=modulus_fingerprint(n),
+        block_size=block_size,
+        cipher_size=(n.bit_length() + 7) // 8,
+        block_count=-(-plaintext_length // block_size),
+        plaintext_length=plaintext_length,
+    )
+    output_size = HEADER.size + header.block_count * header.cipher_size
+
+    def prepare(f) -> None:
+        f.write(header.pack())
+
+    return _run_job(
+        "encrypt",
+        input_path,
+        output_path,
+        header,
+        output_size,
+        prepare,
+        lambda first, count: (_encrypt_range, first, count, header, n, e),
+        workers,
+        range_blocks,
+        resume,
+        progress,
+    )
+
+
+def decrypt_file(
+    input_path: str,
+    output_path: str,
+    n: int,
+    d: int,
+    p: Optional[int] = None,
+    q: Optional[int] = None,
+    workers: Optional[int] = None,
+    range_blocks: int = DEFAULT_RANGE_BLOCKS,
+    resume: bool = False,
+    progress: Optional[ProgressCallback] = None,
+) -> FileJobResult:
+    """Decrypt a file written by encrypt_file (with CRT when p and q are given)"""
+    header = FileHeader.read(input_path)
+    if header.fingerprint != modulus_fingerprint(n):
+        raise ValueError(f"File was encrypted for key {header.fingerprint}, not this key")
+    expected = HEADER.size + header.block_count * header.cipher_size
+    if os.path.getsize(input_path) != expected:
+        raise ValueError("Encrypted file is truncated or has trailing data")
+
+    factors = None
+    if p is not None and q is not None:
+        RSACrypto._check_factors(n, p, q)
+        factors = (p, q)
+
+    return _run_job(
+        "decrypt",
+        input_path,
+        output_path,
+        header,
+        header.plaintext_length,
+        lambda f: None,
+        lambda first, count: (_decrypt_range, first, count, header, n, d, factors),
+        workers,
+        range_blocks,
+        resume,
+        progress,
+    )
+
+
+def _run_job(
+    mode: str,
+    input_path: str,
+    output_path: str,
+    header: FileHeader,
+    output_size: int,
+    prepare: Callable,
+    make_task: Callable[[int, int], tuple],
+    workers: Optional[int],
+    range_blocks: int,
+    resume: bool,
+    progress: Optional[ProgressCallback],
+) -> FileJobResult:
+    """Run every block range not yet checkpointed, keeping a bounded window in flight"""
+    start_time = time.time()
+    ranges = [
+        (first, min(range_blocks, header.block_count - first))
+        for first in range(0, header.block_count, range_blocks)
+    ]
+
+    checkpoint_path = output_path + ".checkpoint"
+    job = {
+        "version": CHECKPOINT_VERSION,
+        "mode": mode,
+        "input": os.path.abspath(input_path),
+        "input_size": os.path.getsize(input_path),
+        "input_mtime": os.path.getmtime(input_path),
+        "fingerprint": header.fingerprint,
+        "range_blocks": range_blocks,
+    }
+    # Ranges below high_water are all done; above holds finished ranges past it
+    checkpoint = _load_checkpoint(checkpoint_path, job) if resume else None
+    if checkpoint is None or not os.path.exists(output_path):
+        checkpoint = (0, set())
+        with open(output_path, "wb") as f:
+            prepare(f)
+            f.truncate(output_size)
+    high_water, above = checkpoint
+    pending = deque(index for index in range(high_water, len(ranges)) if index not in above)
+    resumed_blocks = sum(
+        count for index, (_, count) in enumerate(ranges) if index < high_water or index in above
+    )
+
+    pool = get_process_pool(workers)
+    window = max(1, pool_size() * 2)
+    in_flight: Dict = {}
+    completed_blocks = resumed_blocks
+    unsaved = 0
+    last_saved = time.monotonic()
+    output_fd = os.open(output_path, os.O_RDONLY)
+
+    def save() -> None:
+        # Ranges are only recorded once their output is on disk
+        os.fsync(output_fd)
+        _save_checkpoint(checkpoint_path, job, high_water, above)
+
+    try:
+        while pending or in_flight:
+            while pending and len(in_flight) < window:
+                index = pending.popleft()
+                func, *args = make_task(*ranges[index])
+                future = pool.submit(func, input_path, output_path, *args)
+                in_flight[future] = index
+
+            finished, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in finished:
+                index = in_flight.pop(future)
+                completed_blocks += future.result()
+                above.add(index)
+                unsaved += 1
+            while high_water in above:
+                above.remove(high_water)
+                high_water += 1
+
+            now = time.monotonic()
+            if unsaved >= CHECKPOINT_RANGES or now - last_saved >= CHECKPOINT_SECONDS:
+                save()
+                unsaved, last_saved = 0, now
+            if progress is not None:
+                progress(completed_blocks, header.block_count)
+    except BaseException:
+        for future in in_flight:
+            future.cancel()
+        # Keep what finished so a resumed run can skip it
+        if unsaved:
+            save()
+        raise
+    finally:
+        os.close(output_fd)
+
+    if os.path.exists(checkpoint_path):
+        os.unlink(checkpoint_path)
+    return FileJobResult(
+        blocks=header.block_count,
+        bytes_in=os.path.getsize(input_path),
+        bytes_out=output_size,
+        elapsed=time.time() - start_time,
+        resumed_blocks=resumed_blocks,
+    )
+
+
+def _load_checkpoint(path: str, job: dict) -> Optional[Tuple[int, Set[int]]]:
+    """(high-water mark, finished ranges above it) recorded for this exact job, or None"""
+    try:
+        with open(path, encoding="utf-8") as f:
+            checkpoint = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if checkpoint.get("job") != job:
+        return None
+    return checkpoint.get("high_water", 0), set(checkpoint.get("done", []))
+
+
+def _save_checkpoint(path: str, job: dict, high_water: int, above: Set[int]) -> None:
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({"job": job, "high_water": high_water, "done": sorted(above)}, f)
+    os.replace(tmp_path, path)
+
+
+def list_files(root: str) -> List[str]:
+    """Files under root (root itself if it is a file), relative to root, sorted"""
+    if os.path.isfile(root):
+        return [""]
+    found = []
+    for directory, _, files in os.walk(root):
+        for name in files:
+            found.append(os.path.relpath(os.path.join(directory, name), root))
+    return sorted(found)
@@ -0,0 +1,222 @@
+import base64
+import binascii
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+from math import lcm
+from typing import List, Optional, Tuple
+
+from models.crypto_models import BoundKey
+
+from .metrics import Counter
+
+PARSED_KEY_CACHE_LOOKUPS = Counter(
+    "rsa_parsed_key_cache_lookups",
+    "Key imports answered from (hit) or missing in (miss) the parsed-key cache",
+    labelnames=("result",),
+)
+_HITS = PARSED_KEY_CACHE_LOOKUPS.labels(result="hit")
+_MISSES = PARSED_KEY_CACHE_LOOKUPS.labels(result="miss")
+
+# PKCS#1 (RFC 8017, appendix A.1) PEM labels
+###########################
+PUBLIC_KEY_LABEL = "RSA PUBLIC KEY"
+PRIVATE_KEY_LABEL = "RSA PRIVATE KEY"
+
+_INTEGER = 0x02
+_SEQUENCE = 0x30
+
+_PEM_RE = re.compile(r"-----BEGIN ([A-Z ]+)-----\s*(.*?)\s*-----END \1-----", re.DOTALL)
+
+
+# DER: only what PKCS#1 keys need (a SEQUENCE of non-negative INTEGERs)
+###########################
+def _encode_length(length: int) -> bytes:
+    if length < 0x80:
+        return bytes([length])
+    size = (length.bit_length() + 7) // 8
+    return bytes([0x80 | size]) + length.to_bytes(size, "big")
+
+
+def encode_integer(value: int) -> bytes:
+    """DER INTEGER of a non-negative int (a leading zero byte keeps it positive)"""
+    if value < 0:
+        raise ValueError("Only non-negative integers are supported")
+    body = value.to_bytes(value.bit_length() // 8 + 1, "big")
+    return bytes([_INTEGER]) + _encode_length(len(body)) + body
+
+
+def encode_sequence(values: List[int]) -> bytes:
+    """DER SEQUENCE of INTEGERs"""
+    body = b"".join(encode_integer(value) for value in values)
+    return bytes([_SEQUENCE]) + _encode_length(len(body)) + body
+
+
+def _read_element(data: bytes, offset: int) -> Tuple[int, int, int]:
+    """(tag, start, end) of the element at offset, checking DER length rules"""
+    if offset + 2 > len(data):
+        raise ValueError("Truncated DER element")
+    tag, length = data[offset], data[offset + 1]
+    offset += 2
+    if length & 0x80:
+        size = length & 0x7F
+        if size == 0 or size > 4 or offset + size > len(data):
+            raise ValueError("Unsupported DER length")
+        length = int.from_bytes(data[offset : offset + size], "big")
+        if length < 0x80 or data[offset] == 0:
+            raise ValueError("Non-minimal DER length")
+        offset += size
+    if offset + length > len(data):
+        raise ValueError("Truncated DER element")
+    return tag, offset, offset + length
+
+
+def decode_sequence(data: bytes) -> List[int]:
+    """INTEGERs of a DER SEQUENCE of INTEGERs (the whole input must be the sequence)"""
+    tag, offset, end = _read_element(data, 0)
+    if tag != _SEQUENCE:
+        raise ValueError("Expected a DER SEQUENCE")
+    if end != len(data):
+        raise ValueError("Trailing data after DER SEQUENCE")
+
+    values = []
+    while offset < end:
+        tag, start, offset = _read_element(data, offset)
+        if tag != _INTEGER:
+            raise ValueError("Expected a DER INTEGER")
+        body = data[start:offset]
+        if not body:
+            raise ValueError("Empty DER INTEGER")
+        if body[0] & 0x80:
+            raise ValueError("Negative integers are not valid in RSA keys")
+        if len(body) > 1 and body[0] == 0 and not body[1] & 0x80:
+            raise ValueError("Non-minimal DER INTEGER")
+        values.append(int.from_bytes(body, "big"))
+    return values
+
+
+# PKCS#1 RSAPublicKey / RSAPrivateKey
+###########################
+def encode_public_key(n: int, e: int) -> bytes:
+    """RSAPublicKey ::= SEQUENCE { modulus, publicExponent }"""
+    return encode_sequence([n, e])
+
+
+def encode_private_key(n: int, e: int, d: int, p: int, q: int) -> bytes:
+    """RSAPrivateKey (two-prime, version 0) with its CRT fields"""
+    return encode_sequence([0, n, e, d, p, q, d % (p - 1), d % (q - 1), pow(q, -1, p)])
+
+
+def decode_key(der: bytes) -> BoundKey:
+    """
+    Parse a PKCS#1 RSAPublicKey or RSAPrivateKey
+
+    The private key's CRT fields must agree with d, p and q (they are
+    recomputed on use, so a mismatch means a corrupt or tampered key), and
+    e * d must be 1 mod lambda(n) so decryption inverts encryption.
+
+    Raises:
+        ValueError: if the DER is malformed or not a consistent RSA key
+    """
+    values = decode_sequence(der)
+    if len(values) == 2:
+        n, e = values
+        if n < 2 or e < 1:
+            raise ValueError("Invalid RSA public key")
+        return BoundKey(n=n, e=e)
+
+    if len(values) != 9:
+        raise ValueError("Not a PKCS#1 RSA key (expected 2 or 9 integers)")
+    version, n, e, d, p, q, dp, dq, q_inv = values
+    if version != 0:
+        raise ValueError(f"Unsupported RSAPrivateKey version {version} (multi-prime)")
+    if p < 2 or q < 2 or p * q != n:
+        raise ValueError("RSA private key primes do not match the modulus")
+    if e < 1 or d < 1:
+        raise ValueError("RSA private key exponents must be positive")
+    if dp != d % (p - 1) or dq != d % (q - 1) or q_inv * q % p != 1:
+        raise ValueError("RSA private key CRT fields are inconsistent")
+    # d must invert e modulo the Carmichael function lambda(n) = lcm(p - 1, q - 1)
+    if e * d % lcm(p - 1, q - 1) != 1:
+        raise ValueError("RSA private key exponents do not satisfy e * d = 1 mod lambda(n)")
+    return BoundKey(n=n, e=e, d=d, p=p, q=q)
+
+
+# PEM armor
+###########################
+def pem_encode(der: bytes, label: str) -> str:
+    """Base64 body in 64-character lines between BEGIN / END lines"""
+    body = base64.b64encode(der).decode("ascii")
+    lines = [body[i : i + 64] for i in range(0, len(body), 64)]
+    return "\n".join([f"-----BEGIN {label}-----", *lines, f"-----END {label}-----", ""])
+
+
+def pem_decode(text: str) -> Tuple[str, bytes]:
+    """(label, DER) of the first PEM block in text"""
+    match = _PEM_RE.search(text)
+    if match is None:
+        raise ValueError("No PEM block found")
+    try:
+        der = base64.b64decode("".join(match.group(2).split()), validate=True)
+    except binascii.Error:
+        raise ValueError("Invalid base64 in PEM body")
+    return match.group(1), der
+
+
+def key_to_der(data: bytes) -> bytes:
+    """DER of a key given as PEM text or as DER"""
+    if data.lstrip().startswith(b"-----BEGIN"):
+        label, der = pem_decode(data.decode("ascii", errors="replace"))
+        if label not in (PUBLIC_KEY_LABEL, PRIVATE_KEY_LABEL):
+            raise ValueError(f"Unsupported PEM type {label!r} (expected PKCS#1 RSA)")
+        return der
+    return data
+
+
+class ParsedKeyCache:
+    """
+    Bounded LRU of parsed keys, keyed by the SHA-256 fingerprint of the key as given
+
+    Importing a key already seen costs a hash and a dictionary lookup
+    instead of PEM unarmoring, a DER parse and the CRT consistency checks.
+    The same key as PEM and as DER takes two entries.
+    """
+
+    def __init__(self, max_keys: int = 256):
+        self.max_keys = max_keys
+        self._keys: "OrderedDict[bytes, BoundKey]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def load(self, data: bytes) -> Tuple[BoundKey, bool]:
+        """(key, whether it came from the cache) for PEM or DER input"""
+        fingerprint = hashlib.sha256(data).digest()
+        with self._lock:
+            key = self._keys.get(fingerprint)
+            if key is not None:
+                self._keys.move_to_end(fingerprint)
+        if key is not None:
+            _HITS.inc()
+            return key, True
+
+        _MISSES.inc()
+        key = decode_key(key_to_der(data))
+        with self._lock:
+            self._keys[fingerprint] = key
+            while len(self._keys) > self.max_keys:
+                self._keys.popitem(last=False)
+        return key, False
+
+    def clear(self) -> None:
+        with self._lock:
+            self._keys.clear()
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+
+def load_key(data: bytes, cache: Optional[ParsedKeyCache] = None) -> Tuple[BoundKey, bool]:
+    """Parse a PEM or DER key, through cache when given"""
+    if cache is not None:
+        return cache.load(data)
+    return decode_key(key_to_der(data)), False
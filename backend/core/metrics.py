@@ -0,0 +1,248 @@
+import threading
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+# Endpoint currently being served, used as a metric label by core code
+###########################
+current_endpoint: ContextVar[str] = ContextVar("current_endpoint", default="none")
+
+LabelKey = Tuple[str, ...]
+
+# Fixed modulus size classes; labelling with raw client bit lengths is unbounded
+MODULUS_SIZE_CLASSES = (1024, 2048, 3072, 4096)
+
+
+def bit_length_class(bits: int) -> str:
+    """Metric label for a modulus size: <=1024, 2048, 3072, 4096 (upper bounds) or other"""
+    if bits <= MODULUS_SIZE_CLASSES[0]:
+        return f"<={MODULUS_SIZE_CLASSES[0]}"
+    for size in MODULUS_SIZE_CLASSES[1:]:
+        if bits <= size:
+            return str(size)
+    return "other"
+
+
+class MetricsRegistry:
+    """Collection of metrics rendered together in Prometheus text format"""
+
+    def __init__(self):
+        self._metrics: List["_Metric"] = []
+        self._lock = threading.Lock()
+
+    def register(self, metric: "_Metric") -> None:
+        with self._lock:
+            self._metrics.append(metric)
+
+    def render(self) -> str:
+        """Render every metric in Prometheus text exposition format (0.0.4)"""
+        lines: List[str] = []
+        for metric in list(self._metrics):
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.metric_type}")
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+
+class _Metric:
+    """
+    Base class for sharded metrics
+
+    Every thread writes to its own shard (a plain dict), so updates on hot
+    paths never take a lock; the lock is only used when a thread creates its
+    shard and when shards are merged for a scrape.
+    """
+
+    metric_type = "untyped"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        registry: Optional[MetricsRegistry] = REGISTRY,
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._local = threading.local()
+        self._shards: List[dict] = []
+        self._shards_lock = threading.Lock()
+        if registry is not None:
+            registry.register(self)
+
+    def labels(self, **labels) -> "_BoundMetric":
+        """Bind label values; bound metrics can be cached by callers"""
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        return _BoundMetric(self, key)
+
+    def _shard(self) -> dict:
+        try:
+            return self._local.shard
+        except AttributeError:
+            shard = self._local.shard = {}
+            with self._shards_lock:
+                self._shards.append(shard)
+            return shard
+
+    def _snapshot(self) -> List[dict]:
+        with self._shards_lock:
+            return [dict(shard) for shard in self._shards]
+
+    def _format_labels(self, key: LabelKey, extra: Optional[Dict[str, str]] = None) -> str:
+        pairs = list(zip(self.labelnames, key)) + list((extra or {}).items())
+        if not pairs:
+            return ""
+        return "{" + ",".join(f'{name}="{value}"' for name, value in pairs) + "}"
+
+    def render(self) -> List[str]:
+        raise NotImplementedError
+
+
+class _BoundMetric:
+    """A metric with its label values fixed"""
+
+    __slots__ = ("metric", "key")
+
+    def __init__(self, metric: _Metric, key: LabelKey):
+        self.metric = metric
+        self.key = key
+
+    def inc(self, amount: float = 1) -> None:
+        self.metric._inc(self.key, amount)
+
+    def dec(self, amount: float = 1) -> None:
+        self.metric._inc(self.key, -amount)
+
+    def observe(self, value: float, count: int = 1) -> None:
+        self.metric._observe(self.key, value, count)
+
+
+class Counter(_Metric):
+    """Monotonically increasing counter"""
+
+    metric_type = "counter"
+
+    def inc(self, amount: float = 1) -> None:
+        self._inc((), amount)
+
+    def _inc(self, key: LabelKey, amount: float) -> None:
+        shard = self._shard()
+        shard[key] = shard.get(key, 0) + amount
+
+    def value(self, key: LabelKey = ()) -> float:
+        return sum(shard.get(key, 0) for shard in self._snapshot())
+
+    def render(self) -> List[str]:
+        totals: Dict[LabelKey, float] = {}
+        for shard in self._snapshot():
+            for key, value in shard.items():
+                totals[key] = totals.get(key, 0) + value
+        return [f"{self.name}{self._format_labels(key)} {value}" for key, value in totals.items()]
+
+
+class Gauge(Counter):
+    """
+    Value that can go up and down
+
+    Either updated with inc/dec (per-thread deltas summed at scrape time) or
+    computed on scrape by a callback returning a value or {label key: value}.
+    """
+
+    metric_type = "gauge"
+
+    def __init__(self, *args, func: Optional[Callable[[], object]] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._func = func
+
+    def dec(self, amount: float = 1) -> None:
+        self._inc((), -amount)
+
+    def render(self) -> List[str]:
+        if self._func is None:
+            return super().render()
+
+        values = self._func()
+        if not isinstance(values, dict):
+            values = {(): values}
+        return [f"{self.name}{self._format_labels(key)} {value}" for key, value in values.items()]
+
+
+class Histogram(_Metric):
+    """
+    Distribution of observed values over fixed buckets
+
+    Each observation swaps in a new (bucket counts, sum, count) tuple, so a
+    scrape sees either all of it or none of it.
+    """
+
+    metric_type = "histogram"
+
+    def __init__(self, name: str, documentation: str, buckets: Sequence[float], **kwargs):
+        super().__init__(name, documentation, **kwargs)
+        self.buckets = tuple(sorted(buckets))
+        # (per-bucket counts (last is +Inf), sum, count)
+        self._empty = ((0,) * (len(self.buckets) + 1), 0.0, 0)
+
+    def observe(self, value: float, count: int = 1) -> None:
+        self._observe((), value, count)
+
+    def _observe(self, key: LabelKey, value: float, count: int) -> None:
+        shard = self._shard()
+        counts, total, observations = shard.get(key, self._empty)
+        i = bisect_left(self.buckets, value)
+        counts = counts[:i] + (counts[i] + count,) + counts[i + 1 :]
+        shard[key] = (counts, total + value * count, observations + count)
+
+    def render(self) -> List[str]:
+        merged: Dict[LabelKey, list] = {}
+        for shard in self._snapshot():
+            for key, (counts, total, count) in shard.items():
+                state = merged.setdefault(key, [[0] * (len(self.buckets) + 1), 0.0, 0])
+                state[0] = [a + b for a, b in zip(state[0], counts)]
+                state[1] += total
+                state[2] += count
+
+        lines = []
+        for key, (counts, total, count) in merged.items():
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += bucket_count
+                le = "+Inf" if bound == float("inf") else repr(float(bound))
+                lines.append(
+                    f"{self.name}_bucket{self._format_labels(key, {'le': le})} {cumulative}"
+                )
+            lines.append(f"{self.name}_sum{self._format_labels(key)} {total}")
+            lines.append(f"{self.name}_count{self._format_labels(key)} {count}")
+        return lines
+
+
+# Core crypto metrics
+###########################
+PRIME_ATTEMPTS = Histogram(
+    "rsa_prime_generation_attempts",
+    "Random candidates drawn per generated prime",
+    buckets=(1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000),
+    labelnames=("bit_length",),
+)
+PRIME_MILLER_RABIN_TESTS = Histogram(
+    "rsa_prime_miller_rabin_tests",
+    "Candidates that reached a full Miller-Rabin test per generated prime",
+    buckets=(1, 2, 5, 10, 20, 50, 100, 200, 500),
+    labelnames=("bit_length",),
+)
+PRIME_SECONDS = Histogram(
+    "rsa_prime_generation_seconds",
+    "Wall time to generate one prime",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+    labelnames=("bit_length",),
+)
+BLOCK_SECONDS = Histogram(
+    "rsa_block_operation_seconds",
+    "Wall time per block of RSA encryption or decryption",
+    buckets=(1e-5, 5e-5, 1e-4, 5e-4, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5),
+    labelnames=("operation", "bit_length", "endpoint"),
+)
@@ -1,4 +1,5 @@
-import random
+from .arithmetic import get_backend
+from .entropy import get_random_source
 
 
 class MillerRabinTester:
@@ -40,14 +41,15 @@ class MillerRabinTester:
     @staticmethod
     def _single_test(n: int, d: int, r: int) -> bool:
         """Perform a single round of Miller-Rabin test"""
-        a = random.randrange(2, n - 1)
-        x = pow(a, d, n)
+        powmod = get_backend().powmod
+        a = get_random_source().randrange(2, n - 1)
+        x = powmod(a, d, n)
 
         if x == 1 or x == n - 1:
             return True
 
         for _ in range(r - 1):
-            x = pow(x, 2, n)
+            x = powmod(x, 2, n)
             if x == n - 1:
                 return True
 
@@ -0,0 +1,201 @@
+import os
+import random
+import threading
+import time
+from functools import partial
+from itertools import repeat
+from typing import TYPE_CHECKING, Callable, List, Optional, Sequence, Tuple
+
+from .arithmetic import get_backend, set_backend
+from .metrics import Gauge
+from .profiling import active_profile, profiled_call
+from .tracing import TraceContext, export_remote_spans, run_in_remote_span, tracer
+from .utils import system_sampler
+
+if TYPE_CHECKING:
+    from concurrent.futures import ProcessPoolExecutor
+
+# Shared process pool (created lazily, one per worker process)
+###########################
+_process_pool: Optional["ProcessPoolExecutor"] = None
+_pool_workers: int = 0
+_pool_lock = threading.Lock()
+
+POOL_PENDING_CHUNKS = Gauge(
+    "rsa_process_pool_pending_chunks", "Chunks submitted to the process pool and not yet collected"
+)
+POOL_WORKERS = Gauge(
+    "rsa_process_pool_workers", "Worker processes in the shared pool", func=lambda: pool_size()
+)
+
+system_sampler.add_source("process_pool_workers", lambda: pool_size())
+system_sampler.add_source("process_pool_pending_chunks", POOL_PENDING_CHUNKS.value)
+
+
+def get_process_pool(workers: Optional[int] = None) -> "ProcessPoolExecutor":
+    """Get the shared process pool, creating it (and loading multiprocessing) on first use"""
+    global _process_pool, _pool_workers
+    from concurrent.futures import ProcessPoolExecutor
+
+    # Requests reach this from executor threads; only one of them may create the pool
+    with _pool_lock:
+        if _process_pool is None:
+            _pool_workers = workers or os.cpu_count() or 1
+            # Workers use the arithmetic backend selected in this process
+            _process_pool = ProcessPoolExecutor(
+                max_workers=_pool_workers, initializer=set_backend, initargs=(get_backend().name,)
+            )
+        return _process_pool
+
+
+def pool_size() -> int:
+    """Number of worker processes in the shared pool (0 if not started)"""
+    return _pool_workers if _process_pool is not None else 0
+
+
+def shutdown_process_pool() -> None:
+    """Shut down the shared process pool if it was started"""
+    global _process_pool, _pool_workers
+
+    with _pool_lock:
+        pool, _process_pool, _pool_workers = _process_pool, None, 0
+    if pool is not None:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+def _pow_chunk(values: List[int], exponent: int, modulus: int) -> List[int]:
+    """Modular exponentiation of one chunk of blocks (runs in a worker process)"""
+    powmod = get_backend().powmod
+    return [powmod(value, exponent, modulus) for value in values]
+
+
+def _run_chunk(
+    func: Callable[..., List],
+    trace_context: Optional[TraceContext],
+    profile: bool,
+    chunk: List,
+    *args,
+) -> Tuple[List, List[dict], dict]:
+    """Run one chunk with tracing and/or profiling (runs in a worker process)"""
+    call = partial(func, chunk, *args)
+    spans: List[dict] = []
+    if trace_context is not None:
+        call = partial(run_in_remote_span, trace_context, "parallel.chunk", call)
+
+    if profile:
+        result, stats = profiled_call(call)
+    else:
+        result, stats = call(), {}
+
+    if trace_context is not None:
+        result, spans = result
+    return result, spans, stats
+
+
+def parallel_map_chunks(
+    func: Callable[..., List], items: Sequence, *args, workers: Optional[int] = None
+) -> List:
+    """
+    Run func(chunk, *args) over chunks of items across the process pool
+
+    func must be a module-level function returning one result per item.
+    Results are flattened back in input order.
+    """
+    if not items:
+        return []
+    pool = get_process_pool(workers)
+
+    # A few chunks per worker keeps the pool busy without per-item pickling overhead
+    chunk_count = min(len(items), pool_size() * 4)
+    chunk_size = -(-len(items) // chunk_count)
+    chunks = [list(items[i : i + chunk_size]) for i in range(0, len(items), chunk_size)]
+
+    # Profiling and tracing follow the work into the worker processes
+    profile = active_profile.get()
+    trace_context = tracer.current_context()
+    wrapped = profile is not None or trace_context is not None
+    if wrapped:
+        mapped = pool.map(
+            _run_chunk,
+            repeat(func),
+            repeat(trace_context),
+            repeat(profile is not None),
+            chunks,
+            *(repeat(arg) for arg in args),
+        )
+    else:
+        mapped = pool.map(func, chunks, *(repeat(arg) for arg in args))
+
+    results: List = []
+    collected = 0
+    POOL_PENDING_CHUNKS.inc(len(chunks))
+    try:
+        for chunk_result in mapped:
+            collected += 1
+            POOL_PENDING_CHUNKS.dec()
+            if wrapped:
+                chunk_result, spans, stats = chunk_result
+                export_remote_spans(spans)
+                if profile is not None:
+                    profile.add_stats(stats)
+            results.extend(chunk_result)
+    finally:
+        POOL_PENDING_CHUNKS.dec(len(chunks) - collected)
+    return results
+
+
+def parallel_pow(
+    values: Sequence[int], exponent: int, modulus: int, workers: Optional[int] = None
+) -> List[int]:
+    """
+    Raise every value to exponent mod modulus across the process pool
+
+    Args:
+        values: Blocks to transform
+        exponent: Public or private exponent
+        modulus: RSA modulus
+        workers: Pool size used if the pool has not been started yet
+
+    Returns:
+        Transformed blocks, in the same order as values
+    """
+    return parallel_map_chunks(_pow_chunk, values, exponent, modulus, workers=workers)
+
+
+def calibrate_parallel_threshold(
+    bit_length: int = 2048,
+    block_counts: Sequence[int] = (2, 4, 8, 16, 32, 64, 128, 256),
+    repeats: int = 3,
+    workers: Optional[int] = None,
+) -> int:
+    """
+    Find the smallest block count at which parallel_pow beats a serial loop
+
+    Times both strategies for each block count using a random odd modulus and a
+    full-size exponent (the decryption case). Returns the largest tried count
+    plus one if the pool never wins, i.e. "never parallelise".
+    """
+    rng = random.Random(bit_length)
+    modulus = rng.getrandbits(bit_length) | (1 << (bit_length - 1)) | 1
+    exponent = rng.getrandbits(bit_length) | 1
+
+    # Warm the pool up so process start-up is not counted against the first count
+    parallel_pow([2] * (pool_size() or workers or os.cpu_count() or 1), 3, modulus, workers)
+
+    for count in block_counts:
+        values = [rng.randrange(2, modulus) for _ in range(count)]
+
+        serial_time = parallel_time = float("inf")
+        for _ in range(repeats):
+            start = time.perf_counter()
+            _pow_chunk(values, exponent, modulus)
+            serial_time = min(serial_time, time.perf_counter() - start)
+
+            start = time.perf_counter()
+            parallel_pow(values, exponent, modulus, workers)
+            parallel_time = min(parallel_time, time.perf_counter() - start)
+
+        if parallel_time < serial_time:
+            return count
+
+    return block_counts[-1] + 1
@@ -0,0 +1,105 @@
+from math import gcd
+from typing import Any, Dict
+
+from models.crypto_models import PocklingtonStep, PrimeCertificate
+
+from .arithmetic import get_backend
+
+# Miller-Rabin with these bases is exact below the limit (Sorenson & Webster)
+###########################
+DETERMINISTIC_BASES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37)
+DETERMINISTIC_LIMIT = 3317044064679887385961981
+
+# Certificate chains bottom out at a prime of at most this many bits
+CERTIFICATE_BASE_BITS = 32
+
+
+def is_small_prime(n: int) -> bool:
+    """Exact primality test for n below DETERMINISTIC_LIMIT"""
+    if n >= DETERMINISTIC_LIMIT:
+        raise ValueError("Number too large for a deterministic test")
+    if n < 2:
+        return False
+    for base in DETERMINISTIC_BASES:
+        if n % base == 0:
+            return n == base
+
+    d, r = n - 1, 0
+    while d % 2 == 0:
+        d //= 2
+        r += 1
+
+    for base in DETERMINISTIC_BASES:
+        x = pow(base, d, n)
+        if x == 1 or x == n - 1:
+            continue
+        for _ in range(r - 1):
+            x = x * x % n
+            if x == n - 1:
+                break
+        else:
+            return False
+    return True
+
+
+def verify_certificate(certificate: PrimeCertificate) -> None:
+    """
+    Check a Pocklington certificate chain
+
+    The base must be a prime below DETERMINISTIC_LIMIT; each step proves
+    p prime from the previous prime q by Pocklington's theorem: q divides
+    p - 1, q^2 > p, a^(p-1) = 1 (mod p) and gcd(a^((p-1)/q) - 1, p) = 1.
+    Costs two modular exponentiations per step.
+
+    Raises:
+        ValueError: naming the first condition that does not hold
+    """
+    if certificate.base >= DETERMINISTIC_LIMIT or not is_small_prime(certificate.base):
+        raise ValueError("Base is not a small prime")
+
+    powmod = get_backend().powmod
+    previous = certificate.base
+    for i, step in enumerate(certificate.steps, 1):
+        p, q, a = step.prime, step.factor, step.witness
+        if q != previous:
+            raise ValueError(f"Step {i}: factor is not the previously proven prime")
+        if p <= q or (p - 1) % q != 0:
+            raise ValueError(f"Step {i}: factor does not divide prime - 1")
+        if q * q <= p:
+            raise ValueError(f"Step {i}: factor is not larger than sqrt(prime)")
+        if not 1 < a < p - 1:
+            raise ValueError(f"Step {i}: witness out of range")
+        if powmod(a, p - 1, p) != 1:
+            raise ValueError(f"Step {i}: witness fails the Fermat condition")
+        if gcd(powmod(a, (p - 1) // q, p) - 1, p) != 1:
+            raise ValueError(f"Step {i}: witness fails the gcd condition")
+        previous = p
+
+    if previous != certificate.prime:
+        raise ValueError("Chain does not end at the certified prime")
+
+
+def certificate_to_dict(certificate: PrimeCertificate) -> Dict[str, Any]:
+    """JSON-friendly form, with integers as decimal strings"""
+    return {
+        "prime": str(certificate.prime),
+        "base": str(certificate.base),
+        "steps": [
+            {"prime": str(step.prime), "factor": str(step.factor), "witness": str(step.witness)}
+            for step in certificate.steps
+        ],
+    }
+
+
+def certificate_from_dict(data: Dict[str, Any]) -> PrimeCertificate:
+    """Inverse of certificate_to_dict"""
+    return PrimeCertificate(
+        prime=int(data["prime"]),
+        base=int(data["base"]),
+        steps=[
+            PocklingtonStep(
+                prime=int(step["prime"]), factor=int(step["factor"]), witness=int(step["witness"])
+            )
+            for step in data["steps"]
+        ],
+    )
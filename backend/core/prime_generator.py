@@ -1,33 +1,150 @@
-import random
 import time
+from functools import lru_cache
+from itertools import compress
+from math import gcd, prod
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
-from models.crypto_models import PrimePair
+from models.crypto_models import PocklingtonStep, PrimeCertificate, PrimePair
 
+from .arithmetic import get_backend
+from .batch_gcd import product_tree, remainder_tree
+from .entropy import HmacDrbg, get_random_source, use_random_source
+from .metrics import PRIME_ATTEMPTS, PRIME_MILLER_RABIN_TESTS, PRIME_SECONDS
 from .miller_rabin import MillerRabinTester
+from .prime_certificates import CERTIFICATE_BASE_BITS, is_small_prime
+from .prime_memo import PrimeMemo
+from .tracing import traced
+
+
+def _odd_primes_below(limit: int) -> List[int]:
+    """Sieve of Eratosthenes, without 2"""
+    sieve = bytearray([1]) * limit
+    sieve[0:2] = b"\x00\x00"
+    for i in range(2, int(limit**0.5) + 1):
+        if sieve[i]:
+            sieve[i * i :: i] = bytearray(len(range(i * i, limit, i)))
+    return [i for i in range(3, limit) if sieve[i]]
+
+
+# Small primes used for batch candidate filtering; built on first use
+###########################
+SIEVE_BOUND = 4096
+
+
+@lru_cache(maxsize=1)
+def _sieve_primes() -> List[int]:
+    return _odd_primes_below(SIEVE_BOUND)
+
+
+@lru_cache(maxsize=1)
+def _sieve_primes_product() -> int:
+    return prod(_sieve_primes())
+
+
+# Small primes for the safe-prime window sieve (marking a window is one slice per prime);
+# built on first use so importing the module stays cheap
+###########################
+SAFE_SIEVE_BOUND = 1 << 16
+SAFE_PRIME_WINDOW = 4096
+
+
+@lru_cache(maxsize=1)
+def _safe_sieve_primes() -> List[int]:
+    return _odd_primes_below(SAFE_SIEVE_BOUND)
+
+
+# Consecutive t sieved at once when searching p = 2tq + 1 for certified primes
+CERTIFICATE_WINDOW = 1024
+
+# Random candidates drawn and sieved together per batch (a 1024-bit prime takes ~350)
+CANDIDATE_BATCH = 256
+
+PRIME_TYPES = ("random", "safe", "strong", "provable")
 
 
 class PrimeGenerator:
     """Generator for large prime numbers using Miller-Rabin test"""
 
-    def __init__(self, max_attempts: int = 10000):
+    def __init__(self, max_attempts: int = 10000, memo: Optional[PrimeMemo] = None):
+        """
+        Args:
+            max_attempts: Candidates drawn per prime before giving up
+            memo: On-disk memo for seeded pairs (None disables memoization)
+        """
         self.max_attempts = max_attempts
         self.miller_rabin = MillerRabinTester()
+        self.memo = memo
+
+    @traced("prime_generator.generate_prime_pair")
+    def generate_prime_pair(
+        self,
+        bit_length: int,
+        rounds: int = 10,
+        seed: Optional[str] = None,
+        prime_type: str = "random",
+    ) -> PrimePair:
+        """
+        Generate a pair of distinct primes
+
+        prime_type is "random", "safe" (p = 2q + 1 with q prime), "strong"
+        (Gordon's p - 1, p + 1 and r - 1 conditions) or "provable" (proven
+        primes, with their Pocklington certificates attached to the pair).
+
+        With a seed, candidates and Miller-Rabin witnesses come from an
+        HMAC-DRBG seeded with it, so the same (seed, bit_length, rounds)
+        always gives the same pair on either arithmetic backend; seeded
+        pairs are memoized when a memo is configured. Seeded primes are only
+        as secret as the seed.
+        """
+        if prime_type not in PRIME_TYPES:
+            raise ValueError(f"Unknown prime type {prime_type!r}")
+        if seed is None:
+            return self._generate_pair(bit_length, rounds, prime_type)
+
+        start_time = time.time()
+        if self.memo is not None:
+            memoized = self.memo.get(seed, bit_length, rounds, prime_type)
+            if memoized is not None:
+                memoized.generation_time = time.time() - start_time
+                return memoized
+
+        with use_random_source(HmacDrbg(seed)):
+            prime_pair = self._generate_pair(bit_length, rounds, prime_type)
+        if self.memo is not None:
+            self.memo.put(seed, prime_pair)
+        return prime_pair
 
-    def generate_prime_pair(self, bit_length: int, rounds: int = 10) -> PrimePair:
-        """Generate a pair of distinct primes"""
+    def _generate_pair(self, bit_length: int, rounds: int, prime_type: str) -> PrimePair:
+        """Generate a pair of distinct primes from the current random source"""
         start_time = time.time()
+        generators: Dict[str, Callable[[int, int], Any]] = {
+            "random": self._generate_single_prime,
+            "safe": self.generate_safe_prime,
+            "strong": self.generate_strong_prime,
+            "provable": self.generate_certified_prime,
+        }
+        generate = generators[prime_type]
 
-        p = self._generate_single_prime(bit_length, rounds)
+        if prime_type == "random":
+            # Both primes come out of the same sieved candidate batches
+            p, q = self.generate_primes(2, bit_length, rounds)
+        else:
+            p = generate(bit_length, rounds)
 
-        # Ensure q is different from p
-        q = self._generate_single_prime(bit_length, rounds)
-        attempts = 0
-        while q == p and attempts < 100:
-            q = self._generate_single_prime(bit_length, rounds)
-            attempts += 1
+            # Ensure q is different from p
+            q = generate(bit_length, rounds)
+            attempts = 0
+            while q == p and attempts < 100:
+                q = generate(bit_length, rounds)
+                attempts += 1
 
-        if p == q:
-            raise RuntimeError("Failed to generate distinct primes")
+            if p == q:
+                raise RuntimeError("Failed to generate distinct primes")
+
+        certificates = None
+        if prime_type == "provable":
+            certificates = [p, q]
+            p, q = p.prime, q.prime
 
         generation_time = time.time() - start_time
 
@@ -37,31 +154,247 @@ class PrimeGenerator:
             bit_length=bit_length,
             generation_time=generation_time,
             miller_rabin_rounds=rounds,
+            prime_type=prime_type,
+            certificates=certificates,
         )
 
-    def _generate_single_prime(self, bit_length: int, rounds: int) -> int:
-        """Generate a single prime number"""
+    @traced("prime_generator.generate_primes")
+    def generate_primes(
+        self, count: int, bit_length: int, rounds: int = 10, batch_size: int = CANDIDATE_BATCH
+    ) -> List[int]:
+        """
+        Generate several distinct primes at once
+
+        Candidates are drawn in batches and sieved together with
+        filter_candidates before any Miller-Rabin test runs, which amortizes
+        trial division across the whole batch. Survivors are tested in draw
+        order, so the result depends only on the random source.
+        """
         min_val = 1 << (bit_length - 1)
-        max_val = (1 << bit_length) - 1
+        backend = get_backend()
+
+        primes: List[int] = []
+        seen = set()
+        drawn = 0
+        max_candidates = self.max_attempts * count
+        # Per-prime counters for the generation metrics
+        start_time = time.perf_counter()
+        attempts = miller_rabin_tests = 0
+
+        while len(primes) < count:
+            if drawn >= max_candidates:
+                raise RuntimeError(f"Failed to generate {count} primes after {drawn} candidates")
+
+            batch = min(batch_size, max_candidates - drawn)
+            candidates = [backend.random_bits(bit_length - 1) | min_val | 1 for _ in range(batch)]
+            drawn += batch
+            survivors = set(self.filter_candidates(candidates))
+
+            for candidate in candidates:
+                attempts += 1
+                if candidate not in survivors or candidate in seen:
+                    continue
+                miller_rabin_tests += 1
+                if backend.is_probable_prime(candidate, rounds):
+                    seen.add(candidate)
+                    primes.append(candidate)
+                    PRIME_ATTEMPTS.labels(bit_length=bit_length).observe(attempts)
+                    PRIME_MILLER_RABIN_TESTS.labels(bit_length=bit_length).observe(
+                        miller_rabin_tests
+                    )
+                    now = time.perf_counter()
+                    PRIME_SECONDS.labels(bit_length=bit_length).observe(now - start_time)
+                    start_time, attempts, miller_rabin_tests = now, 0, 0
+                    if len(primes) == count:
+                        break
 
-        for attempt in range(self.max_attempts):
-            candidate = random.randrange(min_val, max_val)
+        return primes
 
-            # Ensure odd number
-            if candidate % 2 == 0:
-                candidate += 1
+    @staticmethod
+    def filter_candidates(candidates: List[int]) -> List[int]:
+        """
+        Drop candidates with a prime factor below 4096, in one batch
+
+        Reduces the product of the small primes modulo every candidate with a
+        remainder tree, then keeps the candidates coprime to that product.
+        """
+        if not candidates:
+            return []
+
+        # Nodes larger than the small-prime product would just return it unchanged
+        sieve_product = _sieve_primes_product()
+        tree = product_tree(candidates, max_bits=sieve_product.bit_length())
+        remainders = remainder_tree(sieve_product, tree)
+        return [
+            candidate
+            for candidate, remainder in zip(candidates, remainders)
+            if gcd(remainder, candidate) == 1
+        ]
+
+    @traced("prime_generator.generate_single_prime")
+    def _generate_single_prime(self, bit_length: int, rounds: int) -> int:
+        """Generate a single prime number (from batch-sieved candidates)"""
+        return self.generate_primes(1, bit_length, rounds)[0]
+
+    @traced("prime_generator.generate_safe_prime")
+    def generate_safe_prime(self, bit_length: int, rounds: int = 10) -> int:
+        """
+        Generate a safe prime p = 2q + 1 (q prime) of bit_length bits
+
+        q and 2q + 1 are sieved together over a window of consecutive odd q,
+        so only offsets where neither has a small factor survive. Survivors
+        get a base-2 Fermat check on q and then on p, and only candidates
+        passing both reach the full primality tests.
+        """
+        backend = get_backend()
+        q_bits = bit_length - 1
+
+        for _ in range(self.max_attempts):
+            start = backend.random_bits(q_bits - 1) | (1 << (q_bits - 1)) | 1
+            for q in self._safe_prime_window(start, SAFE_PRIME_WINDOW):
+                if q.bit_length() != q_bits:
+                    break
+                p = 2 * q + 1
+                if backend.powmod(2, q - 1, q) != 1 or backend.powmod(2, p - 1, p) != 1:
+                    continue
+                if backend.is_probable_prime(q, rounds) and backend.is_probable_prime(p, rounds):
+                    return p
+
+        raise RuntimeError(f"Failed to generate a safe prime after {self.max_attempts} windows")
+
+    @staticmethod
+    def _safe_prime_window(start: int, window: int) -> List[int]:
+        """
+        Odd q in [start, start + 2 * window) with no small factor in q or 2q + 1
+
+        Offset i stands for q = start + 2i. For each small prime s, q is
+        divisible by s at i = -start / 2 (mod s) and 2q + 1 at
+        i = -(2 * start + 1) / 4 (mod s); both progressions are struck out.
+        """
+        sieve = bytearray([1]) * window
+        for s in _safe_sieve_primes():
+            inverse_2 = (s + 1) // 2
+            for offset in (
+                -start * inverse_2 % s,
+                -(2 * start + 1) * inverse_2 * inverse_2 % s,
+            ):
+                if offset < window:
+                    sieve[offset::s] = bytes(len(range(offset, window, s)))
+        return [start + 2 * i for i in compress(range(window), sieve)]
+
+    @traced("prime_generator.generate_strong_prime")
+    def generate_strong_prime(self, bit_length: int, rounds: int = 10) -> int:
+        """Generate a strong prime of bit_length bits (see _strong_prime_with_factors)"""
+        return self._strong_prime_with_factors(bit_length, rounds)[0]
+
+    def _strong_prime_with_factors(self, bit_length: int, rounds: int) -> Tuple[int, int, int, int]:
+        """
+        Gordon's algorithm: p with large prime factors r | p - 1, s | p + 1, t | r - 1
+
+        Returns (p, r, s, t). s and t are random primes of about half the
+        size of p, r is the first prime 2it + 1, and p is searched in the
+        progression p0 + 2jrs, where p0 = 2 (s^(r-2) mod r) s - 1 satisfies
+        both p0 = 1 (mod r) and p0 = -1 (mod s).
+        """
+        backend = get_backend()
+        sieve_product = _sieve_primes_product()
+        half = bit_length // 2
 
-            # Skip obvious composites
-            if self._quick_composite_check(candidate):
+        for _ in range(self.max_attempts):
+            s = self._generate_single_prime(half - 8, rounds)
+            t = self._generate_single_prime(half - 16, rounds)
+
+            r = 2 * t + 1
+            while not backend.is_probable_prime(r, rounds):
+                r += 2 * t
+
+            p0 = 2 * backend.powmod(s, r - 2, r) * s - 1
+            step = 2 * r * s
+            first = -(-((1 << (bit_length - 1)) - p0) // step)
+            last = ((1 << bit_length) - 1 - p0) // step
+            if last <= first:
                 continue
 
-            if self.miller_rabin.test(candidate, rounds):
-                return candidate
+            # Start at a random point of the progression so p is not the smallest solution
+            j = first + backend.random_bits((last - first).bit_length() - 1)
+            for p in range(p0 + j * step, 1 << bit_length, step):
+                if gcd(p, sieve_product) != 1 or backend.powmod(2, p - 1, p) != 1:
+                    continue
+                if backend.is_probable_prime(p, rounds):
+                    return p, r, s, t
+
+        raise RuntimeError(f"Failed to generate a strong prime after {self.max_attempts} attempts")
+
+    @traced("prime_generator.generate_certified_prime")
+    def generate_certified_prime(self, bit_length: int, rounds: int = 10) -> PrimeCertificate:
+        """
+        Generate a provable prime with its Pocklington certificate (Shawe-Taylor)
+
+        Starts from a random prime of at most CERTIFICATE_BASE_BITS bits,
+        proven by deterministic Miller-Rabin, and climbs: each step searches
+        p = 2tq + 1 of the next size from the previous prime q, which has just
+        over half as many bits so q^2 > p, and proves p with a witness a
+        satisfying Pocklington's conditions. Composite candidates fail the
+        Fermat half of the check, so no probabilistic test is involved and
+        rounds is ignored. See core.prime_certificates.verify_certificate.
+        """
+        backend = get_backend()
+
+        sizes = [bit_length]
+        while sizes[-1] > CERTIFICATE_BASE_BITS:
+            sizes.append((sizes[-1] + 1) // 2 + 1)
+
+        base_bits = sizes.pop()
+        for _ in range(self.max_attempts):
+            base = backend.random_bits(base_bits - 1) | (1 << (base_bits - 1)) | 1
+            if is_small_prime(base):
+                break
+        else:
+            raise RuntimeError(f"Failed to generate prime after {self.max_attempts} attempts")
 
-        raise RuntimeError(f"Failed to generate prime after {self.max_attempts} attempts")
+        prime = base
+        steps: List[PocklingtonStep] = []
+        for size in reversed(sizes):
+            steps.append(self._pocklington_step(prime, size))
+            prime = steps[-1].prime
+
+        return PrimeCertificate(prime=prime, base=base, steps=steps)
+
+    def _pocklington_step(self, q: int, size: int) -> PocklingtonStep:
+        """Find and prove a prime p = 2tq + 1 of size bits, from a random t onwards"""
+        backend = get_backend()
+        source = get_random_source()
+        step = 2 * q
+
+        # step * t + 1 has exactly size bits for t in [t_min, t_max]
+        t_min = -(-((1 << (size - 1)) - 1) // step)
+        t_max = ((1 << size) - 2) // step
+        t = t_min + source.randbelow(t_max - t_min + 1)
+
+        for _ in range(self.max_attempts):
+            window = min(CERTIFICATE_WINDOW, t_max - t + 1)
+            for p in self._progression_window(step * t + 1, step, window):
+                a = source.randrange(2, p - 1)
+                z = backend.powmod(a, (p - 1) // q, p)
+                if backend.powmod(z, q, p) == 1 and gcd(z - 1, p) == 1:
+                    return PocklingtonStep(prime=p, factor=q, witness=a)
+            t = t + window if t + window <= t_max else t_min
+
+        raise RuntimeError(f"Failed to generate prime after {self.max_attempts} windows")
 
     @staticmethod
-    def _quick_composite_check(n: int) -> bool:
-        """Quick check for small prime factors"""
-        small_primes = [3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41, 43, 47]
-        return any(n % p == 0 for p in small_primes if p < n)
+    def _progression_window(start: int, step: int, window: int) -> List[int]:
+        """
+        start + i * step for i in [0, window) without a factor in _sieve_primes()
+
+        The multiples of a small prime s in the progression sit at
+        i = -start / step (mod s), so each s strikes out one slice.
+        """
+        sieve = bytearray([1]) * window
+        for s in _sieve_primes():
+            if step % s == 0:
+                continue
+            offset = -start * pow(step, -1, s) % s
+            if offset < window:
+                sieve[offset::s] = bytes(len(range(offset, window, s)))
+        return [start + step * i for i in compress(range(window), sieve)]
@@ -0,0 +1,76 @@
+import hashlib
+import json
+import os
+import tempfile
+from typing import Optional
+
+from models.crypto_models import PrimePair
+
+from .prime_certificates import certificate_from_dict, certificate_to_dict
+
+# Bumped whenever seeded generation changes its output, so stale entries become misses
+# (2: gmpy2 draws the same Miller-Rabin witnesses as the pure-Python backend;
+#  3: random primes are drawn and sieved in batches)
+MEMO_VERSION = 3
+
+
+class PrimeMemo:
+    """
+    On-disk memo of seeded prime pairs, keyed by (seed, bit_length, rounds, prime type)
+
+    Only seeded generation is deterministic (the same on every arithmetic
+    backend), so only seeded pairs are ever stored; one small JSON file per
+    key, written atomically so concurrent workers can share the directory.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+
+    def _path(self, seed: str, bit_length: int, rounds: int, prime_type: str) -> str:
+        key = f"v{MEMO_VERSION}\0{seed}\0{bit_length}\0{rounds}"
+        if prime_type != "random":
+            key += f"\0{prime_type}"
+        key = hashlib.sha256(key.encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, f"{key}.json")
+
+    def get(
+        self, seed: str, bit_length: int, rounds: int, prime_type: str = "random"
+    ) -> Optional[PrimePair]:
+        """Stored pair for the key, or None (a missing or unreadable entry is a miss)"""
+        try:
+            with open(self._path(seed, bit_length, rounds, prime_type), encoding="utf-8") as f:
+                entry = json.load(f)
+            certificates = entry.get("certificates")
+            return PrimePair(
+                p=int(entry["p"]),
+                q=int(entry["q"]),
+                bit_length=bit_length,
+                generation_time=entry["generation_time"],
+                miller_rabin_rounds=rounds,
+                prime_type=prime_type,
+                certificates=certificates and [certificate_from_dict(c) for c in certificates],
+            )
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def put(self, seed: str, prime_pair: PrimePair) -> None:
+        """Store a pair generated from seed"""
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._path(
+            seed, prime_pair.bit_length, prime_pair.miller_rabin_rounds, prime_pair.prime_type
+        )
+        entry = {
+            "p": str(prime_pair.p),
+            "q": str(prime_pair.q),
+            "generation_time": prime_pair.generation_time,
+        }
+        if prime_pair.certificates:
+            entry["certificates"] = [certificate_to_dict(c) for c in prime_pair.certificates]
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(entry, f)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
@@ -0,0 +1,123 @@
+import marshal
+import threading
+from collections import defaultdict
+from contextvars import ContextVar
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    import pstats
+
+StatsDict = Dict[tuple, tuple]
+
+
+class _RawStats:
+    """Adapter letting pstats.Stats load a stats dict produced elsewhere"""
+
+    def __init__(self, stats: StatsDict):
+        self.stats = stats
+
+    def create_stats(self) -> None:
+        pass
+
+
+class ProfileCollector:
+    """
+    Accumulates cProfile stats for one unit of work
+
+    Work may run in several threads or worker processes; each one profiles
+    itself and its stats are merged here. cProfile and pstats are imported
+    on first use, so servers that never profile do not load them.
+    """
+
+    def __init__(self):
+        self._stats: Optional["pstats.Stats"] = None
+        self._lock = threading.Lock()
+
+    def run(self, func: Callable, *args):
+        """Call func under cProfile in the current thread and collect the stats"""
+        import cProfile
+
+        profiler = cProfile.Profile()
+        try:
+            return profiler.runcall(func, *args)
+        finally:
+            profiler.create_stats()
+            self.add_stats(profiler.stats)
+
+    def add_stats(self, stats: StatsDict) -> None:
+        """Merge a raw stats dict (e.g. returned from a worker process)"""
+        if not stats:
+            return
+        import pstats
+
+        with self._lock:
+            if self._stats is None:
+                self._stats = pstats.Stats(_RawStats(stats))
+            else:
+                self._stats.add(_RawStats(stats))
+
+    @property
+    def stats(self) -> StatsDict:
+        with self._lock:
+            return dict(self._stats.stats) if self._stats is not None else {}
+
+    def pstats_bytes(self) -> bytes:
+        """Serialized stats, loadable with pstats.Stats(<file>) / snakeviz"""
+        return marshal.dumps(self.stats)
+
+    def collapsed(self, max_depth: int = 64) -> str:
+        """
+        Approximate collapsed stacks ("a;b;c <microseconds>") for flame graphs
+
+        cProfile only records caller/callee edges, so deeper frames get a share
+        of a function's time proportional to the time spent under each caller.
+        """
+        stats = self.stats
+        callees: Dict[tuple, List[Tuple[tuple, tuple]]] = defaultdict(list)
+        for func, (_, _, _, _, callers) in stats.items():
+            for caller, edge in callers.items():
+                callees[caller].append((func, edge))
+
+        weights: Dict[str, float] = defaultdict(float)
+
+        def label(func: tuple) -> str:
+            filename, line, name = func
+            return f"{name} ({filename.rsplit('/', 1)[-1]}:{line})"
+
+        def walk(func: tuple, stack: List[str], scale: float) -> None:
+            _, _, tottime, _, _ = stats[func]
+            stack = stack + [label(func)]
+            weights[";".join(stack)] += tottime * scale
+            if len(stack) >= max_depth:
+                return
+            for callee, edge in callees.get(func, []):
+                callee_total = stats[callee][3]
+                if label(callee) in stack or callee_total <= 0:
+                    continue
+                walk(callee, stack, scale * min(1.0, edge[3] / callee_total))
+
+        # Roots: functions with calls that have no recorded caller (the profiled entry point)
+        for func, (_, call_count, _, _, callers) in stats.items():
+            if sum(edge[1] for edge in callers.values()) < call_count:
+                walk(func, [], 1.0)
+
+        return "\n".join(
+            f"{stack} {round(seconds * 1e6)}"
+            for stack, seconds in sorted(weights.items())
+            if seconds > 0
+        )
+
+
+# Profile collecting the current request's work (None when not profiling)
+###########################
+active_profile: ContextVar[Optional[ProfileCollector]] = ContextVar("active_profile", default=None)
+
+
+def profiled_call(func: Callable, *args) -> Tuple[object, StatsDict]:
+    """Run func under cProfile and return (result, stats) (used in worker processes)"""
+    import cProfile
+
+    profiler = cProfile.Profile()
+    result = profiler.runcall(func, *args)
+    profiler.create_stats()
+    return result, profiler.stats
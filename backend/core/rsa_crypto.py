@@ -1,15 +1,52 @@
+import hashlib
+import hmac
+import secrets
 import time
-from typing import List, Optional, Tuple
+from typing import Iterable, Iterator, List, Optional, Sequence, Tuple
 
-from models.crypto_models import CryptoOperation, MessageBlock, PrimePair, RSAKeyPair
+from models.crypto_models import (
+    BoundKey,
+    CryptoOperation,
+    HybridPayload,
+    MessageBlock,
+    PrimePair,
+    RSAKeyPair,
+)
+
+from .arithmetic import get_backend
+from .block_cache import BlockResultCache
+from .metrics import BLOCK_SECONDS, bit_length_class, current_endpoint
+from .parallel import parallel_map_chunks, parallel_pow
+from .tracing import traced, tracer
+
+
+def _verify_chunk(items: List[Tuple[str, int, int, int]]) -> List[bool]:
+    """Verify a chunk of (message, signature, n, e) tuples (runs in a worker process)"""
+    return [RSACrypto.verify_signature(*item) for item in items]
 
 
 class RSACrypto:
     """RSA cryptographic operations"""
 
-    def __init__(self):
+    def __init__(
+        self,
+        parallel_threshold: int = 0,
+        parallel_workers: Optional[int] = None,
+        block_cache: Optional[BlockResultCache] = None,
+    ):
+        """
+        Args:
+            parallel_threshold: Minimum block count for spreading a message's blocks
+                across the process pool (0 disables parallel mode)
+            parallel_workers: Process pool size (defaults to the CPU count)
+            block_cache: Cache of recent block results for admitted keys (None disables caching)
+        """
         self.current_keypair: Optional[RSAKeyPair] = None
+        self.parallel_threshold = parallel_threshold
+        self.parallel_workers = parallel_workers
+        self.block_cache = block_cache
 
+    @traced("rsa_crypto.generate_keypair")
     def generate_keypair(self, prime_pair: PrimePair) -> RSAKeyPair:
         """Generate RSA key pair from prime pair"""
         n = prime_pair.n
@@ -32,22 +69,52 @@ class RSACrypto:
         self.current_keypair = keypair
         return keypair
 
+    def bind_key(
+        self,
+        n: int,
+        e: Optional[int] = None,
+        d: Optional[int] = None,
+        p: Optional[int] = None,
+        q: Optional[int] = None,
+    ) -> BoundKey:
+        """
+        Check key material once so it can be reused without re-validation
+
+        Precomputes the CRT parameters when d, p and q are all known; they
+        live on the returned key, so decrypt_bound neither re-checks the
+        factors nor re-derives them per call.
+
+        Raises:
+            ValueError: if the parts are inconsistent or out of range
+        """
+        if n < 2:
+            raise ValueError("Modulus must be greater than 1")
+        if e is None and d is None:
+            raise ValueError("A public or private exponent is required")
+        if any(x is not None and x < 1 for x in (e, d)):
+            raise ValueError("Exponents must be positive")
+        if (p is None) != (q is None):
+            raise ValueError("Both primes are required for CRT")
+        crt_params = None
+        if p is not None:
+            self._check_factors(n, p, q)
+            if d is not None:
+                crt_params = self._crt_params(p, q, d)
+        return BoundKey(n=n, e=e, d=d, p=p, q=q, crt_params=crt_params)
+
     def encrypt_message(self, message: str, n: int, e: int) -> CryptoOperation:
         """Encrypt a message using RSA public key"""
         start_time = time.time()
 
         try:
-            # Convert message to blocks
+            # Split message into blocks and encrypt each one
             blocks_data = self._text_to_blocks(message, n)
-            message_blocks = []
+            encrypted_data = self._pow_blocks(blocks_data, e, n, "encrypt")
 
-            for i, block_value in enumerate(blocks_data):
-                encrypted_value = pow(block_value, e, n)
-
-                block = MessageBlock(
-                    block_number=i + 1, original_value=block_value, encrypted_value=encrypted_value
-                )
-                message_blocks.append(block)
+            message_blocks = [
+                MessageBlock(block_number=i, original_value=value, encrypted_value=encrypted)
+                for i, (value, encrypted) in enumerate(zip(blocks_data, encrypted_data), start=1)
+            ]
 
             operation_time = time.time() - start_time
 
@@ -68,22 +135,49 @@ class RSACrypto:
                 error_message=str(e),
             )
 
-    def decrypt_message(self, encrypted_blocks: List[int], n: int, d: int) -> CryptoOperation:
-        """Decrypt a message using RSA private key"""
+    def decrypt_message(
+        self,
+        encrypted_blocks: List[int],
+        n: int,
+        d: int,
+        p: Optional[int] = None,
+        q: Optional[int] = None,
+    ) -> CryptoOperation:
+        """Decrypt a message using RSA private key (with CRT when p and q are supplied)"""
+        return self._decrypt(encrypted_blocks, n, d, p, q)
+
+    def decrypt_bound(self, encrypted_blocks: List[int], key: BoundKey) -> CryptoOperation:
+        """Decrypt with a key from bind_key, reusing its checked factors and CRT parameters"""
+        if key.d is None:
+            raise ValueError("Bound key has no private exponent")
+        return self._decrypt(encrypted_blocks, key.n, key.d, key.p, key.q, key.crt_params)
+
+    def _decrypt(
+        self,
+        encrypted_blocks: List[int],
+        n: int,
+        d: int,
+        p: Optional[int],
+        q: Optional[int],
+        params: Optional[Tuple[int, int, int]] = None,
+    ) -> CryptoOperation:
         start_time = time.time()
 
         try:
-            decrypted_blocks = []
-
-            for i, encrypted_value in enumerate(encrypted_blocks):
-                decrypted_value = pow(encrypted_value, d, n)
-
-                block = MessageBlock(
-                    block_number=i + 1,
-                    original_value=decrypted_value,
-                    encrypted_value=encrypted_value,
+            factors = None
+            if p is not None and q is not None:
+                # Parameters come from bind_key, which already checked the factors
+                if params is None:
+                    self._check_factors(n, p, q)
+                factors = (p, q)
+            decrypted_data = self._pow_blocks(encrypted_blocks, d, n, "decrypt", factors, params)
+
+            decrypted_blocks = [
+                MessageBlock(block_number=i, original_value=value, encrypted_value=encrypted)
+                for i, (value, encrypted) in enumerate(
+                    zip(decrypted_data, encrypted_blocks), start=1
                 )
-                decrypted_blocks.append(block)
+            ]
 
             # Convert blocks back to text
             block_values = [block.original_value for block in decrypted_blocks]
@@ -108,62 +202,374 @@ class RSACrypto:
                 error_message=str(e),
             )
 
+    def encrypt_hybrid(self, message: str, n: int, e: int) -> CryptoOperation:
+        """
+        Encrypt a message with a single RSA operation (KEM + symmetric cipher)
+
+        A random seed below n is RSA-encrypted; keys derived from it drive a
+        SHAKE-256 keystream for the payload and an HMAC-SHA256 tag, so the
+        RSA cost no longer depends on message length.
+        """
+        start_time = time.time()
+
+        try:
+            if n < 4:
+                raise ValueError("Modulus too small for hybrid mode")
+
+            seed = secrets.randbelow(n - 2) + 2
+            encapsulated_key = get_backend().powmod(seed, e, n)
+            enc_key, mac_key = self._derive_hybrid_keys(seed, n)
+
+            ciphertext = self._xor_keystream(message.encode("utf-8"), enc_key)
+            tag = self._hybrid_tag(mac_key, encapsulated_key, ciphertext, n)
+
+            operation_time = time.time() - start_time
+
+            return CryptoOperation(
+                success=True,
+                message="Successfully encrypted message with 1 RSA operation",
+                blocks=[],
+                operation_time=operation_time,
+                payload=HybridPayload(
+                    encapsulated_key=encapsulated_key, ciphertext=ciphertext, tag=tag
+                ),
+            )
+
+        except Exception as e:
+            operation_time = time.time() - start_time
+            return CryptoOperation(
+                success=False,
+                message="Encryption failed",
+                blocks=[],
+                operation_time=operation_time,
+                error_message=str(e),
+            )
+
+    def decrypt_hybrid(self, payload: HybridPayload, n: int, d: int) -> CryptoOperation:
+        """Decrypt and authenticate a hybrid ciphertext produced by encrypt_hybrid"""
+        start_time = time.time()
+
+        try:
+            seed = get_backend().powmod(payload.encapsulated_key, d, n)
+            enc_key, mac_key = self._derive_hybrid_keys(seed, n)
+
+            expected_tag = self._hybrid_tag(
+                mac_key, payload.encapsulated_key, payload.ciphertext, n
+            )
+            if not hmac.compare_digest(expected_tag, payload.tag):
+                raise ValueError("Authentication tag mismatch")
+
+            plaintext = self._xor_keystream(payload.ciphertext, enc_key)
+            operation_time = time.time() - start_time
+
+            return CryptoOperation(
+                success=True,
+                message=plaintext.decode("utf-8"),
+                blocks=[],
+                operation_time=operation_time,
+                payload=payload,
+            )
+
+        except Exception as e:
+            operation_time = time.time() - start_time
+            return CryptoOperation(
+                success=False,
+                message="Decryption failed",
+                blocks=[],
+                operation_time=operation_time,
+                error_message=str(e),
+            )
+
+    def sign_message(
+        self, message: str, n: int, d: int, p: Optional[int] = None, q: Optional[int] = None
+    ) -> int:
+        """
+        Sign the SHA-256 digest of a message with the private key
+
+        When the prime factors are supplied the signature is computed with the
+        Chinese Remainder Theorem (two half-size exponentiations).
+        """
+        if n < 2:
+            raise ValueError("Modulus must be greater than 1")
+        if d < 1:
+            raise ValueError("Private exponent must be positive")
+        digest = self._message_digest(message, n)
+        powmod = get_backend().powmod
+
+        if p is None or q is None:
+            return powmod(digest, d, n)
+        self._check_factors(n, p, q)
+
+        return self._crt_pow(digest, d, p, q)
+
+    @staticmethod
+    def verify_signature(message: str, signature: int, n: int, e: int) -> bool:
+        """Verify a signature produced by sign_message against a public key"""
+        if not 0 <= signature < n:
+            return False
+        return get_backend().powmod(signature, e, n) == RSACrypto._message_digest(message, n)
+
+    def verify_batch(self, items: Sequence[Tuple[str, int, int, int]]) -> List[bool]:
+        """
+        Verify many (message, signature, n, e) tuples
+
+        Large batches are spread across the process pool; results keep the
+        order of items.
+        """
+        if self.parallel_threshold and len(items) >= self.parallel_threshold:
+            return parallel_map_chunks(_verify_chunk, items, workers=self.parallel_workers)
+        return _verify_chunk(list(items))
+
+    @staticmethod
+    def _message_digest(message: str, n: int) -> int:
+        """SHA-256 digest of a message as an integer below n"""
+        digest = hashlib.sha256(message.encode("utf-8")).digest()
+        return int.from_bytes(digest, byteorder="big") % n
+
+    @staticmethod
+    def _check_factors(n: int, p: int, q: int) -> None:
+        """Raise ValueError unless p and q are a nontrivial factorization of n"""
+        if not (1 < p < n and 1 < q < n):
+            raise ValueError("Primes must be greater than 1 and less than the modulus")
+        if p * q != n:
+            raise ValueError("p * q does not match the modulus")
+
+    @staticmethod
+    def _crt_params(p: int, q: int, d: int) -> Tuple[int, int, int]:
+        """CRT exponents and coefficient (d mod p-1, d mod q-1, q^-1 mod p)"""
+        return d % (p - 1), d % (q - 1), get_backend().invert(q, p)
+
+    @staticmethod
+    def _crt_pow(
+        value: int, d: int, p: int, q: int, params: Optional[Tuple[int, int, int]] = None
+    ) -> int:
+        """
+        value^d mod pq from two half-size exponentiations (Garner recombination)
+
+        Loops over many blocks pass params from _crt_params so they are derived
+        once per call rather than once per block; nothing is kept between calls.
+        """
+        powmod = get_backend().powmod
+        dp, dq, q_inv = params or RSACrypto._crt_params(p, q, d)
+        m1 = powmod(value, dp, p)
+        m2 = powmod(value, dq, q)
+        h = (q_inv * (m1 - m2)) % p
+        return m2 + h * q
+
+    def iter_encrypt(
+        self, chunks: Iterable[bytes], n: int, e: int, start: int = 1
+    ) -> Iterator[MessageBlock]:
+        """
+        Lazily encrypt a stream of byte chunks block by block
+
+        Chunks may have any size; they are re-split into key-sized blocks so only
+        one partial block is ever buffered.
+
+        Args:
+            chunks: Iterable of raw message bytes
+            n: RSA modulus
+            e: RSA public exponent
+            start: Block number assigned to the first yielded block
+
+        Yields:
+            Encrypted message blocks in message order
+        """
+        block_size = self.block_size(n)
+        block_seconds = self._block_timer("encrypt", n)
+        block_number = start
+        buffer = bytearray()
+
+        def encrypt_block(chunk: bytes) -> MessageBlock:
+            block_start = time.perf_counter()
+            block_value = self._bytes_to_block(chunk, n)
+            encrypted_value = get_backend().powmod(block_value, e, n)
+            block_seconds.observe(time.perf_counter() - block_start)
+            return MessageBlock(
+                block_number=block_number,
+                original_value=block_value,
+                encrypted_value=encrypted_value,
+            )
+
+        for chunk in chunks:
+            buffer += chunk
+            offset = 0
+            while len(buffer) - offset >= block_size:
+                yield encrypt_block(buffer[offset : offset + block_size])
+                block_number += 1
+                offset += block_size
+            del buffer[:offset]
+
+        if buffer:
+            yield encrypt_block(buffer)
+
+    def iter_decrypt(
+        self, encrypted_blocks: Iterable[int], n: int, d: int, start: int = 1
+    ) -> Iterator[MessageBlock]:
+        """
+        Lazily decrypt a stream of encrypted blocks
+
+        Args:
+            encrypted_blocks: Iterable of encrypted block values
+            n: RSA modulus
+            d: RSA private exponent
+            start: Block number assigned to the first yielded block
+
+        Yields:
+            Decrypted message blocks in message order
+        """
+        block_seconds = self._block_timer("decrypt", n)
+
+        for i, encrypted_value in enumerate(encrypted_blocks, start=start):
+            block_start = time.perf_counter()
+            decrypted_value = get_backend().powmod(encrypted_value, d, n)
+            block_seconds.observe(time.perf_counter() - block_start)
+            yield MessageBlock(
+                block_number=i, original_value=decrypted_value, encrypted_value=encrypted_value
+            )
+
+    def _pow_blocks(
+        self,
+        values: List[int],
+        exponent: int,
+        n: int,
+        operation: str,
+        factors: Optional[Tuple[int, int]] = None,
+        params: Optional[Tuple[int, int, int]] = None,
+    ) -> List[int]:
+        """Apply the RSA permutation to every block, reusing cached results where possible"""
+        if self.block_cache is None or not self.block_cache.admits((n, exponent)):
+            return self._compute_blocks(values, exponent, n, operation, factors, params)
+
+        results = self.block_cache.lookup((n, exponent), values)
+        missing = [i for i, result in enumerate(results) if result is None]
+        if missing:
+            # Repeated blocks within one message are computed once
+            pending = list(dict.fromkeys(values[i] for i in missing))
+            computed = self._compute_blocks(pending, exponent, n, operation, factors, params)
+            self.block_cache.store((n, exponent), pending, computed)
+            fresh = dict(zip(pending, computed))
+            for i in missing:
+                results[i] = fresh[values[i]]
+        return results
+
+    def _compute_blocks(
+        self,
+        values: List[int],
+        exponent: int,
+        n: int,
+        operation: str,
+        factors: Optional[Tuple[int, int]] = None,
+        params: Optional[Tuple[int, int, int]] = None,
+    ) -> List[int]:
+        """
+        Exponentiate every block, in parallel for large messages
+
+        With the factors of n, serial blocks use CRT (with params when the
+        caller already derived them); parallel chunks use the plain
+        exponentiation the pool workers already implement.
+        """
+        block_seconds = self._block_timer(operation, n)
+        parallel = bool(self.parallel_threshold) and len(values) >= self.parallel_threshold
+
+        with tracer.span(
+            "rsa_crypto.block_loop", operation=operation, blocks=len(values), parallel=parallel
+        ):
+            if parallel:
+                start = time.perf_counter()
+                results = parallel_pow(values, exponent, n, self.parallel_workers)
+                block_seconds.observe(
+                    (time.perf_counter() - start) / len(values), count=len(values)
+                )
+                return results
+
+            results = []
+            powmod = get_backend().powmod
+            if factors is not None and params is None:
+                params = self._crt_params(*factors, exponent)
+            for value in values:
+                start = time.perf_counter()
+                if factors is None:
+                    results.append(powmod(value, exponent, n))
+                else:
+                    results.append(self._crt_pow(value, exponent, *factors, params))
+                block_seconds.observe(time.perf_counter() - start)
+            return results
+
+    @staticmethod
+    def _block_timer(operation: str, n: int):
+        """Per-block timing histogram for this operation and key size"""
+        return BLOCK_SECONDS.labels(
+            operation=operation,
+            bit_length=bit_length_class(n.bit_length()),
+            endpoint=current_endpoint.get(),
+        )
+
+    @staticmethod
+    def _derive_hybrid_keys(seed: int, n: int) -> Tuple[bytes, bytes]:
+        """Derive the keystream key and MAC key from a KEM seed"""
+        seed_bytes = seed.to_bytes((n.bit_length() + 7) // 8, byteorder="big")
+        material = hashlib.shake_256(b"rsa-kem-v1" + seed_bytes).digest(64)
+        return material[:32], material[32:]
+
+    @staticmethod
+    def _xor_keystream(data: bytes, key: bytes) -> bytes:
+        """XOR data with a SHAKE-256 keystream (encryption and decryption alike)"""
+        if not data:
+            return b""
+        keystream = hashlib.shake_256(key).digest(len(data))
+        mixed = int.from_bytes(data, byteorder="big") ^ int.from_bytes(keystream, byteorder="big")
+        return mixed.to_bytes(len(data), byteorder="big")
+
+    @staticmethod
+    def _hybrid_tag(mac_key: bytes, encapsulated_key: int, ciphertext: bytes, n: int) -> bytes:
+        """HMAC-SHA256 over the encapsulated key and ciphertext"""
+        key_bytes = encapsulated_key.to_bytes((n.bit_length() + 7) // 8, byteorder="big")
+        return hmac.new(mac_key, key_bytes + ciphertext, hashlib.sha256).digest()
+
+    @staticmethod
+    def block_size(n: int) -> int:
+        """Number of plaintext bytes that safely fit in one block for modulus n"""
+        return max(1, (n.bit_length() - 1) // 8)
+
+    @staticmethod
+    def block_to_bytes(block: int) -> bytes:
+        """Convert a single decrypted block back to its plaintext bytes"""
+        if block == 0:
+            return b""
+        return block.to_bytes((block.bit_length() + 7) // 8, byteorder="big")
+
+    @staticmethod
+    def _bytes_to_block(chunk: bytes, n: int) -> int:
+        """Convert one plaintext chunk to an integer block smaller than n"""
+        block_value = int.from_bytes(chunk, byteorder="big")
+        if block_value >= n:
+            raise ValueError(f"Block too large for key size: {block_value} >= {n}")
+        return block_value
+
     def _text_to_blocks(self, text: str, n: int) -> List[int]:
         """Convert text to integer blocks smaller than n"""
-        n_bits = n.bit_length()
-        block_size = max(1, (n_bits - 1) // 8)  # Safe block size in bytes
+        block_size = self.block_size(n)  # Safe block size in bytes
 
         blocks = []
         text_bytes = text.encode("utf-8")
 
         for i in range(0, len(text_bytes), block_size):
             chunk = text_bytes[i : i + block_size]
-            block_value = int.from_bytes(chunk, byteorder="big")
-
-            if block_value >= n:
-                raise ValueError(f"Block too large for key size: {block_value} >= {n}")
-
-            blocks.append(block_value)
+            blocks.append(self._bytes_to_block(chunk, n))
 
         return blocks
 
     def _blocks_to_text(self, blocks: List[int]) -> str:
         """Convert integer blocks back to text"""
-        result_bytes = b""
-
-        for block in blocks:
-            if block == 0:
-                continue
-
-            byte_length = (block.bit_length() + 7) // 8
-            block_bytes = block.to_bytes(byte_length, byteorder="big")
-            result_bytes += block_bytes
-
+        result_bytes = b"".join(self.block_to_bytes(block) for block in blocks)
         return result_bytes.decode("utf-8")
 
     @staticmethod
     def _gcd(a: int, b: int) -> int:
-        """Greatest Common Divisor using Euclidean algorithm"""
-        while b:
-            a, b = b, a % b
-        return a
-
-    @staticmethod
-    def _extended_gcd(a: int, b: int) -> Tuple[int, int, int]:
-        """Extended Euclidean Algorithm"""
-        if a == 0:
-            return b, 0, 1
-
-        gcd, x1, y1 = RSACrypto._extended_gcd(b % a, a)
-        x = y1 - (b // a) * x1
-        y = x1
-
-        return gcd, x, y
+        """Greatest Common Divisor (arithmetic backend)"""
+        return get_backend().gcd(a, b)
 
     @staticmethod
     def _mod_inverse(a: int, m: int) -> int:
-        """Modular multiplicative inverse using Extended Euclidean Algorithm"""
-        gcd, x, _ = RSACrypto._extended_gcd(a, m)
-        if gcd != 1:
-            raise ValueError("Modular inverse does not exist")
-        return (x % m + m) % m
+        """Modular multiplicative inverse (arithmetic backend)"""
+        return get_backend().invert(a, m)
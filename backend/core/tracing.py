@@ -0,0 +1,189 @@
+import functools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass, field
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+# (trace_id, span_id) of a span, passed to worker processes as plain data
+TraceContext = Tuple[str, str]
+
+
+@dataclass
+class Span:
+    """A timed operation within a trace"""
+
+    name: str
+    trace_id: str
+    span_id: str
+    parent_id: Optional[str] = None
+    start_time: float = field(default_factory=time.time)
+    end_time: Optional[float] = None
+    attributes: Dict[str, object] = field(default_factory=dict)
+    status: str = "ok"
+    thread: str = field(default_factory=lambda: threading.current_thread().name)
+    pid: int = field(default_factory=os.getpid)
+
+    @property
+    def duration(self) -> float:
+        return (self.end_time or time.time()) - self.start_time
+
+    @property
+    def context(self) -> TraceContext:
+        return (self.trace_id, self.span_id)
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+class SpanExporter:
+    """Destination for finished spans"""
+
+    def export(self, spans: List[Span]) -> None:
+        raise NotImplementedError
+
+
+class InMemoryExporter(SpanExporter):
+    """Keeps finished spans in a list (for tests)"""
+
+    def __init__(self):
+        self.spans: List[Span] = []
+        self._lock = threading.Lock()
+
+    def export(self, spans: List[Span]) -> None:
+        with self._lock:
+            self.spans.extend(spans)
+
+    def clear(self) -> None:
+        with self._lock:
+            self.spans.clear()
+
+    def by_name(self, name: str) -> List[Span]:
+        return [span for span in self.spans if span.name == name]
+
+
+class JsonFileExporter(SpanExporter):
+    """Appends finished spans to a file, one JSON object per line"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def export(self, spans: List[Span]) -> None:
+        lines = "".join(json.dumps(span.to_dict(), default=str) + "\n" for span in spans)
+        with self._lock, open(self.path, "a", encoding="utf-8") as f:
+            f.write(lines)
+
+
+# Span active in the current context (thread / task)
+###########################
+current_span: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+
+
+class Tracer:
+    """
+    Creates spans and hands them to the exporter when they finish
+
+    With no exporter configured, span() is a no-op so instrumentation costs
+    almost nothing.
+    """
+
+    def __init__(self, exporter: Optional[SpanExporter] = None):
+        self.exporter = exporter
+
+    @property
+    def enabled(self) -> bool:
+        return self.exporter is not None
+
+    @contextmanager
+    def span(self, name: str, **attributes) -> Iterator[Optional[Span]]:
+        """Open a child of the current span (or a new trace) for the enclosed block"""
+        if self.exporter is None:
+            yield None
+            return
+
+        parent = current_span.get()
+        span = Span(
+            name=name,
+            trace_id=parent.trace_id if parent else os.urandom(16).hex(),
+            span_id=os.urandom(8).hex(),
+            parent_id=parent.span_id if parent else None,
+            attributes=attributes,
+        )
+        token = current_span.set(span)
+        try:
+            yield span
+        except BaseException as exc:
+            span.status = f"error: {type(exc).__name__}"
+            raise
+        finally:
+            current_span.reset(token)
+            span.end_time = time.time()
+            self.exporter.export([span])
+
+    def current_context(self) -> Optional[TraceContext]:
+        """Context to hand to another process so its spans join this trace"""
+        span = current_span.get()
+        return span.context if span is not None and self.enabled else None
+
+
+tracer = Tracer()
+
+
+def traced(name: str) -> Callable:
+    """Decorator wrapping every call of a function in a span"""
+
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not tracer.enabled:
+                return func(*args, **kwargs)
+            with tracer.span(name):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def run_in_remote_span(
+    context: TraceContext, name: str, func: Callable, *args
+) -> Tuple[object, List[dict]]:
+    """
+    Run func in a span parented to a span from another process
+
+    Used inside worker processes; returns (result, finished spans as dicts)
+    so the parent process can export them.
+    """
+    # Worker processes run one task at a time, so the global tracer can be borrowed
+    exporter = InMemoryExporter()
+    previous_exporter, tracer.exporter = tracer.exporter, exporter
+    parent = Span(name="remote-parent", trace_id=context[0], span_id=context[1])
+
+    token = current_span.set(parent)
+    try:
+        with tracer.span(name):
+            result = func(*args)
+    finally:
+        current_span.reset(token)
+        tracer.exporter = previous_exporter
+    return result, [span.to_dict() for span in exporter.spans]
+
+
+def export_remote_spans(spans: List[dict]) -> None:
+    """Export spans returned by run_in_remote_span through the local tracer"""
+    if tracer.exporter is not None and spans:
+        tracer.exporter.export([Span(**span) for span in spans])
+
+
+def configure_tracing(exporter_name: str, trace_file: str) -> None:
+    """Select the exporter from settings ("" disables tracing, "json" writes trace_file)"""
+    if exporter_name == "json":
+        tracer.exporter = JsonFileExporter(trace_file)
+    elif exporter_name == "memory":
+        tracer.exporter = InMemoryExporter()
+    else:
+        tracer.exporter = None
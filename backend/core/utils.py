@@ -1,14 +1,116 @@
-from typing import Dict
+import logging
+import threading
+import time
+from typing import Callable, Dict, Optional
 
-import psutil
+logger = logging.getLogger(__name__)
+
+
+class SystemMetricsSampler:
+    """
+    Samples system and process stats on a fixed interval
+
+    Health checks read the latest snapshot instead of calling psutil on the
+    event loop. Other modules register extra process-level sources (executor
+    backlog, pool levels) with add_source; they are sampled with the rest.
+    Without the background thread, snapshot() refreshes inline at most once
+    per interval. psutil is imported on the first sample, not at import, so
+    worker boot does not pay for it.
+    """
+
+    def __init__(self, interval: float = 1.0):
+        self.interval = interval
+        self._sources: Dict[str, Callable[[], object]] = {}
+        self._snapshot: Dict[str, object] = {}
+        self._sampled_at = 0.0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._process = None
+
+    def add_source(self, name: str, func: Callable[[], object]) -> None:
+        """Sample func() under name alongside the built-in stats"""
+        self._sources[name] = func
+
+    def sample(self) -> Dict[str, object]:
+        """Take a fresh sample and make it the current snapshot"""
+        import psutil
+
+        if self._process is None:
+            self._process = psutil.Process()
+        memory = psutil.virtual_memory()
+        with self._process.oneshot():
+            snapshot = {
+                # Non-blocking: utilisation since the previous sample
+                "cpu_percent": psutil.cpu_percent(interval=None),
+                "memory_percent": memory.percent,
+                "available_memory_mb": memory.available // 1024 // 1024,
+                "process_cpu_percent": self._process.cpu_percent(interval=None),
+                "process_rss_mb": self._process.memory_info().rss // 1024 // 1024,
+                "process_threads": self._process.num_threads(),
+            }
+        for name, func in list(self._sources.items()):
+            snapshot[name] = func()
+
+        with self._lock:
+            self._snapshot = snapshot
+            self._sampled_at = time.monotonic()
+        return snapshot
+
+    def snapshot(self) -> Dict[str, object]:
+        """Latest sample (with its age in seconds); blocks only until the first sample"""
+        with self._lock:
+            snapshot, sampled_at = self._snapshot, self._sampled_at
+        stale = self._thread is None and time.monotonic() - sampled_at >= self.interval
+        if stale or not snapshot:
+            snapshot, sampled_at = self.sample(), time.monotonic()
+        return {**snapshot, "sample_age_seconds": round(time.monotonic() - sampled_at, 3)}
+
+    def start(self) -> None:
+        """Start the background sampling thread"""
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="system-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the background sampling thread"""
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+
+    def _run(self) -> None:
+        # The first sample is taken here rather than in start() to keep it off worker boot
+        interval = 0.0
+        while not self._stop.wait(interval):
+            interval = self.interval
+            try:
+                self.sample()
+            except Exception:
+                # Keep serving the previous snapshot rather than losing the sampler
+                logger.exception("System metrics sample failed")
+
+
+system_sampler = SystemMetricsSampler()
 
 
 def get_system_info() -> Dict[str, str]:
-    """Get system information for health checks"""
+    """Get system information for health checks (from the cached sample)"""
+    info = system_sampler.snapshot()
     return {
-        "cpu_percent": f"{psutil.cpu_percent()}%",
-        "memory_percent": f"{psutil.virtual_memory().percent}%",
-        "available_memory": f"{psutil.virtual_memory().available // 1024 // 1024} MB",
+        "cpu_percent": f"{info['cpu_percent']}%",
+        "memory_percent": f"{info['memory_percent']}%",
+        "available_memory": f"{info['available_memory_mb']} MB",
+        "process_cpu_percent": f"{info['process_cpu_percent']}%",
+        "process_rss": f"{info['process_rss_mb']} MB",
+        **{
+            name: str(value)
+            for name, value in info.items()
+            if not name.endswith(("_percent", "_mb"))
+        },
     }
 
 
@@ -14,8 +14,22 @@ from fastapi.responses import JSONResponse
 
 # project imports
 #################################
+from api.endpoints import metrics
+from api.profiling import (
+    PROFILE_HEADER,
+    RequestProfile,
+    profile_store,
+    profiling_allowed,
+)
 from api.router import api_router
+from api.timing import RequestTimings, current_timings
 from config.settings import settings
+from core.arithmetic import configure_arithmetic, get_backend
+from core.entropy import EntropyPool, set_random_source
+from core.parallel import shutdown_process_pool
+from core.profiling import active_profile
+from core.tracing import configure_tracing, tracer
+from core.utils import system_sampler
 from models.schemas import ErrorResponse
 
 # Logging configs
@@ -24,6 +38,17 @@ from models.schemas import ErrorResponse
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Tracing exporter
+####################################################
+####################################################
+configure_tracing(settings.trace_exporter, settings.trace_file)
+
+# Arithmetic backend and randomness source
+####################################################
+####################################################
+configure_arithmetic(settings.arithmetic_backend)
+set_random_source(EntropyPool(settings.entropy_pool_bytes))
+
 
 # App life-span
 ####################################################
@@ -34,9 +59,14 @@ async def lifespan(app: FastAPI):
     logger.info("Starting RSA Cryptography API")
     logger.info(f"Environment: {'Development' if settings.debug else 'Production'}")
     logger.info(f"Max prime bit length: {settings.max_prime_bit_length}")
+    logger.info(f"Arithmetic backend: {get_backend().name}")
+    system_sampler.interval = settings.system_sample_interval
+    system_sampler.start()
     yield
     # Shutdown
     logger.info("Shutting down RSA Cryptography API")
+    system_sampler.stop()
+    shutdown_process_pool()
 
 
 # Main App
@@ -110,6 +140,7 @@ async def general_exception_handler(request, exc):
 # Adding Router
 #################################
 app.include_router(api_router)
+app.include_router(metrics.router)
 
 
 # Root endpoint
@@ -129,6 +160,7 @@ async def root():
             "key_generation": "/api/keys/generate",
             "encryption": "/api/crypto/encrypt",
             "decryption": "/api/crypto/decrypt",
+            "metrics": "/metrics",
         },
     }
 
@@ -138,9 +170,34 @@ async def root():
 @app.middleware("http")
 async def add_process_time_header(request, call_next):
     start_time = time.time()
-    response = await call_next(request)
+    timings = RequestTimings()
+    current_timings.set(timings)
+
+    # Opt-in cProfile of the request's executor work
+    profile = None
+    if profiling_allowed(request.headers.get(PROFILE_HEADER)):
+        profile = RequestProfile(method=request.method, path=request.url.path)
+        active_profile.set(profile.collector)
+
+    with tracer.span(f"HTTP {request.method} {request.url.path}", method=request.method) as span:
+        response = await call_next(request)
+        if span is not None:
+            span.attributes["status_code"] = response.status_code
     process_time = time.time() - start_time
     response.headers["X-Process-Time"] = str(process_time)
+
+    if profile is not None:
+        profile.duration = process_time
+        profile_store.add(profile)
+        response.headers["X-Profile-Id"] = profile.profile_id
+
+    # Phase breakdown (parse, decode, queue, compute, encode) as header and log fields
+    phases = timings.finish()
+    response.headers["Server-Timing"] = RequestTimings.server_timing_header(phases)
+    logger.info(
+        f"{request.method} {request.url.path} {response.status_code} {phases['total']}ms",
+        extra={"path": request.url.path, "status": response.status_code, "server_timing": phases},
+    )
     return response
 
 
@@ -1,5 +1,34 @@
+import hashlib
 from dataclasses import dataclass
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
+
+
+def modulus_fingerprint(n: int) -> str:
+    """Short key ID derived from a modulus (SHA-256, first 16 hex digits)"""
+    n_bytes = n.to_bytes((n.bit_length() + 7) // 8, byteorder="big")
+    return hashlib.sha256(n_bytes).hexdigest()[:16]
+
+
+@dataclass
+class PocklingtonStep:
+    """One link of a certificate: prime proven from a prime factor of prime - 1"""
+
+    prime: int
+    factor: int  # Prime factor of prime - 1, larger than sqrt(prime)
+    witness: int  # Base satisfying Pocklington's conditions
+
+
+@dataclass
+class PrimeCertificate:
+    """Pocklington certificate chain from a small, directly checked prime up to prime"""
+
+    prime: int
+    base: int
+    steps: List[PocklingtonStep]
+
+    @property
+    def bit_length(self) -> int:
+        return self.prime.bit_length()
 
 
 @dataclass
@@ -11,6 +40,8 @@ class PrimePair:
     bit_length: int
     generation_time: float
     miller_rabin_rounds: int
+    prime_type: str = "random"
+    certificates: Optional[List[PrimeCertificate]] = None  # for provable primes
 
     def __post_init__(self):
         if self.p == self.q:
@@ -48,6 +79,11 @@ class RSAKeyPair:
         """Return private key as (n, d)"""
         return (self.n, self.d)
 
+    @property
+    def fingerprint(self) -> str:
+        """Short key ID derived from the modulus (SHA-256, first 16 hex digits)"""
+        return modulus_fingerprint(self.n)
+
     def validate_key_pair(self) -> bool:
         """Validate that the key pair is mathematically correct"""
         try:
@@ -64,6 +100,27 @@ class RSAKeyPair:
             return False
 
 
+@dataclass
+class BoundKey:
+    """Key material parsed and checked once for repeated use (e.g. by a WebSocket session)"""
+
+    n: int
+    e: Optional[int] = None  # None: the session cannot encrypt
+    d: Optional[int] = None  # None: the session cannot decrypt
+    p: Optional[int] = None  # With q, enables CRT decryption
+    q: Optional[int] = None
+    # (d mod p-1, d mod q-1, q^-1 mod p), derived once at bind time for this key only
+    crt_params: Optional[Tuple[int, int, int]] = None
+
+    @property
+    def crt(self) -> bool:
+        return self.p is not None and self.q is not None
+
+    @property
+    def fingerprint(self) -> str:
+        return modulus_fingerprint(self.n)
+
+
 @dataclass
 class MessageBlock:
     """Represents a message block for encryption/decryption"""
@@ -83,6 +140,23 @@ class MessageBlock:
         return hex(self.encrypted_value)
 
 
+@dataclass
+class HybridPayload:
+    """Represents a hybrid (KEM + symmetric) ciphertext"""
+
+    encapsulated_key: int  # RSA-encrypted seed
+    ciphertext: bytes
+    tag: bytes  # HMAC-SHA256 over encapsulated key and ciphertext
+
+    @property
+    def ciphertext_hex(self) -> str:
+        return self.ciphertext.hex()
+
+    @property
+    def tag_hex(self) -> str:
+        return self.tag.hex()
+
+
 @dataclass
 class CryptoOperation:
     """Represents the result of a cryptographic operation"""
@@ -92,3 +166,40 @@ class CryptoOperation:
     blocks: List[MessageBlock]
     operation_time: float
     error_message: Optional[str] = None
+    payload: Optional[HybridPayload] = None
+
+
+@dataclass
+class SharedFactorGroup:
+    """Keys whose moduli share at least one prime factor"""
+
+    key_ids: List[str]
+    duplicate_modulus: bool = False
+
+
+@dataclass
+class SharedFactorAudit:
+    """Represents the result of a batch GCD audit"""
+
+    moduli_checked: int
+    groups: List[SharedFactorGroup]
+    audit_time: float
+
+    @property
+    def vulnerable_key_ids(self) -> List[str]:
+        return [key_id for group in self.groups for key_id in group.key_ids]
+
+
+@dataclass
+class FactorizationResult:
+    """Represents the result of a weak-key factorization attempt"""
+
+    n: int
+    factors: Optional[Tuple[int, int]]
+    method: Optional[str]  # Method that found the factors
+    elapsed: float
+    outcomes: Dict[str, str]  # Method name -> found / exhausted / timeout / cancelled / error
+
+    @property
+    def factored(self) -> bool:
+        return self.factors is not None
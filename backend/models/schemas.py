@@ -1,9 +1,14 @@
-from typing import Dict, List, Optional
+from typing import Annotated, Dict, List, Literal, Optional, Union
 
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, Field, field_validator, model_validator
 
 from config.settings import settings
 
+PrimeType = Literal["random", "safe", "strong", "provable"]
+
+# Decimal integer strings (2500 digits is about 8300 bits)
+DecimalInt = Annotated[str, Field(pattern=r"^[0-9]+$", max_length=2500)]
+
 
 class PrimeGenerationRequest(BaseModel):
     bit_length: int = Field(
@@ -18,6 +23,19 @@ class PrimeGenerationRequest(BaseModel):
         le=settings.max_miller_rabin_rounds,
         description="Number of Miller-Rabin test rounds",
     )
+    seed: Optional[str] = Field(
+        default=None,
+        min_length=1,
+        max_length=256,
+        description="Deterministic generation seed (reproducible demos/tests only; not secret)",
+    )
+    prime_type: PrimeType = Field(
+        default="random",
+        description=(
+            "random, safe (p = 2q + 1 with q prime), strong (Gordon) or provable primes; "
+            f"safe primes are limited to {settings.max_safe_prime_bit_length} bits"
+        ),
+    )
 
     @field_validator("bit_length")
     def validate_bit_length(cls, v):
@@ -25,6 +43,37 @@ class PrimeGenerationRequest(BaseModel):
             raise ValueError("Bit length should be divisible by 8")
         return v
 
+    @model_validator(mode="after")
+    def validate_safe_prime_size(self):
+        # Safe primes need both p and (p - 1) / 2 prime; large ones take minutes
+        if self.prime_type == "safe" and self.bit_length > settings.max_safe_prime_bit_length:
+            raise ValueError(
+                f"Safe primes are limited to {settings.max_safe_prime_bit_length} bits"
+            )
+        return self
+
+
+class PocklingtonStepModel(BaseModel):
+    prime: DecimalInt
+    factor: DecimalInt = Field(description="Prime factor of prime - 1 larger than sqrt(prime)")
+    witness: DecimalInt
+
+
+class PrimeCertificateModel(BaseModel):
+    prime: DecimalInt = Field(description="Certified prime")
+    base: DecimalInt = Field(description="Small prime the chain starts from")
+    steps: List[PocklingtonStepModel] = Field(
+        max_length=64, description="Pocklington steps, smallest prime first"
+    )
+
+
+class CertificateVerificationResponse(BaseModel):
+    valid: bool
+    bit_length: int = Field(description="Bit length of the certified prime")
+    steps: int
+    reason: Optional[str] = Field(default=None, description="First failed condition")
+    verification_time: float
+
 
 class PrimeGenerationResponse(BaseModel):
     p: str = Field(description="First generated prime")
@@ -32,6 +81,11 @@ class PrimeGenerationResponse(BaseModel):
     generation_time: float = Field(description="Time taken to generate primes in seconds")
     bit_length: int = Field(description="Actual bit length of generated primes")
     miller_rabin_rounds: int = Field(description="Number of Miller-Rabin rounds used")
+    seed: Optional[str] = Field(default=None, description="Seed the primes were derived from")
+    prime_type: PrimeType = Field(default="random", description="Kind of primes generated")
+    certificates: Optional[List[PrimeCertificateModel]] = Field(
+        default=None, description="Pocklington certificates for p and q (provable primes)"
+    )
 
 
 class RSAParameters(BaseModel):
@@ -55,12 +109,40 @@ class RSAKeysResponse(BaseModel):
     public_key: PublicKey
     private_key: PrivateKey
     parameters: RSAParameters
+    key_id: Optional[str] = Field(default=None, description="Key fingerprint in the key store")
+
+
+KeyType = Literal["public", "private"]
+KeyFormat = Literal["pem", "der"]
+
+
+class KeyImportRequest(BaseModel):
+    key: str = Field(
+        min_length=1,
+        max_length=20000,
+        description="PKCS#1 RSA key as PEM, or its DER encoded as base64",
+    )
+
+
+class KeyImportResponse(BaseModel):
+    key_id: str = Field(description="Key fingerprint (private keys join the key store)")
+    key_type: KeyType
+    bit_length: int = Field(description="Bit length of the modulus")
+    public_key: PublicKey
+    cached: bool = Field(description="Whether the key was already parsed")
+
+
+CryptoMode = Literal["textbook", "hybrid"]
 
 
 class EncryptionRequest(BaseModel):
     message: str = Field(min_length=1, max_length=10000, description="Message to encrypt")
     n: str = Field(description="RSA modulus")
     e: str = Field(description="RSA public exponent")
+    mode: CryptoMode = Field(
+        default="textbook",
+        description="textbook: RSA per block; hybrid: one RSA operation + SHAKE-256/HMAC",
+    )
 
     # @field_validator("n", "e")
     # def validate_key_components(cls, v):
@@ -84,12 +166,18 @@ class EncryptionResponse(BaseModel):
     block_info: List[BlockInfo]
     total_blocks: int
     message_length: int
+    mode: CryptoMode = "textbook"
+    ciphertext: Optional[str] = Field(default=None, description="Hybrid mode ciphertext (hex)")
+    tag: Optional[str] = Field(default=None, description="Hybrid mode HMAC-SHA256 tag (hex)")
 
 
 class DecryptionRequest(BaseModel):
     encrypted_blocks: List[str] = Field(min_length=1, description="List of encrypted blocks")
     n: str = Field(description="RSA modulus")
     d: str = Field(description="RSA private exponent")
+    mode: CryptoMode = Field(default="textbook", description="Mode used for encryption")
+    ciphertext: Optional[str] = Field(default=None, description="Hybrid mode ciphertext (hex)")
+    tag: Optional[str] = Field(default=None, description="Hybrid mode HMAC-SHA256 tag (hex)")
 
     @field_validator("encrypted_blocks")
     def validate_encrypted_blocks(cls, v):
@@ -100,6 +188,15 @@ class DecryptionRequest(BaseModel):
                 raise ValueError("All encrypted blocks must be valid integers")
         return v
 
+    @model_validator(mode="after")
+    def validate_hybrid_fields(self):
+        if self.mode == "hybrid":
+            if self.ciphertext is None or self.tag is None:
+                raise ValueError("Hybrid mode requires ciphertext and tag")
+            if len(self.encrypted_blocks) != 1:
+                raise ValueError("Hybrid mode expects exactly one encapsulated key block")
+        return self
+
 
 class DecryptionResponse(BaseModel):
     decrypted_message: str
@@ -107,12 +204,163 @@ class DecryptionResponse(BaseModel):
     block_count: int
 
 
+class SignRequest(BaseModel):
+    message: str = Field(min_length=1, max_length=10000, description="Message to sign")
+    n: str = Field(description="RSA modulus")
+    d: str = Field(description="RSA private exponent")
+    p: Optional[str] = Field(default=None, description="First prime (enables CRT signing)")
+    q: Optional[str] = Field(default=None, description="Second prime (enables CRT signing)")
+
+
+class SignResponse(BaseModel):
+    signature: str
+    crt: bool = Field(description="Whether CRT acceleration was used")
+
+
+class VerifyRequest(BaseModel):
+    message: str = Field(max_length=10000, description="Signed message")
+    signature: str = Field(description="Signature to check")
+    n: str = Field(description="RSA modulus")
+    e: str = Field(description="RSA public exponent")
+
+
+class VerifyResponse(BaseModel):
+    is_valid: bool
+
+
+class BatchVerifyRequest(BaseModel):
+    items: List[VerifyRequest] = Field(
+        min_length=1,
+        max_length=settings.max_batch_verify_items,
+        description="(message, signature, public key) tuples to verify",
+    )
+
+
+class BatchVerifyResponse(BaseModel):
+    results: List[bool]
+    valid_count: int
+    invalid_count: int
+
+
+class SharedFactorAuditRequest(BaseModel):
+    moduli: Dict[str, DecimalInt] = Field(
+        default_factory=dict,
+        max_length=settings.max_audit_moduli,
+        description="Extra moduli to audit alongside stored keys, keyed by key ID",
+    )
+    include_stored_keys: bool = Field(default=True, description="Audit the key store too")
+
+
+class SharedFactorGroupInfo(BaseModel):
+    key_ids: List[str]
+    duplicate_modulus: bool
+
+
+class SharedFactorAuditResponse(BaseModel):
+    moduli_checked: int
+    vulnerable_key_ids: List[str]
+    groups: List[SharedFactorGroupInfo]
+    audit_time: float
+
+
+FactoringMethod = Literal["trial_division", "fermat", "pollard_rho", "pollard_p_minus_1"]
+
+
+class WeakKeyAnalysisRequest(BaseModel):
+    n: Optional[DecimalInt] = Field(default=None, description="Modulus to analyze")
+    key_id: Optional[str] = Field(default=None, description="Stored key to analyze instead")
+    time_budget: float = Field(
+        default=settings.factor_time_budget,
+        gt=0,
+        le=settings.max_factor_time_budget,
+        description="Wall-clock seconds shared by all methods",
+    )
+    methods: Optional[List[FactoringMethod]] = Field(
+        default=None, min_length=1, description="Methods to run (default: all)"
+    )
+
+    @field_validator("n")
+    def validate_n(cls, v):
+        if v is not None and int(v) < 4:
+            raise ValueError("Modulus must be at least 4")
+        return v
+
+    @model_validator(mode="after")
+    def validate_target(self):
+        if (self.n is None) == (self.key_id is None):
+            raise ValueError("Provide exactly one of n and key_id")
+        return self
+
+
+class WeakKeyAnalysisResponse(BaseModel):
+    modulus_bits: int
+    factored: bool
+    p: Optional[str] = Field(default=None, description="Smaller factor found")
+    q: Optional[str] = Field(default=None, description="Cofactor")
+    method: Optional[str] = Field(default=None, description="Method that found the factors")
+    outcomes: Dict[str, str] = Field(
+        description="Per method: found, exhausted, timeout, cancelled or error"
+    )
+    elapsed: float
+
+
+# WebSocket session frames (client to server)
+###########################
+FrameId = Union[int, str]
+
+
+class SessionBindFrame(BaseModel):
+    type: Literal["bind"]
+    id: Optional[FrameId] = None
+    key_id: Optional[str] = Field(default=None, description="Stored key to bind")
+    n: Optional[DecimalInt] = None
+    e: Optional[DecimalInt] = None
+    d: Optional[DecimalInt] = None
+    p: Optional[DecimalInt] = Field(default=None, description="With q, enables CRT decryption")
+    q: Optional[DecimalInt] = None
+
+    @model_validator(mode="after")
+    def validate_key(self):
+        if (self.key_id is None) == (self.n is None):
+            raise ValueError("Provide exactly one of key_id and n")
+        return self
+
+
+class SessionEncryptFrame(BaseModel):
+    type: Literal["encrypt"]
+    id: FrameId
+    message: str = Field(min_length=1, max_length=10000)
+
+
+class SessionDecryptFrame(BaseModel):
+    type: Literal["decrypt"]
+    id: FrameId
+    encrypted_blocks: List[DecimalInt] = Field(min_length=1, max_length=10000)
+
+
+SessionFrame = Annotated[
+    Union[SessionBindFrame, SessionEncryptFrame, SessionDecryptFrame],
+    Field(discriminator="type"),
+]
+
+
+class ProfileInfo(BaseModel):
+    profile_id: str
+    method: str
+    path: str
+    timestamp: float
+    duration: float = Field(description="Request wall time in seconds")
+
+
 class HealthResponse(BaseModel):
     status: str
     timestamp: str
     primes_available: bool
     keys_generated: bool
     system_info: Dict[str, str]
+    arithmetic_backend: Optional[str] = Field(
+        default=None, description="Big-integer arithmetic backend in use"
+    )
 
 
 class ErrorResponse(BaseModel):
@@ -0,0 +1,115 @@
+import random
+
+import pytest
+
+from core.arithmetic import (
+    BACKENDS,
+    GmpyBackend,
+    PythonBackend,
+    available_backends,
+    configure_arithmetic,
+    get_backend,
+    gmpy2_installed,
+    set_backend,
+)
+from core.entropy import PseudoRandomSource, get_random_source, set_random_source
+from core.prime_generator import PrimeGenerator
+from core.prime_memo import PrimeMemo
+from core.rsa_crypto import RSACrypto
+
+requires_gmpy2 = pytest.mark.skipif(not gmpy2_installed(), reason="gmpy2 not installed")
+
+KNOWN_PRIMES = [2, 3, 5, 97, 7919, 2147483647, 2**127 - 1, 2**521 - 1]
+KNOWN_COMPOSITES = [1, 4, 561, 1105, 7917, 2**128 + 1, (2**61 - 1) * (2**89 - 1)]
+
+
+@pytest.fixture
+def restore_backend():
+    """Put the configured backend and random source back after a test switches them"""
+    previous = get_backend().name
+    previous_source = get_random_source()
+    yield
+    set_backend(previous)
+    set_random_source(previous_source)
+
+
+class TestArithmeticBackends:
+    """Test cases for the big-integer arithmetic backends"""
+
+    @pytest.mark.parametrize("backend_name", available_backends())
+    def test_known_primes_and_composites(self, backend_name):
+        """Test every backend classifies known primes and composites"""
+        backend = BACKENDS[backend_name]()
+        assert all(backend.is_probable_prime(p, 20) for p in KNOWN_PRIMES)
+        assert not any(backend.is_probable_prime(c, 20) for c in KNOWN_COMPOSITES)
+
+    @pytest.mark.parametrize("backend_name", available_backends())
+    def test_invert_rejects_non_invertible(self, backend_name):
+        """Test invert raises ValueError when no inverse exists"""
+        with pytest.raises(ValueError):
+            BACKENDS[backend_name]().invert(6, 9)
+
+    @requires_gmpy2
+    @pytest.mark.parametrize("bits", [64, 512, 2048, 4096])
+    def test_gmpy2_matches_python(self, bits):
+        """Test both backends return identical results on the same inputs"""
+        python, gmp = PythonBackend(), GmpyBackend()
+        rng = random.Random(bits)
+
+        for _ in range(5):
+            modulus = rng.getrandbits(bits) | 1
+            base, exponent = rng.getrandbits(bits), rng.getrandbits(bits)
+            a = rng.getrandbits(bits)
+
+            powmod = gmp.powmod(base, exponent, modulus)
+            assert powmod == python.powmod(base, exponent, modulus)
+            assert type(powmod) is int
+            assert gmp.gcd(a, modulus) == python.gcd(a, modulus)
+            if python.gcd(a, modulus) == 1:
+                assert gmp.invert(a, modulus) == python.invert(a, modulus)
+
+    @requires_gmpy2
+    def test_gmpy2_matches_python_primality(self):
+        """Test both backends agree on primality of random odd candidates"""
+        python, gmp = PythonBackend(), GmpyBackend()
+        rng = random.Random(0)
+        candidates = [rng.getrandbits(256) | 1 for _ in range(300)]
+
+        assert [python.is_probable_prime(c, 10) for c in candidates] == [
+            gmp.is_probable_prime(c, 10) for c in candidates
+        ]
+
+    @requires_gmpy2
+    def test_seeded_generation_is_backend_independent(self, restore_backend):
+        """Test the same seed gives the same primes and keys on either backend"""
+        for seed in (1, 2, 4, 5, 7, 41):
+            keypairs = []
+            for name in ("python", "gmpy2"):
+                set_backend(name)
+                set_random_source(PseudoRandomSource(seed))
+                prime_pair = PrimeGenerator().generate_prime_pair(256, 10)
+                keypairs.append(RSACrypto().generate_keypair(prime_pair))
+
+            assert keypairs[0] == keypairs[1], f"seed {seed}"
+
+    @requires_gmpy2
+    def test_memoized_seeded_pair_matches_other_backend(self, restore_backend, tmp_path):
+        """Test a pair memoized under one backend is what the other one generates"""
+        set_backend("python")
+        memo = PrimeMemo(str(tmp_path))
+        memoized = PrimeGenerator(memo=memo).generate_prime_pair(256, 10, seed="shared")
+        set_backend("gmpy2")
+        fresh = PrimeGenerator().generate_prime_pair(256, 10, seed="shared")
+
+        assert (memoized.p, memoized.q) == (fresh.p, fresh.q)
+
+    def test_configure_auto_prefers_gmpy2(self, restore_backend):
+        """Test "auto" picks gmpy2 when installed and python otherwise"""
+        expected = "gmpy2" if gmpy2_installed() else "python"
+        assert configure_arithmetic("auto").name == expected
+        assert configure_arithmetic("python").name == "python"
+
+    def test_unknown_backend_rejected(self):
+        """Test selecting an unknown backend fails"""
+        with pytest.raises(ValueError):
+            set_backend("fortran")
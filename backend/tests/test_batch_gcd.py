@@ -0,0 +1,37 @@
+import pytest
+
+from core.batch_gcd import audit_shared_factors, batch_gcd, product_tree, remainder_tree
+
+
+class TestBatchGCD:
+    """Test cases for the batch GCD shared-factor audit"""
+
+    def test_product_and_remainder_trees(self):
+        """Test the trees agree with direct products and remainders"""
+        values = [7, 11, 13, 17, 19]
+        tree = product_tree(values)
+
+        assert tree[-1] == [7 * 11 * 13 * 17 * 19]
+        assert remainder_tree(10**12 + 3, tree) == [(10**12 + 3) % v for v in values]
+
+    def test_batch_gcd_matches_pairwise(self):
+        """Test batch GCD finds the same shared factors as a pairwise scan"""
+        moduli = [61 * 53, 67 * 71, 61 * 73, 79 * 83, 89 * 97]
+
+        assert batch_gcd(moduli) == [61, 1, 61, 1, 1]
+
+    def test_audit_groups_colliding_keys(self):
+        """Test colliding keys are grouped and clean keys are not reported"""
+        audit = audit_shared_factors(
+            {"a": 61 * 53, "b": 67 * 71, "c": 61 * 73, "d": 67 * 71, "e": 89 * 97}
+        )
+
+        groups = sorted(sorted(group.key_ids) for group in audit.groups)
+        assert groups == [["a", "c"], ["b", "d"]]
+        assert audit.moduli_checked == 5
+        assert [g.duplicate_modulus for g in audit.groups if "b" in g.key_ids] == [True]
+
+    def test_empty_tree_rejected(self):
+        """Test building a product tree of nothing fails"""
+        with pytest.raises(ValueError):
+            product_tree([])
@@ -0,0 +1,84 @@
+from core.block_cache import BlockResultCache
+from core.rsa_crypto import RSACrypto
+from models.crypto_models import PrimePair
+
+
+class TestBlockResultCache:
+    """Test cases for the per-key block result cache"""
+
+    def test_lookup_returns_stored_results(self):
+        """Test stored results are returned and unknown blocks are None"""
+        cache = BlockResultCache()
+        cache.admit(3233, 17, 2753)
+        cache.store((3233, 17), [65, 66], [2790, 2997])
+
+        assert cache.lookup((3233, 17), [66, 67, 65]) == [2997, None, 2790]
+        assert cache.lookup((3233, 2753), [65]) == [None]
+
+    def test_blocks_per_key_are_bounded(self):
+        """Test the least recently used blocks of a key are evicted"""
+        cache = BlockResultCache(max_blocks_per_key=2)
+        cache.admit(3233, 17)
+        cache.store((3233, 17), [1, 2], [1, 2])
+        cache.lookup((3233, 17), [1])
+        cache.store((3233, 17), [3], [3])
+
+        assert cache.lookup((3233, 17), [1, 2, 3]) == [1, None, 3]
+
+    def test_keys_are_bounded(self):
+        """Test the least recently used key is evicted"""
+        cache = BlockResultCache(max_keys=1)
+        cache.admit(3233, 17)
+        cache.admit(143, 7)
+        cache.store((3233, 17), [1], [1])
+        cache.store((143, 7), [1], [1])
+
+        assert cache.lookup((3233, 17), [1]) == [None]
+        assert len(cache) == 1
+
+    def test_evict_drops_both_exponents(self):
+        """Test evicting a modulus drops its public and private entries"""
+        cache = BlockResultCache()
+        cache.admit(3233, 17, 2753)
+        cache.admit(143, 7)
+        cache.store((3233, 17), [65], [2790])
+        cache.store((3233, 2753), [2790], [65])
+        cache.store((143, 7), [2], [128])
+
+        cache.evict(3233)
+
+        assert len(cache) == 1
+        assert cache.lookup((143, 7), [2]) == [128]
+        assert not cache.admits((3233, 17))
+
+    def test_only_admitted_keys_are_cached(self):
+        """Test results under a key that was never admitted are not kept"""
+        cache = BlockResultCache()
+        cache.admit(3233, 17)
+        cache.store((3233, 2753), [2790], [65])
+        cache.store((143, 7), [2], [128])
+
+        assert len(cache) == 0
+        assert cache.lookup((3233, 2753), [2790]) == [None]
+
+    def test_rsa_crypto_reuses_cached_blocks(self):
+        """Test cached encryption matches uncached and fills the cache"""
+        prime_pair = PrimePair(p=61, q=53, bit_length=8, generation_time=0.0, miller_rabin_rounds=1)
+        cache = BlockResultCache()
+        crypto = RSACrypto(block_cache=cache)
+        keypair = crypto.generate_keypair(prime_pair)
+        cache.admit(keypair.n, keypair.e)
+        plain = RSACrypto().encrypt_message("aaab", keypair.n, keypair.e)
+
+        first = crypto.encrypt_message("aaab", keypair.n, keypair.e)
+        second = crypto.encrypt_message("aaab", keypair.n, keypair.e)
+
+        expected = [block.encrypted_value for block in plain.blocks]
+        assert [block.encrypted_value for block in first.blocks] == expected
+        assert [block.encrypted_value for block in second.blocks] == expected
+        # "a" repeats, so only two distinct blocks are cached
+        assert len(cache) == 2
+        # The private exponent was not admitted, so decryption caches nothing
+        decrypted = crypto.decrypt_message(expected, keypair.n, keypair.d)
+        assert decrypted.message == "aaab"
+        assert len(cache) == 2
@@ -0,0 +1,126 @@
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+
+import pytest
+
+from core.entropy import (
+    EntropyPool,
+    HmacDrbg,
+    PseudoRandomSource,
+    get_random_source,
+    set_random_source,
+    use_random_source,
+)
+
+_fork_pool = EntropyPool(buffer_size=4096)
+
+
+def _read_in_child(size: int) -> bytes:
+    return _fork_pool.read(size)
+
+
+class TestEntropyPool:
+    """Test cases for the buffered entropy pool"""
+
+    def test_random_bits_range(self):
+        """Test random_bits stays below 2**bits and uses the top bit"""
+        pool = EntropyPool(buffer_size=256)
+        values = [pool.random_bits(13) for _ in range(2000)]
+
+        assert all(0 <= value < 2**13 for value in values)
+        assert max(values) >= 2**12
+        assert pool.random_bits(0) == 0
+
+    def test_randrange_bounds(self):
+        """Test randrange covers exactly [start, stop)"""
+        pool = EntropyPool(buffer_size=64)
+        values = {pool.randrange(2, 7) for _ in range(500)}
+        assert values == {2, 3, 4, 5, 6}
+        with pytest.raises(ValueError):
+            pool.randbelow(0)
+
+    def test_reads_span_refills(self):
+        """Test reads larger than what is left, or than the buffer, still work"""
+        pool = EntropyPool(buffer_size=16)
+        assert len(pool.read(10)) == 10
+        assert len(pool.read(10)) == 10
+        assert len(pool.read(100)) == 100
+
+    def test_threads_get_separate_buffers(self):
+        """Test each thread draws from its own buffer"""
+        pool = EntropyPool()
+        results = {}
+
+        def draw(name):
+            results[name] = pool.read(32)
+
+        threads = [threading.Thread(target=draw, args=(i,)) for i in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(set(results.values())) == 4
+
+    def test_forked_process_does_not_replay_parent_bytes(self):
+        """Test a forked child refills instead of reusing the parent's buffer"""
+        _fork_pool.read(1)  # fill the parent's buffer before forking
+
+        with ProcessPoolExecutor(max_workers=1, mp_context=get_context("fork")) as pool:
+            child = pool.submit(_read_in_child, 64).result()
+        parent = _fork_pool.read(64)
+
+        assert child != parent
+
+
+class TestPseudoRandomSource:
+    """Test cases for the deterministic source"""
+
+    def test_same_seed_same_values(self):
+        """Test a seed reproduces the same draws"""
+        first, second = PseudoRandomSource(7), PseudoRandomSource(7)
+        assert [first.random_bits(64) for _ in range(5)] == [
+            second.random_bits(64) for _ in range(5)
+        ]
+
+    def test_set_random_source_returns_previous(self):
+        """Test swapping the core source hands back the old one"""
+        source = PseudoRandomSource(1)
+        previous = set_random_source(source)
+        try:
+            assert get_random_source() is source
+        finally:
+            assert set_random_source(previous) is source
+
+
+class TestHmacDrbg:
+    """Test cases for the deterministic HMAC-DRBG source"""
+
+    def test_nist_vector(self):
+        """Test against the NIST CAVP HMAC_DRBG SHA-256 (no reseed) vector"""
+        entropy = "ca851911349384bffe89de1cbdc46e6831e44d34a4fb935ee285dd14b71a7488"
+        nonce = "659ba96c601dc69fc902940805ec0ca8"
+        drbg = HmacDrbg(bytes.fromhex(entropy + nonce))
+
+        drbg.read(128)
+        assert drbg.read(128).hex() == (
+            "e528e9abf2dece54d47c7e75e5fe302149f817ea9fb4bee6f4199697d04d5b89"
+            "d54fbb978a15b5c443c9ec21036d2460b6f73ebad0dc2aba6e624abf07745bc1"
+            "07694bb7547bb0995f70de25d6b29e2d3011bb19d27676c07162c8b5ccde0668"
+            "961df86803482cb37ed6d5c0bb8d50cf1f50d476aa0458bdaba806f48be9dcb8"
+        )
+
+    def test_use_random_source_is_context_local(self):
+        """Test a context override does not leak into other threads"""
+        drbg = HmacDrbg("seed")
+        seen = []
+
+        with use_random_source(drbg):
+            assert get_random_source() is drbg
+            thread = threading.Thread(target=lambda: seen.append(get_random_source()))
+            thread.start()
+            thread.join()
+
+        assert seen[0] is not drbg
+        assert get_random_source() is not drbg
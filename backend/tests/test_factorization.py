@@ -0,0 +1,141 @@
+import io
+import json
+import random
+import threading
+import time
+from math import prod
+
+import pytest
+
+from cli import weak_keys
+from core.factorization import (
+    analyze_modulus,
+    fermat,
+    pollard_p_minus_1,
+    pollard_rho,
+    trial_division,
+)
+from core.miller_rabin import MillerRabinTester
+from core.prime_generator import PrimeGenerator, _sieve_primes
+
+
+def next_prime(n: int) -> int:
+    n |= 1
+    while not MillerRabinTester.test(n, 20):
+        n += 2
+    return n
+
+
+@pytest.fixture(scope="module")
+def weak_moduli():
+    """One modulus per weakness, built around a random 256-bit prime"""
+    generator = PrimeGenerator()
+    p = generator._generate_single_prime(256, 10)
+
+    # A prime whose p - 1 is twice a product of primes below 4096
+    rng = random.Random(0)
+    smooth = 4
+    while not MillerRabinTester.test(smooth, 20):
+        smooth = 2 * prod(rng.sample(_sieve_primes(), 40)) + 1
+
+    return {
+        "close": p * next_prime(p + 2),
+        "small": 1000003 * p,
+        "rho": next_prime(1 << 36) * p,
+        "smooth": smooth * p,
+        "strong": p * generator._generate_single_prime(256, 10),
+    }
+
+
+class TestFactoringMethods:
+    """Test cases for the individual factoring methods"""
+
+    def run(self, method, n, budget=5.0):
+        return method(n, time.monotonic() + budget, threading.Event())
+
+    def test_trial_division(self, weak_moduli):
+        """Test small factors are found and strong moduli are not"""
+        assert self.run(trial_division, weak_moduli["small"]) == 1000003
+        assert self.run(trial_division, weak_moduli["strong"]) is None
+
+    def test_fermat(self, weak_moduli):
+        """Test Fermat's method splits moduli with close factors"""
+        n = weak_moduli["close"]
+        factor = self.run(fermat, n)
+        assert factor is not None and n % factor == 0 and 1 < factor < n
+
+    def test_pollard_rho(self, weak_moduli):
+        """Test rho finds a 37-bit factor"""
+        assert self.run(pollard_rho, weak_moduli["rho"]) == next_prime(1 << 36)
+
+    def test_pollard_p_minus_1(self, weak_moduli):
+        """Test p - 1 finds a factor with smooth p - 1"""
+        n = weak_moduli["smooth"]
+        factor = self.run(pollard_p_minus_1, n)
+        assert factor is not None and n % factor == 0 and 1 < factor < n
+
+    def test_methods_stop_when_signalled(self, weak_moduli):
+        """Test a set stop event makes long-running methods give up"""
+        stop = threading.Event()
+        stop.set()
+        for method in (fermat, pollard_rho):
+            assert method(weak_moduli["strong"], time.monotonic() + 60, stop) is None
+
+
+class TestAnalyzeModulus:
+    """Test cases for the parallel, time-budgeted analyzer"""
+
+    def test_first_method_wins_and_others_are_cancelled(self, weak_moduli):
+        """Test a weak modulus is factored and the losing methods are cancelled"""
+        n = weak_moduli["close"]
+        result = analyze_modulus(n, time_budget=5.0)
+
+        assert result.factored and result.method == "fermat"
+        assert result.factors[0] * result.factors[1] == n
+        assert result.outcomes["fermat"] == "found"
+        assert all(
+            outcome in ("cancelled", "exhausted", "found") for outcome in result.outcomes.values()
+        )
+        assert result.elapsed < 5.0
+
+    def test_budget_is_respected(self, weak_moduli):
+        """Test a strong modulus is given up on once the budget runs out"""
+        start = time.monotonic()
+        result = analyze_modulus(weak_moduli["strong"], time_budget=0.5)
+
+        assert not result.factored
+        assert time.monotonic() - start < 3.0
+        assert result.outcomes["fermat"] == "timeout"
+        assert result.outcomes["trial_division"] == "exhausted"
+
+    def test_invalid_arguments(self):
+        """Test tiny moduli and unknown methods are rejected"""
+        with pytest.raises(ValueError):
+            analyze_modulus(3)
+        with pytest.raises(ValueError):
+            analyze_modulus(15, methods=["quadratic_sieve"])
+
+
+class TestWeakKeysCli:
+    """Test cases for the batch audit CLI"""
+
+    def test_load_moduli_formats(self):
+        """Test JSON objects and text lines are both accepted"""
+        assert weak_keys.load_moduli(io.StringIO('{"a": "15", "b": "77"}')) == {"a": 15, "b": 77}
+        text = "# comment\nkey1 15\n\n77\n"
+        assert weak_keys.load_moduli(io.StringIO(text)) == {"key1": 15, "line-4": 77}
+
+    def test_batch_audit(self, weak_moduli, tmp_path, capsys):
+        """Test the CLI reports factored keys and exits non-zero"""
+        keys = tmp_path / "keys.json"
+        keys.write_text(json.dumps({"weak": str(weak_moduli["small"])}))
+        report = tmp_path / "report.json"
+
+        status = weak_keys.main(
+            [str(keys), "--budget", "2", "--methods", "trial_division", "--output", str(report)]
+        )
+
+        assert status == 1
+        assert "FACTORED by trial_division" in capsys.readouterr().out
+        entry = json.loads(report.read_text())["keys"]["weak"]
+        assert entry["factors"][0] == "1000003"
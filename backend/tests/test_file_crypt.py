@@ -0,0 +1,157 @@
+import json
+import os
+
+import pytest
+
+from cli import bulk_crypt
+from core import file_crypt
+from core.file_crypt import HEADER, FileHeader, decrypt_file, encrypt_file
+from core.parallel import shutdown_process_pool
+from core.prime_generator import PrimeGenerator
+from core.rsa_crypto import RSACrypto
+from models.crypto_models import modulus_fingerprint
+
+
+@pytest.fixture(scope="module")
+def keypair():
+    """A 512-bit keypair shared by the module"""
+    return RSACrypto().generate_keypair(PrimeGenerator().generate_prime_pair(256, 10))
+
+
+class TestFileCrypt:
+    """Test cases for offline bulk file encryption"""
+
+    @pytest.fixture(autouse=True)
+    def process_pool(self):
+        """Tear down the shared pool after each test"""
+        yield
+        shutdown_process_pool()
+
+    def test_round_trip_preserves_bytes(self, tmp_path, keypair):
+        """Test leading zero bytes and a short last block survive a round trip"""
+        data = b"\x00\x00\x01" + os.urandom(5000) + b"\x00" * 70
+        source, encrypted, decrypted = tmp_path / "in", tmp_path / "enc", tmp_path / "out"
+        source.write_bytes(data)
+
+        result = encrypt_file(
+            str(source), str(encrypted), keypair.n, keypair.e, workers=2, range_blocks=8
+        )
+        decrypt_file(
+            str(encrypted),
+            str(decrypted),
+            keypair.n,
+            keypair.d,
+            keypair.p,
+            keypair.q,
+            workers=2,
+            range_blocks=8,
+        )
+
+        assert decrypted.read_bytes() == data
+        assert result.bytes_out == os.path.getsize(encrypted)
+        assert not os.path.exists(str(encrypted) + ".checkpoint")
+
+    def test_header_fields(self, tmp_path, keypair):
+        """Test the header records the key fingerprint, block size and block count"""
+        source, encrypted = tmp_path / "in", tmp_path / "enc"
+        source.write_bytes(b"x" * 1000)
+        encrypt_file(str(source), str(encrypted), keypair.n, keypair.e, workers=1)
+
+        header = FileHeader.read(str(encrypted))
+        assert header.fingerprint == modulus_fingerprint(keypair.n)
+        assert header.block_size == RSACrypto.block_size(keypair.n)
+        assert header.block_count == -(-1000 // header.block_size)
+        assert header.plaintext_length == 1000
+        expected_size = HEADER.size + header.block_count * header.cipher_size
+        assert os.path.getsize(encrypted) == expected_size
+
+    def test_empty_file(self, tmp_path, keypair):
+        """Test an empty input round trips to an empty output"""
+        source, encrypted, decrypted = tmp_path / "in", tmp_path / "enc", tmp_path / "out"
+        source.write_bytes(b"")
+        encrypt_file(str(source), str(encrypted), keypair.n, keypair.e, workers=1)
+        decrypt_file(str(encrypted), str(decrypted), keypair.n, keypair.d, workers=1)
+
+        assert FileHeader.read(str(encrypted)).block_count == 0
+        assert decrypted.read_bytes() == b""
+
+    def test_resume_skips_finished_ranges(self, tmp_path, keypair):
+        """Test an interrupted job resumes from its checkpoint"""
+        data = os.urandom(4000)
+        source, encrypted, decrypted = tmp_path / "in", tmp_path / "enc", tmp_path / "out"
+        source.write_bytes(data)
+
+        def interrupt(done, total):
+            raise KeyboardInterrupt
+
+        with pytest.raises(KeyboardInterrupt):
+            encrypt_file(
+                str(source),
+                str(encrypted),
+                keypair.n,
+                keypair.e,
+                workers=1,
+                range_blocks=4,
+                progress=interrupt,
+            )
+        checkpoint = json.loads((tmp_path / "enc.checkpoint").read_text())
+        assert checkpoint["high_water"] + len(checkpoint["done"]) > 0
+        assert all(index > checkpoint["high_water"] for index in checkpoint["done"])
+
+        result = encrypt_file(
+            str(source),
+            str(encrypted),
+            keypair.n,
+            keypair.e,
+            workers=1,
+            range_blocks=4,
+            resume=True,
+        )
+        assert 0 < result.resumed_blocks < result.blocks
+
+        decrypt_file(str(encrypted), str(decrypted), keypair.n, keypair.d, workers=1)
+        assert decrypted.read_bytes() == data
+
+    def test_checkpoints_are_written_on_an_interval(self, tmp_path, keypair, monkeypatch):
+        """Test an uninterrupted job inside the checkpoint interval writes no checkpoint"""
+        saves = []
+        monkeypatch.setattr(file_crypt, "CHECKPOINT_SECONDS", 3600.0)
+        monkeypatch.setattr(file_crypt, "CHECKPOINT_RANGES", 10**6)
+        monkeypatch.setattr(file_crypt, "_save_checkpoint", lambda *args: saves.append(args))
+        source, encrypted = tmp_path / "in", tmp_path / "enc"
+        source.write_bytes(os.urandom(4000))
+
+        encrypt_file(str(source), str(encrypted), keypair.n, keypair.e, workers=2, range_blocks=2)
+
+        assert saves == []
+
+    def test_wrong_key_rejected(self, tmp_path, keypair):
+        """Test decrypting with a key of a different fingerprint fails up front"""
+        other = RSACrypto().generate_keypair(PrimeGenerator().generate_prime_pair(256, 10))
+        source, encrypted = tmp_path / "in", tmp_path / "enc"
+        source.write_bytes(b"secret")
+        encrypt_file(str(source), str(encrypted), keypair.n, keypair.e, workers=1)
+
+        with pytest.raises(ValueError, match="encrypted for key"):
+            decrypt_file(str(encrypted), str(tmp_path / "out"), other.n, other.d, workers=1)
+
+    def test_cli_directory_round_trip(self, tmp_path, keypair):
+        """Test the CLI encrypts and decrypts a directory tree"""
+        tree = tmp_path / "tree"
+        (tree / "sub").mkdir(parents=True)
+        (tree / "a.txt").write_bytes(b"hello")
+        (tree / "sub" / "b.bin").write_bytes(os.urandom(3000))
+        key_file = tmp_path / "key.json"
+        key_file.write_text(
+            json.dumps({name: str(getattr(keypair, name)) for name in ("n", "e", "d", "p", "q")})
+        )
+
+        common = ["--key", str(key_file), "--workers", "2", "--quiet"]
+        assert bulk_crypt.main(["encrypt", str(tree), str(tmp_path / "enc"), *common]) == 0
+        assert (tmp_path / "enc" / "sub" / "b.bin.rsab").exists()
+        assert (
+            bulk_crypt.main(["decrypt", str(tmp_path / "enc"), str(tmp_path / "dec"), *common]) == 0
+        )
+
+        for name in ("a.txt", "sub/b.bin"):
+            assert (tmp_path / "dec" / name).read_bytes() == (tree / name).read_bytes()
@@ -0,0 +1,133 @@
+import pytest
+
+from core.key_encoding import (
+    PRIVATE_KEY_LABEL,
+    PUBLIC_KEY_LABEL,
+    ParsedKeyCache,
+    decode_key,
+    decode_sequence,
+    encode_integer,
+    encode_private_key,
+    encode_public_key,
+    encode_sequence,
+    load_key,
+    pem_decode,
+    pem_encode,
+)
+from core.prime_generator import PrimeGenerator
+from core.rsa_crypto import RSACrypto
+
+
+@pytest.fixture(scope="module")
+def keypair():
+    """A 1024-bit keypair shared by the module"""
+    return RSACrypto().generate_keypair(PrimeGenerator().generate_prime_pair(512, 10))
+
+
+class TestDer:
+    """Test cases for the minimal DER encoder / decoder"""
+
+    def test_integer_encoding(self):
+        """Test known DER encodings, including the sign-padding zero byte"""
+        assert encode_integer(0) == bytes.fromhex("020100")
+        assert encode_integer(127) == bytes.fromhex("02017f")
+        assert encode_integer(128) == bytes.fromhex("02020080")
+        assert encode_integer(65537) == bytes.fromhex("0203010001")
+
+    def test_long_form_length(self):
+        """Test sequences longer than 127 bytes round trip through long-form lengths"""
+        values = [1 << 2047, 3, 0]
+        der = encode_sequence(values)
+        assert der[1] == 0x82
+        assert decode_sequence(der) == values
+
+    @pytest.mark.parametrize(
+        "der",
+        [
+            "3003020180",  # negative integer
+            "300402020001",  # non-minimal integer
+            "30030201",  # truncated
+            "3003020101ff",  # trailing data
+            "3081030201",  # non-minimal length
+            "3003040101",  # not an INTEGER
+        ],
+    )
+    def test_malformed_der_rejected(self, der):
+        """Test malformed or non-canonical DER raises ValueError"""
+        with pytest.raises(ValueError):
+            decode_sequence(bytes.fromhex(der))
+
+
+class TestPkcs1:
+    """Test cases for PKCS#1 RSA keys and PEM armor"""
+
+    def test_private_key_round_trip(self, keypair):
+        """Test a private key decodes to the same parts"""
+        der = encode_private_key(keypair.n, keypair.e, keypair.d, keypair.p, keypair.q)
+        key = decode_key(der)
+
+        assert (key.n, key.e, key.d, key.p, key.q) == (
+            keypair.n,
+            keypair.e,
+            keypair.d,
+            keypair.p,
+            keypair.q,
+        )
+
+    def test_public_key_round_trip_through_pem(self, keypair):
+        """Test a public key survives PEM armor"""
+        pem = pem_encode(encode_public_key(keypair.n, keypair.e), PUBLIC_KEY_LABEL)
+        assert all(len(line) <= 64 for line in pem.splitlines())
+
+        label, der = pem_decode(pem)
+        key = decode_key(der)
+        assert label == PUBLIC_KEY_LABEL
+        assert (key.n, key.e, key.d) == (keypair.n, keypair.e, None)
+
+    def test_inconsistent_crt_fields_rejected(self, keypair):
+        """Test a private key whose CRT fields disagree with d is rejected"""
+        n, e, d, p, q = keypair.n, keypair.e, keypair.d, keypair.p, keypair.q
+        der = encode_sequence([0, n, e, d, p, q, d % (p - 1) + 1, d % (q - 1), pow(q, -1, p)])
+
+        with pytest.raises(ValueError, match="CRT"):
+            decode_key(der)
+
+    def test_exponents_not_inverse_rejected(self, keypair):
+        """Test a private key whose d does not invert e mod lambda(n) is rejected"""
+        der = encode_private_key(keypair.n, keypair.e, keypair.d + 2, keypair.p, keypair.q)
+
+        with pytest.raises(ValueError, match="lambda"):
+            decode_key(der)
+
+    def test_unsupported_pem_type_rejected(self, keypair):
+        """Test PEM blocks other than PKCS#1 RSA keys are rejected"""
+        pem = pem_encode(encode_public_key(keypair.n, keypair.e), "PUBLIC KEY")
+
+        with pytest.raises(ValueError, match="Unsupported PEM type"):
+            load_key(pem.encode("ascii"))
+
+
+class TestParsedKeyCache:
+    """Test cases for the parsed-key cache"""
+
+    def test_repeated_import_hits_cache(self, keypair):
+        """Test importing the same PEM twice parses it once"""
+        cache = ParsedKeyCache(max_keys=4)
+        der = encode_private_key(keypair.n, keypair.e, keypair.d, keypair.p, keypair.q)
+        pem = pem_encode(der, PRIVATE_KEY_LABEL).encode("ascii")
+
+        key, cached = cache.load(pem)
+        assert cached is False
+        again, cached = cache.load(pem)
+        assert cached is True
+        assert again is key
+        assert cache.load(der)[1] is False
+
+    def test_cache_is_bounded(self):
+        """Test the least recently used key is evicted"""
+        cache = ParsedKeyCache(max_keys=2)
+        for n in (3233, 3599, 4087):
+            cache.load(encode_public_key(n, 17))
+
+        assert len(cache) == 2
+        assert cache.load(encode_public_key(3233, 17))[1] is False
@@ -0,0 +1,68 @@
+import threading
+
+import pytest
+
+from core.metrics import Counter, Gauge, Histogram, MetricsRegistry, bit_length_class
+
+
+class TestMetrics:
+    """Test cases for the sharded Prometheus metrics"""
+
+    @pytest.fixture
+    def registry(self):
+        """Isolated registry so tests do not see core metrics"""
+        return MetricsRegistry()
+
+    def test_counter_sums_thread_shards(self, registry):
+        """Test increments from several threads are merged on render"""
+        counter = Counter("test_total", "Test counter", labelnames=("kind",), registry=registry)
+        bound = counter.labels(kind="a")
+
+        threads = [
+            threading.Thread(target=lambda: [bound.inc() for _ in range(1000)]) for _ in range(4)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert counter.value(("a",)) == 4000
+        assert 'test_total{kind="a"} 4000' in registry.render()
+
+    def test_histogram_renders_cumulative_buckets(self, registry):
+        """Test histogram buckets, sum and count in exposition format"""
+        histogram = Histogram("test_seconds", "Test histogram", buckets=(1, 5), registry=registry)
+        for value in (0.5, 1, 3, 10):
+            histogram.observe(value)
+
+        output = registry.render()
+        assert "# TYPE test_seconds histogram" in output
+        assert 'test_seconds_bucket{le="1.0"} 2' in output
+        assert 'test_seconds_bucket{le="5.0"} 3' in output
+        assert 'test_seconds_bucket{le="+Inf"} 4' in output
+        assert "test_seconds_sum 14.5" in output
+        assert "test_seconds_count 4" in output
+
+    def test_callback_gauge(self, registry):
+        """Test gauges computed at scrape time"""
+        Gauge("test_level", "Test gauge", func=lambda: 7, registry=registry)
+
+        assert "test_level 7" in registry.render()
+
+    def test_bit_length_classes_are_bounded(self):
+        """Test modulus sizes map onto a fixed set of label values"""
+        sizes = [16, 1024, 1025, 2047, 2048, 3072, 4000, 4096, 4097, 10**6]
+        labels = [bit_length_class(bits) for bits in sizes]
+
+        assert labels == [
+            "<=1024",
+            "<=1024",
+            "2048",
+            "2048",
+            "2048",
+            "3072",
+            "4096",
+            "4096",
+            "other",
+            "other",
+        ]
@@ -0,0 +1,61 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from core.parallel import (
+    get_process_pool,
+    parallel_pow,
+    pool_size,
+    shutdown_process_pool,
+)
+from core.rsa_crypto import RSACrypto
+from models.crypto_models import PrimePair
+
+
+class TestParallelBlocks:
+    """Test cases for process-pool block exponentiation"""
+
+    @pytest.fixture(autouse=True)
+    def process_pool(self):
+        """Tear down the shared pool after each test"""
+        yield
+        shutdown_process_pool()
+
+    def test_parallel_pow_preserves_order(self):
+        """Test parallel results match a serial loop, in order"""
+        n = 61 * 53
+        values = list(range(2, 200))
+
+        assert parallel_pow(values, 17, n, workers=2) == [pow(v, 17, n) for v in values]
+
+    def test_empty_input_starts_no_pool(self):
+        """Test mapping no items returns no results without starting the pool"""
+        assert parallel_pow([], 17, 61 * 53, workers=2) == []
+        assert pool_size() == 0
+
+    def test_concurrent_first_use_creates_one_pool(self):
+        """Test threads racing to first use all get the same pool"""
+        with ThreadPoolExecutor(max_workers=8) as threads:
+            pools = list(threads.map(lambda _: get_process_pool(2), range(8)))
+
+        assert all(pool is pools[0] for pool in pools)
+
+    def test_parallel_mode_round_trip(self):
+        """Test encryption and decryption above the parallel threshold"""
+        prime_pair = PrimePair(
+            p=61, q=53, bit_length=8, generation_time=0.001, miller_rabin_rounds=10
+        )
+        crypto = RSACrypto(parallel_threshold=4, parallel_workers=2)
+        keypair = crypto.generate_keypair(prime_pair)
+
+        message = "Parallel blocks keep their order"
+        encrypted = crypto.encrypt_message(message, keypair.n, keypair.e)
+        serial = RSACrypto().encrypt_message(message, keypair.n, keypair.e)
+        assert [b.encrypted_value for b in encrypted.blocks] == [
+            b.encrypted_value for b in serial.blocks
+        ]
+
+        encrypted_blocks = [block.encrypted_value for block in encrypted.blocks]
+        decrypted = crypto.decrypt_message(encrypted_blocks, keypair.n, keypair.d)
+        assert decrypted.success
+        assert decrypted.message == message
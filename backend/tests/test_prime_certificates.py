@@ -0,0 +1,113 @@
+from dataclasses import replace
+
+import pytest
+
+from core.miller_rabin import MillerRabinTester
+from core.prime_certificates import (
+    DETERMINISTIC_LIMIT,
+    certificate_from_dict,
+    certificate_to_dict,
+    is_small_prime,
+    verify_certificate,
+)
+from core.prime_generator import PrimeGenerator
+from core.prime_memo import PrimeMemo
+from models.crypto_models import PrimeCertificate
+
+
+@pytest.fixture(scope="module")
+def certificate() -> PrimeCertificate:
+    return PrimeGenerator().generate_certified_prime(256)
+
+
+class TestSmallPrimes:
+    """Test cases for the deterministic small-prime test"""
+
+    def test_matches_trial_division(self):
+        """Test exact agreement with trial division on small numbers"""
+
+        def trial_division(n):
+            return n >= 2 and all(n % d for d in range(2, int(n**0.5) + 1))
+
+        for n in range(5000):
+            assert is_small_prime(n) == trial_division(n), n
+
+    def test_strong_pseudoprimes(self):
+        """Test strong pseudoprimes to several bases are rejected"""
+        assert not is_small_prime(3215031751)  # base 2, 3, 5 and 7 pseudoprime
+        assert not is_small_prime(3825123056546413051)  # bases up to 23
+        assert is_small_prime(2**61 - 1)
+
+    def test_rejects_numbers_above_limit(self):
+        """Test the deterministic test refuses numbers it cannot decide"""
+        with pytest.raises(ValueError):
+            is_small_prime(DETERMINISTIC_LIMIT)
+
+
+class TestPrimeCertificates:
+    """Test cases for provable primes and their certificates"""
+
+    def test_certified_prime(self, certificate):
+        """Test the certified prime has the requested size and verifies"""
+        assert certificate.bit_length == 256
+        assert MillerRabinTester.test(certificate.prime, 20)
+        assert certificate.base.bit_length() <= 32
+        verify_certificate(certificate)
+
+    def test_small_bit_lengths(self):
+        """Test sizes at and just above the base size produce valid chains"""
+        generator = PrimeGenerator()
+        for bit_length in [16, 32, 33, 64]:
+            certificate = generator.generate_certified_prime(bit_length)
+            assert certificate.bit_length == bit_length
+            verify_certificate(certificate)
+
+    def test_tampered_certificates_are_rejected(self, certificate):
+        """Test each broken condition is detected"""
+        top = certificate.steps[-1]
+        broken = [
+            replace(certificate, prime=certificate.prime + 2),
+            replace(certificate, base=certificate.base + 2),
+            replace(certificate, steps=certificate.steps[1:]),
+            replace(certificate, steps=certificate.steps[:-1] + [replace(top, witness=1)]),
+            replace(
+                certificate,
+                steps=certificate.steps[:-1] + [replace(top, prime=top.prime + 2 * top.factor)],
+            ),
+        ]
+        for bad in broken:
+            with pytest.raises(ValueError):
+                verify_certificate(bad)
+
+    def test_composite_cannot_be_certified(self, certificate):
+        """Test a chain step claiming a composite fails the Fermat condition"""
+        top = certificate.steps[-1]
+        q = top.factor
+        k = (top.prime - 1) // q
+        composite = next(
+            2 * j * q + 1
+            for j in range(k // 2, k // 2 + 1000)
+            if not MillerRabinTester.test(2 * j * q + 1, 10)
+        )
+        fake = replace(top, prime=composite, witness=2)
+        with pytest.raises(ValueError):
+            verify_certificate(
+                replace(certificate, prime=composite, steps=certificate.steps[:-1] + [fake])
+            )
+
+    def test_dict_round_trip(self, certificate):
+        """Test certificates survive conversion to and from JSON-friendly dicts"""
+        assert certificate_from_dict(certificate_to_dict(certificate)) == certificate
+
+    def test_provable_pair_is_memoized_with_certificates(self, tmp_path):
+        """Test seeded provable pairs keep their certificates through the memo"""
+        memo = PrimeMemo(str(tmp_path))
+        pair = PrimeGenerator(memo=memo).generate_prime_pair(
+            128, 5, seed="proof", prime_type="provable"
+        )
+
+        assert [c.prime for c in pair.certificates] == [pair.p, pair.q]
+        cached = memo.get("proof", 128, 5, "provable")
+        assert cached.certificates == pair.certificates
+        for cert in cached.certificates:
+            verify_certificate(cert)
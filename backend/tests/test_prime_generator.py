@@ -1,9 +1,11 @@
 import time
+from unittest.mock import patch
 
 import pytest
 
 from core.miller_rabin import MillerRabinTester
-from core.prime_generator import PrimeGenerator
+from core.prime_generator import PrimeGenerator, _safe_sieve_primes, _sieve_primes
+from core.prime_memo import PrimeMemo
 
 
 class TestPrimeGenerator:
@@ -60,3 +62,108 @@ class TestPrimeGenerator:
             assert prime_pair.q.bit_length() >= bit_length - 1
             assert prime_pair.p.bit_length() <= bit_length + 1
             assert prime_pair.q.bit_length() <= bit_length + 1
+
+    def test_filter_candidates_matches_trial_division(self):
+        """Test batch sieving keeps exactly the candidates without small factors"""
+        candidates = [(1 << 64) + i for i in range(1, 400, 2)]
+
+        expected = [c for c in candidates if all(c % p for p in _sieve_primes())]
+        assert PrimeGenerator.filter_candidates(candidates) == expected
+
+    def test_generate_primes_batch(self):
+        """Test bulk generation returns distinct primes of the requested size"""
+        generator = PrimeGenerator()
+        tester = MillerRabinTester()
+
+        primes = generator.generate_primes(count=5, bit_length=128, rounds=10)
+
+        assert len(set(primes)) == 5, "Generated primes should be distinct"
+        for prime in primes:
+            assert prime.bit_length() == 128
+            assert tester.test(prime, k=20), f"{prime} should be prime"
+
+    def test_seeded_pair_is_reproducible(self):
+        """Test the same seed gives the same pair and other seeds differ"""
+        generator = PrimeGenerator()
+
+        first = generator.generate_prime_pair(128, 10, seed="demo")
+        second = generator.generate_prime_pair(128, 10, seed="demo")
+        other = generator.generate_prime_pair(128, 10, seed="other")
+
+        assert (first.p, first.q) == (second.p, second.q)
+        assert (first.p, first.q) != (other.p, other.q)
+        assert MillerRabinTester.test(first.p, 20) and MillerRabinTester.test(first.q, 20)
+
+    def test_seeded_pair_is_memoized(self, tmp_path):
+        """Test memoized seeded pairs are served from disk without regenerating"""
+        memo = PrimeMemo(str(tmp_path))
+        generated = PrimeGenerator(memo=memo).generate_prime_pair(128, 5, seed="memo")
+
+        with patch.object(PrimeGenerator, "_generate_pair", side_effect=AssertionError):
+            cached = PrimeGenerator(memo=memo).generate_prime_pair(128, 5, seed="memo")
+            assert memo.get("memo", 128, 6) is None
+
+        assert (cached.p, cached.q) == (generated.p, generated.q)
+        assert cached.miller_rabin_rounds == 5
+
+    def test_unseeded_pairs_are_not_memoized(self, tmp_path):
+        """Test random (secret) pairs never touch the memo"""
+        PrimeGenerator(memo=PrimeMemo(str(tmp_path))).generate_prime_pair(128, 5)
+        assert list(tmp_path.iterdir()) == []
+
+    def test_safe_prime_window_matches_trial_division(self):
+        """Test the joint sieve keeps exactly the q where neither q nor 2q + 1 has a small factor"""
+        start = (1 << 40) + 1
+        window = PrimeGenerator._safe_prime_window(start, 2000)
+
+        expected = [
+            q
+            for q in range(start, start + 4000, 2)
+            if all(q % s and (2 * q + 1) % s for s in _safe_sieve_primes())
+        ]
+        assert window == expected
+
+    def test_generate_safe_prime(self):
+        """Test safe primes have the requested size and a prime (p - 1) / 2"""
+        generator = PrimeGenerator()
+
+        for bit_length in [64, 128, 256]:
+            p = generator.generate_safe_prime(bit_length)
+            assert p.bit_length() == bit_length
+            assert MillerRabinTester.test(p, 20)
+            assert MillerRabinTester.test((p - 1) // 2, 20)
+
+    def test_generate_strong_prime(self):
+        """Test strong primes satisfy Gordon's divisibility conditions"""
+        generator = PrimeGenerator()
+
+        for bit_length in [128, 256]:
+            p, r, s, t = generator._strong_prime_with_factors(bit_length, 10)
+            assert p.bit_length() == bit_length
+            assert all(MillerRabinTester.test(x, 20) for x in (p, r, s, t))
+            assert (p - 1) % r == 0
+            assert (p + 1) % s == 0
+            assert (r - 1) % t == 0
+
+    def test_prime_pair_types(self):
+        """Test pairs are generated, labelled and memoized per prime type"""
+        generator = PrimeGenerator()
+
+        safe = generator.generate_prime_pair(128, 10, prime_type="safe")
+        assert safe.prime_type == "safe"
+        assert all(MillerRabinTester.test((x - 1) // 2, 20) for x in (safe.p, safe.q))
+
+        with pytest.raises(ValueError):
+            generator.generate_prime_pair(128, 10, prime_type="weak")
+
+    def test_seeded_prime_types_are_memoized_separately(self, tmp_path):
+        """Test one seed maps to different memo entries for different prime types"""
+        memo = PrimeMemo(str(tmp_path))
+        generator = PrimeGenerator(memo=memo)
+
+        random_pair = generator.generate_prime_pair(128, 5, seed="typed")
+        safe_pair = generator.generate_prime_pair(128, 5, seed="typed", prime_type="safe")
+
+        assert (random_pair.p, random_pair.q) != (safe_pair.p, safe_pair.q)
+        assert memo.get("typed", 128, 5, "safe").p == safe_pair.p
+        assert memo.get("typed", 128, 5).p == random_pair.p
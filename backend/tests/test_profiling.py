@@ -0,0 +1,41 @@
+import marshal
+
+import pytest
+
+from core.parallel import parallel_pow, shutdown_process_pool
+from core.profiling import ProfileCollector, active_profile
+
+
+def _busy(n: int) -> int:
+    return sum(i * i for i in range(n))
+
+
+class TestProfiling:
+    """Test cases for request profiling collection"""
+
+    @pytest.fixture(autouse=True)
+    def process_pool(self):
+        """Tear down the shared pool after each test"""
+        yield
+        shutdown_process_pool()
+
+    def test_collector_records_thread_work(self):
+        """Test profiled calls return results and record stats"""
+        collector = ProfileCollector()
+
+        assert collector.run(_busy, 1000) == _busy(1000)
+        assert any(func[2] == "_busy" for func in collector.stats)
+        assert marshal.loads(collector.pstats_bytes()).keys() == collector.stats.keys()
+        assert "_busy" in collector.collapsed()
+
+    def test_profile_follows_work_into_process_pool(self):
+        """Test worker process stats are merged into the active profile"""
+        collector = ProfileCollector()
+        token = active_profile.set(collector)
+        try:
+            results = parallel_pow(list(range(2, 40)), 17, 3233, workers=2)
+        finally:
+            active_profile.reset(token)
+
+        assert results == [pow(v, 17, 3233) for v in range(2, 40)]
+        assert any(func[2] == "_pow_chunk" for func in collector.stats)
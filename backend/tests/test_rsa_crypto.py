@@ -1,3 +1,5 @@
+from unittest.mock import patch
+
 import pytest
 
 from core.rsa_crypto import RSACrypto
@@ -98,3 +100,121 @@ class TestRSACrypto:
         encrypted_blocks = [block.encrypted_value for block in result.blocks]
         decrypt_result = crypto.decrypt_message(encrypted_blocks, keypair.n, keypair.d)
         assert decrypt_result.message == "A", "Should recover single character"
+
+    def test_iter_encrypt_is_chunk_independent(self, rsa_crypto):
+        """Test streaming encryption yields the same blocks for any chunking"""
+        crypto, keypair = rsa_crypto
+
+        test_message = "Streaming RSA ✓"
+        whole = crypto.encrypt_message(test_message, keypair.n, keypair.e)
+
+        data = test_message.encode("utf-8")
+        chunks = [data[i : i + 3] for i in range(0, len(data), 3)]
+        streamed = list(crypto.iter_encrypt(chunks, keypair.n, keypair.e))
+
+        assert [b.encrypted_value for b in streamed] == [b.encrypted_value for b in whole.blocks]
+        assert [b.block_number for b in streamed] == list(range(1, len(streamed) + 1))
+
+    def test_iter_decrypt_round_trip(self, rsa_crypto):
+        """Test streaming decryption recovers the original bytes"""
+        crypto, keypair = rsa_crypto
+
+        data = "Hello stream".encode("utf-8")
+        encrypted = (b.encrypted_value for b in crypto.iter_encrypt([data], keypair.n, keypair.e))
+        decrypted = crypto.iter_decrypt(encrypted, keypair.n, keypair.d)
+
+        assert b"".join(crypto.block_to_bytes(b.original_value) for b in decrypted) == data
+
+    def test_hybrid_round_trip(self, rsa_crypto):
+        """Test hybrid mode encrypts with one RSA block and decrypts back"""
+        crypto, keypair = rsa_crypto
+
+        test_message = "Hybrid mode ✓ " * 50
+        result = crypto.encrypt_hybrid(test_message, keypair.n, keypair.e)
+        assert result.success, "Hybrid encryption should succeed"
+        assert len(result.payload.ciphertext) == len(test_message.encode("utf-8"))
+
+        decrypted = crypto.decrypt_hybrid(result.payload, keypair.n, keypair.d)
+        assert decrypted.success, "Hybrid decryption should succeed"
+        assert decrypted.message == test_message
+
+    def test_hybrid_rejects_tampered_ciphertext(self, rsa_crypto):
+        """Test hybrid mode detects a modified ciphertext"""
+        crypto, keypair = rsa_crypto
+
+        payload = crypto.encrypt_hybrid("Attack at dawn", keypair.n, keypair.e).payload
+        payload.ciphertext = bytes([payload.ciphertext[0] ^ 1]) + payload.ciphertext[1:]
+
+        result = crypto.decrypt_hybrid(payload, keypair.n, keypair.d)
+        assert not result.success
+        assert "tag" in result.error_message
+
+    def test_sign_and_verify(self, rsa_crypto):
+        """Test CRT and plain signatures agree and verify"""
+        crypto, keypair = rsa_crypto
+
+        plain = crypto.sign_message("audit record", keypair.n, keypair.d)
+        crt = crypto.sign_message("audit record", keypair.n, keypair.d, keypair.p, keypair.q)
+
+        assert plain == crt, "CRT signing should match plain signing"
+        assert crypto.verify_signature("audit record", crt, keypair.n, keypair.e)
+
+    def test_verify_batch(self, rsa_crypto):
+        """Test batch verification flags only the bad signatures"""
+        crypto, keypair = rsa_crypto
+
+        messages = [f"record {i}" for i in range(10)]
+        items = [
+            (m, crypto.sign_message(m, keypair.n, keypair.d), keypair.n, keypair.e)
+            for m in messages
+        ]
+        items[3] = (items[3][0], (items[3][1] + 1) % keypair.n, keypair.n, keypair.e)
+
+        results = crypto.verify_batch(items)
+        assert results == [i != 3 for i in range(10)]
+
+    def test_crt_decryption_matches_plain(self, rsa_crypto):
+        """Test decrypting with the prime factors gives the same result via CRT"""
+        crypto, keypair = rsa_crypto
+        encrypted = crypto.encrypt_message("CRT ✓", keypair.n, keypair.e)
+        blocks = [block.encrypted_value for block in encrypted.blocks]
+
+        plain = crypto.decrypt_message(blocks, keypair.n, keypair.d)
+        crt = crypto.decrypt_message(blocks, keypair.n, keypair.d, keypair.p, keypair.q)
+        assert crt.success and crt.message == plain.message == "CRT ✓"
+
+        wrong = crypto.decrypt_message(blocks, keypair.n, keypair.d, keypair.p, keypair.q + 2)
+        assert not wrong.success
+
+    def test_bind_key(self, rsa_crypto):
+        """Test key binding validates the parts once and detects CRT support"""
+        crypto, keypair = rsa_crypto
+
+        bound = crypto.bind_key(keypair.n, keypair.e, keypair.d, keypair.p, keypair.q)
+        assert bound.crt and bound.fingerprint == keypair.fingerprint
+        assert not crypto.bind_key(keypair.n, e=keypair.e).crt
+
+        for args in [(1, 3), (keypair.n,), (keypair.n, 0), (keypair.n, 3, None, keypair.p)]:
+            with pytest.raises(ValueError):
+                crypto.bind_key(*args)
+        with pytest.raises(ValueError):
+            crypto.bind_key(keypair.n, keypair.e, keypair.d, keypair.p, keypair.p)
+        with pytest.raises(ValueError, match="greater than 1"):
+            crypto.bind_key(15, d=3, p=1, q=15)
+
+    def test_decrypt_bound_reuses_bind_time_parameters(self, rsa_crypto):
+        """Test a bound key decrypts without re-checking factors or re-deriving CRT values"""
+        crypto, keypair = rsa_crypto
+        bound = crypto.bind_key(keypair.n, keypair.e, keypair.d, keypair.p, keypair.q)
+        assert bound.crt_params == RSACrypto._crt_params(keypair.p, keypair.q, keypair.d)
+        encrypted = crypto.encrypt_message("bound once", keypair.n, keypair.e)
+        blocks = [block.encrypted_value for block in encrypted.blocks]
+
+        with patch.object(RSACrypto, "_check_factors") as check, patch.object(
+            RSACrypto, "_crt_params"
+        ) as derive:
+            result = crypto.decrypt_bound(blocks, bound)
+
+        assert result.success and result.message == "bound once"
+        check.assert_not_called()
+        derive.assert_not_called()
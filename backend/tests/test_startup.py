@@ -0,0 +1,65 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from benchmarks.bench_startup import (
+    first_request_times,
+    import_times,
+    is_project_module,
+)
+
+# Budgets for a fresh worker, generous enough for a loaded CI machine without bytecode caches
+###########################
+PROJECT_IMPORT_BUDGET_US = 400_000  # self time of project modules in `import main`
+TOTAL_IMPORT_BUDGET_US = 3_000_000
+LIFESPAN_BUDGET = 0.5  # seconds
+FIRST_REQUEST_BUDGET = 1.0  # seconds
+
+# Wall-clock budgets depend on machine load, so they run only when asked (make startup-budget)
+wall_clock_budget = pytest.mark.skipif(
+    not os.environ.get("STARTUP_BUDGET"), reason="set STARTUP_BUDGET=1 to check timing budgets"
+)
+
+
+class TestStartup:
+    """Test cases for worker boot cost"""
+
+    @wall_clock_budget
+    def test_import_time_budget(self):
+        """Test `import main` stays within the import-time budget (-X importtime)"""
+        modules = import_times()
+        total = next(cumulative for name, _, cumulative in modules if name == "main")
+        project = sum(self_us for name, self_us, _ in modules if is_project_module(name))
+
+        assert total < TOTAL_IMPORT_BUDGET_US
+        assert project < PROJECT_IMPORT_BUDGET_US
+
+    def test_optional_modules_and_tables_load_lazily(self):
+        """Test importing the app loads no optional modules and builds no sieve tables"""
+        script = (
+            "import json, sys, main\n"
+            "from core.prime_generator import _safe_sieve_primes, _sieve_primes\n"
+            "modules = ('psutil', 'gmpy2', 'cProfile', 'pstats', 'multiprocessing')\n"
+            "print(json.dumps({'modules': [m for m in modules if m in sys.modules],"
+            " 'sieve': _sieve_primes.cache_info().currsize,"
+            " 'safe_sieve': _safe_sieve_primes.cache_info().currsize}))"
+        )
+        # gmpy2 loads with the backend that uses it, so boot with the pure-Python one
+        env = {**os.environ, "ARITHMETIC_BACKEND": "python"}
+        result = subprocess.run(
+            [sys.executable, "-c", script], capture_output=True, text=True, check=True, env=env
+        )
+        loaded = json.loads(result.stdout.splitlines()[-1])
+
+        assert loaded == {"modules": [], "sieve": 0, "safe_sieve": 0}
+
+    @wall_clock_budget
+    def test_first_request_latency_budget(self):
+        """Test lifespan startup and the first health check stay within budget"""
+        times = first_request_times()
+
+        assert times["lifespan"] < LIFESPAN_BUDGET
+        assert times["first_request"] < FIRST_REQUEST_BUDGET
@@ -0,0 +1,63 @@
+import json
+
+import pytest
+
+from core.parallel import parallel_pow, shutdown_process_pool
+from core.prime_generator import PrimeGenerator
+from core.tracing import InMemoryExporter, JsonFileExporter, tracer
+
+
+class TestTracing:
+    """Test cases for tracing spans and exporters"""
+
+    @pytest.fixture
+    def exporter(self):
+        """Route spans to an in-memory exporter for the duration of a test"""
+        exporter = InMemoryExporter()
+        previous, tracer.exporter = tracer.exporter, exporter
+        yield exporter
+        tracer.exporter = previous
+        shutdown_process_pool()
+
+    def test_disabled_tracer_is_noop(self):
+        """Test span() yields nothing when no exporter is configured"""
+        with tracer.span("unused") as span:
+            assert span is None
+
+    def test_core_spans_are_nested(self, exporter):
+        """Test prime generation spans hang off the caller's span"""
+        with tracer.span("request") as root:
+            PrimeGenerator().generate_prime_pair(64, 5)
+
+        pair = exporter.by_name("prime_generator.generate_prime_pair")[0]
+        batches = exporter.by_name("prime_generator.generate_primes")
+        assert pair.parent_id == root.span_id
+        assert len(batches) == 1
+        assert {span.parent_id for span in batches} == {pair.span_id}
+        assert {span.trace_id for span in exporter.spans} == {root.trace_id}
+
+    def test_spans_propagate_into_process_pool(self, exporter):
+        """Test worker process spans join the parent trace"""
+        with tracer.span("request") as root:
+            parallel_pow(list(range(2, 50)), 17, 3233, workers=2)
+
+        chunks = exporter.by_name("parallel.chunk")
+        assert chunks
+        assert {span.parent_id for span in chunks} == {root.span_id}
+        assert {span.trace_id for span in chunks} == {root.trace_id}
+
+    def test_json_file_exporter(self, tmp_path):
+        """Test spans are written as JSON lines"""
+        path = tmp_path / "traces.jsonl"
+        previous, tracer.exporter = tracer.exporter, JsonFileExporter(str(path))
+        try:
+            with tracer.span("outer", kind="test"):
+                with tracer.span("inner"):
+                    pass
+        finally:
+            tracer.exporter = previous
+
+        spans = [json.loads(line) for line in path.read_text().splitlines()]
+        assert [span["name"] for span in spans] == ["inner", "outer"]
+        assert spans[0]["parent_id"] == spans[1]["span_id"]
+        assert spans[1]["attributes"] == {"kind": "test"}
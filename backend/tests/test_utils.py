@@ -0,0 +1,48 @@
+import time
+
+from core.utils import SystemMetricsSampler
+
+
+class TestSystemMetricsSampler:
+    """Test cases for the cached system metrics sampler"""
+
+    def test_snapshot_includes_process_stats_and_sources(self):
+        """Test a snapshot carries system, process and registered stats"""
+        sampler = SystemMetricsSampler(interval=60)
+        sampler.add_source("backlog", lambda: 3)
+
+        snapshot = sampler.snapshot()
+
+        assert snapshot["process_rss_mb"] > 0
+        assert snapshot["process_threads"] >= 1
+        assert snapshot["backlog"] == 3
+        assert "cpu_percent" in snapshot
+
+    def test_snapshot_is_cached_within_interval(self):
+        """Test sources are not re-sampled on every snapshot"""
+        calls = []
+        sampler = SystemMetricsSampler(interval=60)
+        sampler.add_source("calls", lambda: calls.append(1) or len(calls))
+
+        for _ in range(5):
+            snapshot = sampler.snapshot()
+
+        assert len(calls) == 1
+        assert snapshot["calls"] == 1
+
+    def test_background_thread_refreshes_snapshot(self):
+        """Test the running sampler refreshes on its interval"""
+        calls = []
+        sampler = SystemMetricsSampler(interval=0.01)
+        sampler.add_source("calls", lambda: calls.append(1) or len(calls))
+
+        sampler.start()
+        try:
+            deadline = time.monotonic() + 5
+            while len(calls) < 3 and time.monotonic() < deadline:
+                time.sleep(0.01)
+        finally:
+            sampler.stop()
+
+        assert len(calls) >= 3
+        assert sampler.snapshot()["sample_age_seconds"] >= 0
@@ -1,7 +1,11 @@
 // API type definitions
+export type PrimeType = 'random' | 'safe' | 'strong' | 'provable';
+
 export interface PrimeGenerationRequest {
   bit_length: number;
   miller_rabin_rounds: number;
+  seed?: string;
+  prime_type?: PrimeType;
 }
 
 export interface PrimeGenerationResponse {
@@ -10,6 +14,29 @@ export interface PrimeGenerationResponse {
   generation_time: number;
   bit_length: number;
   miller_rabin_rounds: number;
+  seed?: string | null;
+  prime_type?: PrimeType;
+  certificates?: PrimeCertificate[] | null;
+}
+
+export interface PocklingtonStep {
+  prime: string;
+  factor: string;
+  witness: string;
+}
+
+export interface PrimeCertificate {
+  prime: string;
+  base: string;
+  steps: PocklingtonStep[];
+}
+
+export interface CertificateVerificationResponse {
+  valid: boolean;
+  bit_length: number;
+  steps: number;
+  reason?: string | null;
+  verification_time: number;
 }
 
 export interface PublicKey {
@@ -33,12 +60,32 @@ export interface RSAKeysResponse {
   public_key: PublicKey;
   private_key: PrivateKey;
   parameters: RSAParameters;
+  key_id?: string | null;
 }
 
+export type KeyType = 'public' | 'private';
+
+export type KeyFormat = 'pem' | 'der';
+
+export interface KeyImportRequest {
+  key: string;
+}
+
+export interface KeyImportResponse {
+  key_id: string;
+  key_type: KeyType;
+  bit_length: number;
+  public_key: PublicKey;
+  cached: boolean;
+}
+
+export type CryptoMode = 'textbook' | 'hybrid';
+
 export interface EncryptionRequest {
   message: string;
   n: string;
   e: string;
+  mode?: CryptoMode;
 }
 
 export interface BlockInfo {
@@ -54,12 +101,18 @@ export interface EncryptionResponse {
   block_info: BlockInfo[];
   total_blocks: number;
   message_length: number;
+  mode?: CryptoMode;
+  ciphertext?: string | null;
+  tag?: string | null;
 }
 
 export interface DecryptionRequest {
   encrypted_blocks: string[];
   n: string;
   d: string;
+  mode?: CryptoMode;
+  ciphertext?: string;
+  tag?: string;
 }
 
 export interface DecryptionResponse {
@@ -74,6 +127,7 @@ export interface HealthResponse {
   primes_available: boolean;
   keys_generated: boolean;
   system_info: Record<string, string>;
+  arithmetic_backend?: string;
 }
 
 export interface ErrorResponse {